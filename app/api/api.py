@@ -1,16 +1,30 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, has_request_context, request, jsonify
+from werkzeug.local import LocalProxy
 from werkzeug.middleware.proxy_fix import ProxyFix
 import os
+import re
 import sys
-import pickle
-import networkx as nx
+import json
+import time
+import ipaddress
+import cProfile
 import logging
+import threading
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config import DATA_MART_PATH
-from graph.graph import Graph
-from graph.graph_analyzer import GraphAnalyzer
+from config import GRAPH_PATH, JOBS_PATH, METRICS_PATH, PROFILE_PATH
+from graph.centrality import BETWEENNESS, CLOSENESS
+from graph.edge_models import edge_model
+from graph.fuzzy_index import MAX_DISTANCE
+from graph.render import IMAGE_FORMATS
+from graph.longest_path import SearchBudget
+from jobs import JobQueue, JobQueueFull
+from metrics import Metrics
+from query_cache import QueryCache
+from snapshots import SnapshotManager
+from streaming import FORMATS, stream_response
 
 app = Flask(__name__)
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1)
@@ -24,38 +38,194 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("slow_queries")
+slow_query_logger.addHandler(logging.FileHandler("slow_queries.log"))
 
-graph = Graph()
-analyzer = None
-is_initialized = False
+LONGEST_PATH_TIME_BUDGET = 10.0
+CLUSTERS_PAGE_SIZE = 100
+MAX_BATCH_PAIRS = 10000
+# Larger /all-paths results are streamed straight from the search instead.
+ALL_PATHS_CACHE_LIMIT = 100
+ALL_PATHS_TIME_BUDGET = 5.0
+MAXIMUM_DISTANCE_TIME_BUDGET = 5.0
+# Longer searches between two words go through POST /jobs.
+MAX_SEARCH_TIME_BUDGET = 30.0
+JOB_TIME_BUDGET = 60.0
+MAX_JOB_TIME_BUDGET = 600.0
+MAX_JOB_PATHS = 10000
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+MAX_PENDING_JOBS = int(os.environ.get("MAX_PENDING_JOBS", 32))
+QUERY_CACHE_SIZE = int(os.environ.get("QUERY_CACHE_SIZE", 10000))
+QUERY_CACHE_TTL = float(os.environ.get("QUERY_CACHE_TTL", 3600))
+# Layouts and images of /render, each bounded to this many entries.
+RENDER_CACHE_SIZE = int(os.environ.get("RENDER_CACHE_SIZE", 256))
+MAX_RENDER_RADIUS = 3
+MAX_RENDER_NODES = 300
+MAX_HUBS = 1000
+SLOW_QUERY_SECONDS = float(os.environ.get("SLOW_QUERY_SECONDS", 1.0))
+# Requests sent with an X-Profile header are profiled only when enabled.
+PROFILE_REQUESTS = os.environ.get("PROFILE_REQUESTS", "0") == "1"
+# Seconds between checks of the graph file for a new version; 0 disables.
+GRAPH_WATCH_INTERVAL = float(os.environ.get("GRAPH_WATCH_INTERVAL", 0))
+# When set, POST /admin/reload requires it in an X-Admin-Token header;
+# otherwise only requests sent from this host may reload.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+# Routes served while the graph is still loading.
+WARM_UP_ENDPOINTS = {"index", "get_healthz", "get_readyz", "get_metrics", "get_cache_stats", "list_routes"}
 
-def load_graph():
-    global is_initialized, analyzer
-    try:
-        serialized_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            'graph.pkl'
-        )
-        if not os.path.isfile(serialized_path):
-            logger.error(f"Serialized network file not found in {serialized_path}")
-            return False
-
-        with open(serialized_path, 'rb') as f:
-            graph.graph = pickle.load(f)
-        analyzer = GraphAnalyzer(graph.graph)
-
-        is_initialized = True
-        logger.info(f"Graph loaded from {serialized_path}: "
-                    f"{graph.graph.number_of_nodes()} nodes, {graph.graph.number_of_edges()} edges.")
-        return True
-    except Exception as e:
-        logger.error(f"Error loading serialized graph: {e}", exc_info=True)
+# Set once the startup load has finished, whether or not it succeeded.
+graph_loaded = threading.Event()
+query_cache = QueryCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL)
+layout_cache = QueryCache(RENDER_CACHE_SIZE)
+render_cache = QueryCache(RENDER_CACHE_SIZE)
+# One profile at a time: cProfile cannot profile two requests at once.
+profile_lock = threading.Lock()
+
+metrics = Metrics(METRICS_PATH)
+metrics.describe("graph_api_requests_total", "counter", "Requests served, by route, method and status.")
+metrics.describe("graph_api_request_seconds", "histogram",
+                 "Time to serve a request, until the last byte of a streamed body.")
+metrics.describe("graph_api_slow_requests_total", "counter",
+                 "Requests slower than SLOW_QUERY_SECONDS, by route.")
+metrics.describe("graph_api_cache_hits_total", "counter", "Path query cache hits.")
+metrics.describe("graph_api_cache_misses_total", "counter", "Path query cache misses.")
+metrics.describe("graph_api_cache_evictions_total", "counter", "Path query cache entries evicted by the LRU.")
+
+def run_longest_path(analyzer, params, budget, job):
+    return analyzer.longest_path(params["limit"], max_expansions=params["max_expansions"], budget=budget)
+
+def run_maximum_distance(analyzer, params, budget, job):
+    dist, path = analyzer.maximum_distance_between(params["word1"], params["word2"], params["limit"], budget)
+    return {"distance": dist, "path": path, "complete": not budget.exhausted}
+
+def run_all_paths(analyzer, params, budget, job):
+    paths = []
+    for path in analyzer.iter_all_paths(params["word1"], params["word2"], params["limit"],
+                                        params["order"], params["max_length"], budget):
+        paths.append(path)
+        job.progress["paths"] = len(paths)
+    return {"all_paths": paths, "complete": not budget.exhausted}
+
+job_queue = JobQueue(JOBS_PATH, {
+    "longest-path": run_longest_path,
+    "maximum-distance": run_maximum_distance,
+    "all-paths": run_all_paths,
+}, max_workers=JOB_WORKERS, max_pending=MAX_PENDING_JOBS)
+
+def reverse_path(path):
+    return None if path is None else path[::-1]
+
+def output_format():
+    """The `format` query parameter, or None if it is not supported."""
+    fmt = request.args.get("format", default="json")
+    return fmt if fmt in FORMATS else None
+
+def time_budget_arg(default: float, maximum: float):
+    """The `time_budget` query parameter, or None unless it is a number of
+    seconds in (0, maximum]; nan and inf would never expire."""
+    value = request.args.get("time_budget")
+    if value is None:
+        return default
+    try:
+        value = float(value)
+    except ValueError:
+        return None
+    return value if 0 < value <= maximum else None
+
+def from_loopback() -> bool:
+    """Whether the request comes from this host, both for the peer that
+    connected and for the client ProxyFix took from X-Forwarded-For, so that
+    neither a spoofed header nor a request relayed by nginx passes."""
+    peer = request.environ.get("werkzeug.proxy_fix.orig", {}).get("REMOTE_ADDR", request.remote_addr)
+    try:
+        return all(ipaddress.ip_address(addr).is_loopback for addr in (peer, request.remote_addr))
+    except ValueError:
         return False
 
-if load_graph():
-    logger.info("The app has started with the graph already loaded.")
-else:
-    logger.error("The app has started without a loaded graph.")
+def swap_graph(snapshot):
+    # Results are keyed by graph version; entries for the old one can go.
+    query_cache.clear()
+    layout_cache.clear()
+    render_cache.clear()
+    job_queue.retain_version(snapshot.version)
+
+snapshots = SnapshotManager(GRAPH_PATH, on_swap=swap_graph)
+
+def current_snapshot():
+    """The snapshot the current request started on, so that a reload in the
+    middle of a request cannot mix two graphs; outside requests, the newest."""
+    if has_request_context() and "snapshot" in g:
+        return g.snapshot
+    return snapshots.current
+
+# Handlers use these like plain globals; each resolves to current_snapshot().
+graph = LocalProxy(lambda: current_snapshot().graph)
+analyzer = LocalProxy(lambda: current_snapshot().analyzer)
+is_initialized = LocalProxy(lambda: current_snapshot() is not None)
+
+def load_graph():
+    return snapshots.load(force=True)
+
+def warm_up():
+    try:
+        if load_graph():
+            logger.info("The graph is loaded, the app is ready.")
+        else:
+            logger.error("The app is running without a loaded graph.")
+    finally:
+        graph_loaded.set()
+        if GRAPH_WATCH_INTERVAL > 0:
+            snapshots.watch(GRAPH_WATCH_INTERVAL)
+
+# The graph is loaded in the background so that the worker answers
+# /healthz straight away; other routes return 503 until it is ready.
+threading.Thread(target=warm_up, name="graph-loader", daemon=True).start()
+
+@app.before_request
+def start_request():
+    g.start = time.perf_counter()
+    g.profiler = None
+    g.snapshot = snapshots.current
+    if not graph_loaded.is_set() and request.endpoint not in WARM_UP_ENDPOINTS:
+        return jsonify({"error": "Graph is loading, retry shortly."}), 503, {"Retry-After": "1"}
+    if PROFILE_REQUESTS and request.headers.get("X-Profile") and profile_lock.acquire(blocking=False):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def record_request(response):
+    # Measured when the response is closed, so that streamed bodies count.
+    route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    method, status, params = request.method, response.status_code, request.args.to_dict()
+    start, profiler = g.start, g.profiler
+    if g.snapshot is not None:
+        response.headers["X-Graph-Version"] = g.snapshot.version
+    profile_path = None
+    if profiler is not None:
+        name = re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-") or "index"
+        profile_path = os.path.join(PROFILE_PATH, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{name}.prof")
+        response.headers["X-Profile"] = os.path.basename(profile_path)
+
+    def finish():
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            profile_lock.release()
+            os.makedirs(PROFILE_PATH, exist_ok=True)
+            profiler.dump_stats(profile_path)
+            logger.info(f"Profile of {method} {route} written to {profile_path}")
+        metrics.inc("graph_api_requests_total", route=route, method=method, status=status)
+        metrics.observe("graph_api_request_seconds", elapsed, route=route, method=method)
+        if elapsed >= SLOW_QUERY_SECONDS:
+            metrics.inc("graph_api_slow_requests_total", route=route)
+            slow_query_logger.warning(json.dumps({"route": route, "method": method, "status": status,
+                                                  "params": params, "elapsed": round(elapsed, 4)}))
+        metrics.set_total("graph_api_cache_hits_total", query_cache.hits)
+        metrics.set_total("graph_api_cache_misses_total", query_cache.misses)
+        metrics.set_total("graph_api_cache_evictions_total", query_cache.evictions)
+
+    response.call_on_close(finish)
+    return response
 
 @app.route("/", methods=["GET"])
 def index():
@@ -63,13 +233,39 @@ def index():
         "message": "Welcome to the Graph API",
         "endpoints": {
             "GET /shortest-path?word1=...&word2=...": "Shortest path between two words",
-            "GET /all-paths?word1=...&word2=...&limit=10": "All the possible routes between two words with a limit",
-            "GET /maximum-distance(?word1=..&word2=..&limit=..)": 
+            "POST /shortest-path/batch {pairs: [[w1, w2], ...]} or {source: w, targets: [...]}":
+                "Distances and shortest paths for many pairs in one request",
+            "GET /all-paths?word1=...&word2=...&limit=10&max_length=..": "All the possible routes between two words with a limit",
+            "GET /all-paths?word1=...&word2=...&limit=10&order=shortest&max_length=..&time_budget=5":
+                "The shortest simple paths between two words, in increasing length",
+            "GET /maximum-distance(?word1=..&word2=..&limit=..&time_budget=5)": 
                 "Longest path between two nodes with a limit",
-            "GET /clusters": "Connected components",
-            "GET /high-connectivity?degree=2": "Nodes with degree >= 2",
-            "GET /nodes-by-degree?degree=n": "Nodes with degree == n",
-            "GET /isolated-nodes": "Isolated nodes"
+            "GET /maximum-distance?limit=..&time_budget=..&max_expansions=..":
+                "Longest path in the whole graph within a time/expansion budget",
+            "POST /jobs {kind: longest-path|maximum-distance|all-paths, params: {...}, time_budget: 60}":
+                "Run an expensive analysis in the background; identical requests share one job",
+            "GET /jobs/<id>": "Status, progress and result of a job",
+            "DELETE /jobs/<id>": "Cancel a job",
+            "GET /info": "Size, edge model and version of the loaded graph",
+            "GET /healthz": "Liveness: the worker is up, even while the graph loads",
+            "GET /readyz": "Readiness: 200 with the graph version and load time once the graph is loaded",
+            "POST /admin/reload": "Load a new graph.bin in the background and swap it in without a restart",
+            "GET /diameter": "Exact graph diameter with its endpoints and one path",
+            "GET /clusters?offset=0&limit=100&min_size=..&max_size=..&order=desc":
+                "Connected components, paginated and sorted by size",
+            "GET /cluster-of?word=..&limit=..": "Connected component containing a word",
+            "GET /neighbors?word=..": "Words linked to any word, in the graph or not",
+            "GET /nearest?word=..&max_distance=1&limit=..": "Graph words within 0-2 edits of any word",
+            "GET /render?word=..&radius=1&format=svg|png(&word2=..)":
+                "Image of the words around a word, or around the shortest path to word2",
+            "GET /high-connectivity?degree=2&offset=0&limit=..": "Nodes with degree >= 2, highest degree first",
+            "GET /hubs?top=20&by=betweenness|closeness": "Words on the most ladders, from centrality computed at build time",
+            "GET /nodes-by-degree?degree=n&offset=0&limit=..": "Nodes with degree == n",
+            "GET /isolated-nodes?offset=0&limit=..": "Isolated nodes",
+            "format=ndjson": "On /clusters, /high-connectivity, /isolated-nodes and /all-paths: "
+                             "one result per line instead of a single JSON document",
+            "GET /cache-stats": "Hit/miss counters of the path query cache",
+            "GET /metrics": "Request counts, latency histograms and graph size in Prometheus text format"
         }
     })
 
@@ -83,7 +279,8 @@ def get_shortest_path():
         return jsonify({"error": "Missing parameters: word1 and word2."}), 400
 
     try:
-        path = analyzer.shortest_path(w1, w2)
+        path = query_cache.get_or_compute_pair("shortest-path", w1, w2, (), graph.version,
+                                               analyzer.shortest_path, reverse_path)
         if path is None:
             return jsonify({"message": f"No path was found between '{w1}' and '{w2}'."}), 404
         return jsonify({"path": path})
@@ -91,6 +288,37 @@ def get_shortest_path():
         logger.error(f"Error in /shortest-path: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@app.route("/shortest-path/batch", methods=["POST"])
+def post_shortest_path_batch():
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized correctly."}), 500
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"error": "Expected a JSON object body."}), 400
+
+    if "pairs" in body:
+        pairs = body["pairs"]
+        if not isinstance(pairs, list) or not all(
+                isinstance(p, (list, tuple)) and len(p) == 2 and all(isinstance(w, str) for w in p)
+                for p in pairs):
+            return jsonify({"error": "pairs must be a list of [word1, word2] pairs."}), 400
+    elif "source" in body and "targets" in body:
+        source, targets = body["source"], body["targets"]
+        if not isinstance(source, str) or not isinstance(targets, list) \
+                or not all(isinstance(w, str) for w in targets):
+            return jsonify({"error": "source must be a word and targets a list of words."}), 400
+        pairs = [(source, t) for t in targets]
+    else:
+        return jsonify({"error": "Missing parameters: pairs, or source and targets."}), 400
+    if len(pairs) > MAX_BATCH_PAIRS:
+        return jsonify({"error": f"At most {MAX_BATCH_PAIRS} pairs per batch."}), 400
+
+    try:
+        return jsonify(analyzer.shortest_paths(pairs, bool(body.get("paths", True))))
+    except Exception as e:
+        logger.error(f"Error in /shortest-path/batch: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/all-paths", methods=["GET"])
 def get_all_paths():
     if not is_initialized:
@@ -98,12 +326,39 @@ def get_all_paths():
     w1 = request.args.get("word1")
     w2 = request.args.get("word2")
     limit = request.args.get("limit", default=10, type=int)
+    order = request.args.get("order", default="dfs")
+    max_length = request.args.get("max_length", type=int)
+    time_budget = time_budget_arg(ALL_PATHS_TIME_BUDGET, MAX_SEARCH_TIME_BUDGET)
+    fmt = output_format()
     if not w1 or not w2:
         return jsonify({"error": "Missing parameters: word1 and word2."}), 400
+    if time_budget is None:
+        return jsonify({"error": f"time_budget must be a number of seconds up to {MAX_SEARCH_TIME_BUDGET}."}), 400
+    if order not in ("dfs", "shortest"):
+        return jsonify({"error": "order must be 'dfs' or 'shortest'."}), 400
+    if fmt is None:
+        return jsonify({"error": f"format must be one of {', '.join(FORMATS)}."}), 400
+
+    def search(a, b):
+        budget = SearchBudget(time_limit=time_budget)
+        paths = analyzer.all_paths(a, b, limit, max_length=max_length, budget=budget)
+        return {"all_paths": paths, "complete": not budget.exhausted}
 
     try:
-        paths = analyzer.all_paths(w1, w2, limit)
-        return jsonify({"all_paths": paths})
+        if order == "dfs" and limit <= ALL_PATHS_CACHE_LIMIT:
+            # Paths cut short by the time budget are not cached.
+            result = query_cache.get_or_compute_pair(
+                "all-paths", w1, w2, (limit, max_length), graph.version, search,
+                lambda r: {"all_paths": [p[::-1] for p in r["all_paths"]], "complete": r["complete"]},
+                lambda r: r["complete"])
+            return stream_response("/all-paths", "all_paths", result["all_paths"],
+                                   {"order": order, "max_length": max_length}, fmt,
+                                   lambda: {"complete": result["complete"]})
+        budget = SearchBudget(time_limit=time_budget)
+        paths = analyzer.iter_all_paths(w1, w2, limit, order, max_length, budget)
+        return stream_response("/all-paths", "all_paths", paths,
+                               {"order": order, "max_length": max_length}, fmt,
+                               lambda: {"complete": not budget.exhausted})
     except Exception as e:
         logger.error(f"Error in /all-paths: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
@@ -117,62 +372,353 @@ def get_maximum_distance():
     word2 = request.args.get("word2")
     limit = request.args.get("limit", type=int)
 
+    def search(a, b):
+        budget = SearchBudget(time_limit=time_budget)
+        dist, path = analyzer.maximum_distance_between(a, b, limit, budget)
+        return dist, path, not budget.exhausted
+
     try:
         if word1 and word2:
-            dist, path = analyzer.maximum_distance_between(word1, word2, limit)
+            time_budget = time_budget_arg(MAXIMUM_DISTANCE_TIME_BUDGET, MAX_SEARCH_TIME_BUDGET)
+            if time_budget is None:
+                return jsonify({"error": f"time_budget must be a number of seconds up to "
+                                         f"{MAX_SEARCH_TIME_BUDGET}."}), 400
+            dist, path, complete = query_cache.get_or_compute_pair(
+                "maximum-distance", word1, word2, (limit,), graph.version, search,
+                lambda result: (result[0], result[1][::-1], result[2]),
+                lambda result: result[2])
             return jsonify({
                 "distance": dist,
                 "path": path,
+                "complete": complete,
                 "note": f"Longest path between '{word1}' and '{word2}' with cutoff={limit}"
             })
         else:
             # Camino más largo global
-            dist, path = analyzer.maximum_distance_among_all(limit)
+            # Capped at the default: longer searches go through POST /jobs.
+            time_budget = time_budget_arg(LONGEST_PATH_TIME_BUDGET, LONGEST_PATH_TIME_BUDGET)
+            if time_budget is None:
+                return jsonify({"error": f"time_budget must be a number of seconds up to "
+                                         f"{LONGEST_PATH_TIME_BUDGET}."}), 400
+            max_expansions = request.args.get("max_expansions", type=int)
+            result = analyzer.longest_path(limit, time_budget, max_expansions)
             return jsonify({
-                "distance": dist,
-                "path": path,
-                "note": f"Longest path in the whole graph, cutoff={limit}"
+                "distance": result["distance"],
+                "path": result["path"],
+                "proven_optimal": result["proven_optimal"],
+                "note": f"Longest path in the whole graph, cutoff={limit}, time_budget={time_budget}s"
             })
     except Exception as e:
         logger.error(f"Error in /maximum-distance: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+def job_params(kind, params):
+    """Validated parameters of a job with defaults filled in, so that equal
+    requests produce equal job ids."""
+    if not isinstance(params, dict):
+        raise ValueError("params must be a JSON object.")
+
+    def integer(name, default=None, minimum=0):
+        value = params.get(name, default)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < minimum):
+            raise ValueError(f"{name} must be an integer >= {minimum}.")
+        return value
+
+    def word(name):
+        value = params.get(name)
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"Missing parameter: {name}.")
+        return value
+
+    if kind == "longest-path":
+        return {"limit": integer("limit"), "max_expansions": integer("max_expansions", minimum=1)}
+    if kind == "maximum-distance":
+        return {"word1": word("word1"), "word2": word("word2"), "limit": integer("limit")}
+    if kind == "all-paths":
+        order = params.get("order", "dfs")
+        if order not in ("dfs", "shortest"):
+            raise ValueError("order must be 'dfs' or 'shortest'.")
+        limit = integer("limit", 10)
+        if limit > MAX_JOB_PATHS:
+            raise ValueError(f"At most {MAX_JOB_PATHS} paths per job.")
+        return {"word1": word("word1"), "word2": word("word2"), "limit": limit,
+                "order": order, "max_length": integer("max_length")}
+    raise ValueError(f"kind must be one of {', '.join(job_queue.runners)}.")
+
+@app.route("/jobs", methods=["POST"])
+def post_job():
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized."}), 500
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"error": "Expected a JSON object body."}), 400
+    time_budget = body.get("time_budget", JOB_TIME_BUDGET)
+    if isinstance(time_budget, bool) or not isinstance(time_budget, (int, float)) \
+            or not 0 < time_budget <= MAX_JOB_TIME_BUDGET:
+        return jsonify({"error": f"time_budget must be a number of seconds up to {MAX_JOB_TIME_BUDGET}."}), 400
+
+    try:
+        kind = body.get("kind")
+        params = job_params(kind, body.get("params", {}))
+        job, created = job_queue.submit(kind, params, float(time_budget), graph.version,
+                                        current_snapshot().analyzer)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+    except Exception as e:
+        logger.error(f"Error in /jobs: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+    return jsonify(job), 202 if created else 200, {"Location": f"/jobs/{job['id']}"}
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized."}), 500
+    job = job_queue.get(job_id, graph.version)
+    if job is None:
+        return jsonify({"message": f"No job '{job_id}' for the current graph."}), 404
+    return jsonify(job)
+
+@app.route("/jobs/<job_id>", methods=["DELETE"])
+def cancel_job(job_id):
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized."}), 500
+    job = job_queue.cancel(job_id, graph.version)
+    if job is None:
+        return jsonify({"message": f"No job '{job_id}' for the current graph."}), 404
+    return jsonify(job)
+
+@app.route("/healthz", methods=["GET"])
+def get_healthz():
+    return jsonify({"status": "ok"})
+
+@app.route("/readyz", methods=["GET"])
+def get_readyz():
+    if not is_initialized:
+        status = "failed" if graph_loaded.is_set() else "loading"
+        return jsonify({"status": status, "error": snapshots.last_error}), 503
+    snapshot = current_snapshot()
+    return jsonify({
+        "status": "ready",
+        "graph_version": snapshot.version,
+        "load_seconds": snapshot.load_seconds,
+        "loaded_at": snapshot.loaded_at,
+        "number_of_nodes": graph.node_count,
+        "reloading": snapshots.loading,
+        "last_reload_error": snapshots.last_error
+    })
+
+@app.route("/admin/reload", methods=["POST"])
+def post_admin_reload():
+    if ADMIN_TOKEN is not None:
+        if request.headers.get("X-Admin-Token") != ADMIN_TOKEN:
+            return jsonify({"error": "Invalid or missing X-Admin-Token."}), 403
+    elif not from_loopback():
+        return jsonify({"error": "Set ADMIN_TOKEN to reload from another host."}), 403
+    current = snapshots.current.version if snapshots.current is not None else None
+    if not snapshots.reload():
+        return jsonify({"message": "A reload is already running.", "graph_version": current}), 409
+    return jsonify({"message": f"Reloading {GRAPH_PATH}; GET /readyz reports the version served.",
+                    "graph_version": current}), 202
+
+@app.route("/info", methods=["GET"])
+def get_info():
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized."}), 500
+    try:
+        return jsonify(dict(analyzer.get_basic_info(), graph_version=graph.version))
+    except Exception as e:
+        logger.error(f"Error in /info: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/diameter", methods=["GET"])
+def get_diameter():
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized."}), 500
+    try:
+        return jsonify(analyzer.diameter())
+    except Exception as e:
+        logger.error(f"Error in /diameter: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/clusters", methods=["GET"])
 def get_clusters():
     if not is_initialized:
         return jsonify({"error": "Graph not initialized correctly."}), 500
+    offset = request.args.get("offset", default=0, type=int)
+    limit = request.args.get("limit", default=CLUSTERS_PAGE_SIZE, type=int)
+    min_size = request.args.get("min_size", type=int)
+    max_size = request.args.get("max_size", type=int)
+    order = request.args.get("order", default="desc")
+    fmt = output_format()
+    if offset < 0 or limit < 0:
+        return jsonify({"error": "offset and limit must be non-negative."}), 400
+    if order not in ("asc", "desc"):
+        return jsonify({"error": "order must be 'asc' or 'desc'."}), 400
+    if fmt is None:
+        return jsonify({"error": f"format must be one of {', '.join(FORMATS)}."}), 400
+
     try:
-        clusters = analyzer.clusters()
-        cluster_list = []
-        for c in clusters:
-            cluster_list.append([node.word for node in c])
-        return jsonify({"clusters": cluster_list})
+        total, clusters = analyzer.iter_clusters(offset, limit, min_size, max_size, order)
+        return stream_response("/clusters", "clusters", clusters,
+                               {"total": total, "offset": offset, "limit": limit}, fmt)
     except Exception as e:
         logger.error(f"Error in /clusters: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@app.route("/cluster-of", methods=["GET"])
+def get_cluster_of():
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized correctly."}), 500
+    word = request.args.get("word")
+    limit = request.args.get("limit", type=int)
+    if not word:
+        return jsonify({"error": "Missing parameter: word."}), 400
+
+    try:
+        cluster = analyzer.cluster_of(word, limit)
+        if cluster is None:
+            return jsonify({"message": f"'{word}' is not in the graph."}), 404
+        return jsonify(cluster)
+    except Exception as e:
+        logger.error(f"Error in /cluster-of: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/neighbors", methods=["GET"])
+def get_neighbors():
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized."}), 500
+    word = request.args.get("word")
+    if not word:
+        return jsonify({"error": "Missing parameter: word."}), 400
+
+    try:
+        return jsonify({
+            "word": word,
+            "in_graph": word in analyzer.graph,
+            "edge_model": edge_model(analyzer.graph),
+            "neighbors": analyzer.neighbors_of(word)
+        })
+    except Exception as e:
+        logger.error(f"Error in /neighbors: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/nearest", methods=["GET"])
+def get_nearest():
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized."}), 500
+    word = request.args.get("word")
+    max_distance = request.args.get("max_distance", default=1, type=int)
+    limit = request.args.get("limit", type=int)
+    if not word:
+        return jsonify({"error": "Missing parameter: word."}), 400
+    if not 0 <= max_distance <= MAX_DISTANCE:
+        return jsonify({"error": f"max_distance must be between 0 and {MAX_DISTANCE}."}), 400
+    if limit is not None and limit < 0:
+        return jsonify({"error": "limit must be non-negative."}), 400
+
+    try:
+        matches = analyzer.nearest(word, max_distance, limit)
+        return jsonify({
+            "word": word,
+            "max_distance": max_distance,
+            "in_graph": word in analyzer.graph,
+            "nearest": [{"word": w, "distance": d} for w, d in matches]
+        })
+    except Exception as e:
+        logger.error(f"Error in /nearest: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/render", methods=["GET"])
+def get_render():
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized."}), 500
+    word = request.args.get("word")
+    target = request.args.get("word2")
+    radius = request.args.get("radius", default=1, type=int)
+    fmt = request.args.get("format", default="svg")
+    if not word:
+        return jsonify({"error": "Missing parameter: word."}), 400
+    if not 0 <= radius <= MAX_RENDER_RADIUS:
+        return jsonify({"error": f"radius must be between 0 and {MAX_RENDER_RADIUS}."}), 400
+    if fmt not in IMAGE_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(IMAGE_FORMATS)}."}), 400
+
+    try:
+        # The layout is shared by both formats, the image is cached per format.
+        params = (word, target, radius)
+        ego = layout_cache.get_or_compute(
+            "render-layout", params, graph.version,
+            lambda: analyzer.ego_layout(word, radius, target, MAX_RENDER_NODES))
+        if ego is None:
+            missing = f"No path was found between '{word}' and '{target}'." if target else f"'{word}' is not in the graph."
+            return jsonify({"message": missing}), 404
+        image = render_cache.get_or_compute("render", params + (fmt,), graph.version,
+                                            lambda: analyzer.render(ego, fmt))
+        return Response(image, mimetype=IMAGE_FORMATS[fmt], headers={
+            "X-Render-Nodes": str(len(ego["positions"])),
+            "X-Render-Truncated": str(ego["truncated"]).lower(),
+        })
+    except Exception as e:
+        logger.error(f"Error in /render: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/high-connectivity", methods=["GET"])
 def get_high_connectivity():
     if not is_initialized:
         return jsonify({"error": "Graph not initialized."}), 500
     degree = request.args.get("degree", default=2, type=int)
+    offset = request.args.get("offset", default=0, type=int)
+    limit = request.args.get("limit", type=int)
+    fmt = output_format()
+    if offset < 0 or (limit is not None and limit < 0):
+        return jsonify({"error": "offset and limit must be non-negative."}), 400
+    if fmt is None:
+        return jsonify({"error": f"format must be one of {', '.join(FORMATS)}."}), 400
     try:
-        nodes = analyzer.high_connectivity_nodes(degree)
-        return jsonify({"nodes": nodes})
+        nodes = analyzer.iter_high_connectivity_nodes(degree, offset, limit)
+        return stream_response("/high-connectivity", "nodes", nodes,
+                               {"total": analyzer.degrees.count_at_least(degree)}, fmt)
     except Exception as e:
         logger.error(f"Error in /high-connectivity: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@app.route("/hubs", methods=["GET"])
+def get_hubs():
+    if not is_initialized:
+        return jsonify({"error": "Graph not initialized."}), 500
+    top = request.args.get("top", default=20, type=int)
+    by = request.args.get("by", default=BETWEENNESS)
+    if not 0 <= top <= MAX_HUBS:
+        return jsonify({"error": f"top must be between 0 and {MAX_HUBS}."}), 400
+    if by not in (BETWEENNESS, CLOSENESS):
+        return jsonify({"error": f"by must be {BETWEENNESS} or {CLOSENESS}."}), 400
+
+    try:
+        hubs = analyzer.hubs(top, by)
+        if hubs is None:
+            return jsonify({"message": "Centrality was not computed for this graph, rebuild it "
+                                       "with initialize_graph.py."}), 404
+        return jsonify({"hubs": hubs, "by": by, "estimate": graph.metadata.get("centrality")})
+    except Exception as e:
+        logger.error(f"Error in /hubs: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/nodes-by-degree", methods=["GET"])
 def get_nodes_by_degree():
     if not is_initialized:
         return jsonify({"error": "Graph not initialized."}), 500
     deg = request.args.get("degree", type=int)
+    offset = request.args.get("offset", default=0, type=int)
+    limit = request.args.get("limit", type=int)
     if deg is None:
         return jsonify({"error": "Missing parameter: degree."}), 400
+    if offset < 0 or (limit is not None and limit < 0):
+        return jsonify({"error": "offset and limit must be non-negative."}), 400
     try:
-        nodes = analyzer.nodes_by_degree(deg)
-        return jsonify({"nodes": nodes})
+        nodes = analyzer.nodes_by_degree(deg, offset, limit)
+        return jsonify({"total": analyzer.degrees.count(deg), "nodes": nodes})
     except Exception as e:
         logger.error(f"Error in /nodes-by-degree: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
@@ -181,13 +727,39 @@ def get_nodes_by_degree():
 def get_isolated_nodes():
     if not is_initialized:
         return jsonify({"error": "Graph not initialized."}), 500
+    offset = request.args.get("offset", default=0, type=int)
+    limit = request.args.get("limit", type=int)
+    fmt = output_format()
+    if offset < 0 or (limit is not None and limit < 0):
+        return jsonify({"error": "offset and limit must be non-negative."}), 400
+    if fmt is None:
+        return jsonify({"error": f"format must be one of {', '.join(FORMATS)}."}), 400
     try:
-        isolated = analyzer.isolated_nodes()
-        return jsonify({"isolated_nodes": isolated})
+        isolated = analyzer.iter_nodes_by_degree(0, offset, limit)
+        return stream_response("/isolated-nodes", "isolated_nodes", isolated,
+                               {"total": analyzer.degrees.count(0)}, fmt)
     except Exception as e:
         logger.error(f"Error in /isolated-nodes: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@app.route("/cache-stats", methods=["GET"])
+def get_cache_stats():
+    return jsonify(query_cache.stats())
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    gauges = [("graph_api_cache_entries", "Entries in this worker's path query cache.", len(query_cache)),
+              ("graph_api_cache_hit_ratio", "Hit rate of this worker's path query cache.",
+               query_cache.stats()["hit_rate"])]
+    if is_initialized:
+        gauges += [
+            ("graph_nodes", "Words in the loaded graph.", graph.node_count),
+            ("graph_edges", "Edges in the loaded graph.", graph.edge_count),
+            ("graph_components", "Connected components in the loaded graph.", analyzer.components.count),
+            ("graph_load_seconds", "Time this worker took to load the graph.", current_snapshot().load_seconds),
+        ]
+    return Response(metrics.render(gauges), mimetype="text/plain; version=0.0.4")
+
 @app.route("/routes", methods=["GET"])
 def list_routes():
     import urllib
@@ -0,0 +1,30 @@
+# Launch from app/api with:  gunicorn -c gunicorn.conf.py api:app
+#
+# Every worker memory-maps graph.bin read-only, so the graph's pages live
+# once in the OS page cache and are shared by all workers no matter how
+# many there are; only per-worker search buffers and caches are private.
+# The app is not preloaded: mapping the file is cheap, and each worker
+# keeps its own background threads and process pools.
+import os
+import shutil
+import tempfile
+import multiprocessing
+
+bind = os.environ.get("GRAPH_API_BIND", "127.0.0.1:5000")
+workers = int(os.environ.get("GRAPH_API_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GRAPH_API_THREADS", 4))
+worker_class = "gthread"
+preload_app = False
+# Longest-path searches run for up to their time budget (10 s by default).
+timeout = int(os.environ.get("GRAPH_API_TIMEOUT", 60))
+
+
+def on_starting(server):
+    # Workers share their /metrics counters through this directory; it is
+    # emptied on every start so that counts begin at zero.
+    path = os.environ.setdefault("METRICS_PATH", os.path.join(tempfile.gettempdir(), "graph-api-metrics"))
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+    # POST /admin/reload only reaches the worker that serves it; watching
+    # graph.bin lets every worker pick up a new version on its own.
+    os.environ.setdefault("GRAPH_WATCH_INTERVAL", "5")
@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from graph.longest_path import SearchBudget
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = ("queued", "running")
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    """One submitted analysis; `to_dict` is what clients see."""
+
+    def __init__(self, job_id: str, kind: str, params: dict, version: str, time_budget: float):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.version = version
+        self.time_budget = time_budget
+        self.status = "queued"
+        self.created_at = time.time()
+        self.deadline = self.created_at + time_budget
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: dict = {}
+        self.result = None
+        self.error: Optional[str] = None
+        self.budget: Optional[SearchBudget] = None
+        self.context = None
+
+    def to_dict(self) -> dict:
+        progress = dict(self.progress)
+        if self.budget is not None:
+            progress["expansions"] = self.budget.expansions
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "graph_version": self.version,
+            "time_budget": self.time_budget,
+            "status": self.status,
+            "created_at": self.created_at,
+            "deadline": self.deadline,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "updated_at": time.time(),
+            "pid": os.getpid(),
+            "progress": progress,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Bounded pool of analysis jobs whose state is kept on disk.
+
+    A job's id is a hash of (kind, params, time budget, graph version), so
+    submitting an identical request returns the job already queued, running
+    or finished instead of starting another one. Every job is written to
+    `<directory>/<graph version>/<id>.json` on each change and about once a
+    second while it runs, which lets every API worker process answer for
+    jobs run by the others; a `<id>.cancel` marker cancels a job from any
+    of them. Finished results stay until the graph version changes.
+
+    `runners[kind](context, params, budget, job)` computes a job's result;
+    it must stop when `budget` is exhausted and may fill `job.progress`.
+    """
+
+    def __init__(self, directory: str, runners: Dict[str, Callable], max_workers: int = 2,
+                 max_pending: int = 32, heartbeat: float = 1.0, stale_after: float = 30.0):
+        self.directory = directory
+        self.runners = runners
+        self.max_pending = max_pending
+        self.heartbeat = heartbeat
+        self.stale_after = stale_after
+        self._jobs: Dict[str, Job] = {}
+        self._retained: Optional[str] = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._stop = threading.Event()
+        self._monitor = threading.Thread(target=self._watch, name="job-monitor", daemon=True)
+        self._monitor.start()
+
+    @staticmethod
+    def job_id(kind: str, params: dict, time_budget: float, version: str) -> str:
+        key = json.dumps([kind, params, time_budget, version], sort_keys=True)
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+    def submit(self, kind: str, params: dict, time_budget: float, version: str,
+               context=None) -> Tuple[dict, bool]:
+        """Queue a job unless an identical one exists; returns (job, created)."""
+        if kind not in self.runners:
+            raise ValueError(f"Unknown job kind '{kind}'.")
+        job_id = self.job_id(kind, params, time_budget, version)
+        with self._lock:
+            existing = self._lookup(job_id, version)
+            if existing is not None and self._reusable(existing):
+                return existing, False
+            if sum(job.status == "queued" for job in self._jobs.values()) >= self.max_pending:
+                raise JobQueueFull(f"More than {self.max_pending} jobs are waiting.")
+            job = Job(job_id, kind, params, version, time_budget)
+            job.context = context
+            self._jobs[job_id] = job
+            self._clear_cancel_marker(job)
+            self._save(job)
+        self._pool.submit(self._run, job)
+        return job.to_dict(), True
+
+    def get(self, job_id: str, version: str) -> Optional[dict]:
+        with self._lock:
+            return self._lookup(job_id, version)
+
+    def cancel(self, job_id: str, version: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.version == version:
+                self._cancel(job)
+                return job.to_dict()
+            state = self._load(job_id, version)
+            if state is None:
+                return None
+            if state["status"] in ACTIVE:
+                # Running in another worker process: its monitor picks this up.
+                open(self._path(job_id, version, ".cancel"), "w").close()
+            return state
+
+    def retain_version(self, version: str):
+        """Cancel jobs for other graph versions and drop their stored results."""
+        with self._lock:
+            self._retained = version
+            for job in list(self._jobs.values()):
+                if job.version != version:
+                    self._cancel(job)
+                    self._jobs.pop(job.id, None)
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name != version:
+                    shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def shutdown(self):
+        self._stop.set()
+        with self._lock:
+            for job in list(self._jobs.values()):
+                self._cancel(job)
+        self._pool.shutdown(wait=True)
+
+    def _run(self, job: Job):
+        with self._lock:
+            if job.status != "queued":
+                return
+            if time.time() >= job.deadline:
+                self._finish(job, "expired", error="The deadline passed before the job started.")
+                return
+            job.status = "running"
+            job.started_at = time.time()
+            job.budget = SearchBudget(deadline=job.deadline)
+            self._save(job)
+
+        try:
+            result = self.runners[job.kind](job.context, job.params, job.budget, job)
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed: {e}", exc_info=True)
+            with self._lock:
+                self._finish(job, "failed", error=str(e))
+            return
+
+        with self._lock:
+            # A cancelled job keeps the partial result its runner returned.
+            self._finish(job, "cancelled" if job.budget.cancelled else "done", result=result)
+
+    def _finish(self, job: Job, status: str, result=None, error: Optional[str] = None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.context = None
+        self._clear_cancel_marker(job)
+        self._save(job)
+        # Finished jobs are served from disk from now on.
+        self._jobs.pop(job.id, None)
+        logger.info(f"Job {job.id} ({job.kind}) {status} after {job.finished_at - job.created_at:.2f}s.")
+
+    def _cancel(self, job: Job):
+        if job.status == "queued":
+            self._finish(job, "cancelled")
+        elif job.status == "running":
+            job.budget.cancel()
+
+    def _watch(self):
+        while not self._stop.wait(self.heartbeat):
+            with self._lock:
+                for job in list(self._jobs.values()):
+                    if job.status not in ACTIVE:
+                        continue
+                    if os.path.exists(self._path(job.id, job.version, ".cancel")):
+                        self._cancel(job)
+                    if job.status in ACTIVE:
+                        self._save(job)
+
+    def _lookup(self, job_id: str, version: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        if job is not None and job.version == version:
+            return job.to_dict()
+        return self._load(job_id, version)
+
+    def _reusable(self, state: dict) -> bool:
+        if state["status"] == "done":
+            return True
+        # An active job nobody has written for a while belonged to a worker
+        # that died; it is submitted again.
+        return state["status"] in ACTIVE and time.time() - state["updated_at"] < self.stale_after
+
+    def _path(self, job_id: str, version: str, suffix: str = ".json") -> str:
+        return os.path.join(self.directory, version or "unversioned", job_id + suffix)
+
+    def _load(self, job_id: str, version: str) -> Optional[dict]:
+        try:
+            with open(self._path(job_id, version), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, job: Job):
+        if self._retained is not None and job.version != self._retained:
+            return
+        path = self._path(job.id, job.version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def _clear_cancel_marker(self, job: Job):
+        try:
+            os.remove(self._path(job.id, job.version, ".cancel"))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; request latencies range from sub-millisecond lookups to
+# searches running out a time budget.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """Counters and histograms rendered in the Prometheus text format.
+
+    Under gunicorn each worker process only sees its own requests. When
+    `directory` is set every worker writes a snapshot of its values there
+    every `flush_interval` seconds, from a background thread, and `render` adds up the
+    snapshots of all workers, so whichever worker is scraped reports the
+    whole server. Without it the values are this process's alone.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0,
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.buckets = buckets
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        # (name, labels) -> [count per bucket..., +Inf count, sum]
+        self._histograms: Dict[Tuple[str, Labels], list] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if directory is not None:
+            threading.Thread(target=self._flush_periodically, name="metrics-flush", daemon=True).start()
+
+    def describe(self, name: str, kind: str, help_text: str):
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._dirty = True
+
+    def set_total(self, name: str, value: float, **labels):
+        """Set a counter kept elsewhere, such as the query cache's hit count."""
+        with self._lock:
+            self._counters[(name, _labels(labels))] = value
+            self._dirty = True
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            histogram[bisect.bisect_left(self.buckets, value)] += 1
+            histogram[-1] += value
+            self._dirty = True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": [[name, labels, value] for (name, labels), value in self._counters.items()],
+                "histograms": [[name, labels, list(values)] for (name, labels), values in self._histograms.items()],
+            }
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def flush(self):
+        if self.directory is None:
+            return
+        self._dirty = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{os.getpid()}.json")
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot to {self.directory}: {e}")
+
+    def _snapshots(self) -> Iterable[dict]:
+        yield self.snapshot()
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        own = f"{os.getpid()}.json"
+        for name in os.listdir(self.directory):
+            # Files of workers that have exited are kept: their requests
+            # still count towards the totals.
+            if name.endswith(".json") and name != own:
+                try:
+                    with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                        yield json.load(f)
+                except (OSError, ValueError):
+                    continue
+
+    def render(self, gauges: Iterable[Tuple[str, str, float]] = ()) -> str:
+        """Prometheus text exposition of all workers' counters and histograms,
+        followed by `gauges` given as (name, help, value) for this process."""
+        counters: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], list] = {}
+        for snapshot in self._snapshots():
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, values in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                if key in histograms:
+                    histograms[key] = [a + b for a, b in zip(histograms[key], values)]
+                else:
+                    histograms[key] = list(values)
+
+        lines = []
+        described = set()
+
+        def header(name, kind, help_text):
+            if name not in described:
+                described.add(name)
+                kind, help_text = self._help.get(name, (kind, help_text))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name, "counter", name)
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), values in sorted(histograms.items()):
+            header(name, "histogram", name)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(values[-1])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        for name, help_text, value in gauges:
+            header(name, "gauge", help_text)
+            lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
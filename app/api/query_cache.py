@@ -0,0 +1,93 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+
+class QueryCache:
+    """Thread-safe LRU cache of query results with an optional TTL.
+
+    Keys include the graph version, so results computed on an older graph
+    can never be served for a newer one; `clear` frees them when a new
+    graph is loaded.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key: Hashable) -> Tuple[bool, object]:
+        """Return (found, value); a cached None is distinguishable from a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def store(self, key: Hashable, value) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, endpoint: str, params: tuple, version: str, compute: Callable[[], object],
+                       should_store: Optional[Callable[[object], bool]] = None):
+        """Cached result of `compute`; results failing `should_store`, such as
+        searches cut short by a time budget, are returned but not cached."""
+        key = (endpoint, params, version)
+        found, value = self.lookup(key)
+        if not found:
+            value = compute()
+            if should_store is None or should_store(value):
+                self.store(key, value)
+        return value
+
+    def get_or_compute_pair(self, endpoint: str, source: str, target: str, params: tuple, version: str,
+                            compute: Callable[[str, str], object], reverse: Callable[[object], object],
+                            should_store: Optional[Callable[[object], bool]] = None):
+        """Cache a query whose answer for (target, source) is `reverse` of (source, target).
+
+        Both orders share one entry: the query is always computed for the
+        pair in sorted order and reversed on the way out when needed.
+        """
+        a, b = (source, target) if source <= target else (target, source)
+        value = self.get_or_compute(endpoint, (a, b) + params, version, lambda: compute(a, b), should_store)
+        return value if a == source else reverse(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
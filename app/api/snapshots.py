@@ -0,0 +1,107 @@
+import os
+import time
+import logging
+import threading
+from typing import Callable, Optional, Tuple
+
+from graph.compact_graph import CompactGraph
+from graph.graph_analyzer import GraphAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """A loaded graph and its analyzer, never modified once loaded."""
+
+    def __init__(self, graph: CompactGraph, analyzer: GraphAnalyzer, load_seconds: float):
+        self.graph = graph
+        self.analyzer = analyzer
+        self.version = graph.version
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+
+
+class SnapshotManager:
+    """Loads the graph file into snapshots and swaps the newest one in.
+
+    A new version is loaded and indexed off to the side while requests
+    keep using `current`, then published with a single assignment: a
+    request that read `current` before the swap finishes on the old
+    snapshot, whose memory map lives as long as it is referenced. One load
+    runs at a time. `watch` reloads when the file is replaced, which is
+    how update_graph and initialize_graph write it (temp file + rename).
+    """
+
+    def __init__(self, path: str, on_swap: Optional[Callable[[Snapshot], None]] = None):
+        self.path = path
+        self.on_swap = on_swap
+        self.current: Optional[Snapshot] = None
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def loading(self) -> bool:
+        return self._lock.locked()
+
+    def load(self, force: bool = False) -> bool:
+        """Load the graph file and swap it in; unless `force`, a file holding the
+        version already served is not loaded twice. Returns whether a graph is
+        being served from the file."""
+        with self._lock:
+            signature = self._stat()
+            try:
+                if signature is None:
+                    raise FileNotFoundError(f"Graph file not found in {self.path}")
+                start = time.perf_counter()
+                graph = CompactGraph.load(self.path)
+                if not force and self.current is not None and graph.version == self.current.version:
+                    self._signature = signature
+                    return True
+                snapshot = Snapshot(graph, GraphAnalyzer(graph), time.perf_counter() - start)
+            except Exception as e:
+                # Not retried by `watch` until the file changes again.
+                self._signature = signature
+                self.last_error = str(e)
+                logger.error(f"Error loading graph from {self.path}: {e}", exc_info=True)
+                return False
+
+            previous = self.current.version if self.current is not None else None
+            if self.on_swap is not None:
+                self.on_swap(snapshot)
+            self.current = snapshot
+            self._signature = signature
+            self.last_error = None
+            logger.info(f"Graph {snapshot.version} loaded from {self.path} in {snapshot.load_seconds:.3f}s "
+                        f"(was {previous}): {graph.node_count} nodes, {graph.edge_count} edges.")
+            return True
+
+    def reload(self) -> bool:
+        """Load the graph file in a background thread; False if a load is already running."""
+        if self.loading:
+            return False
+        threading.Thread(target=self.load, name="graph-reload", daemon=True).start()
+        return True
+
+    def watch(self, interval: float):
+        """Reload whenever the graph file changes, checking every `interval` seconds."""
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="graph-watch", daemon=True)
+        self._watcher.start()
+
+    def _watch(self, interval: float):
+        while True:
+            time.sleep(interval)
+            signature = self._stat()
+            if signature is not None and signature != self._signature and not self.loading:
+                logger.info(f"{self.path} changed, reloading.")
+                self.load()
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
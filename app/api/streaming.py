@@ -0,0 +1,83 @@
+import json
+import logging
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+
+from flask import Response
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+# Items serialized per json.dumps call; one call per item is much slower.
+BATCH_ITEMS = 256
+FORMATS = ("json", "ndjson")
+
+
+def _buffered(pieces: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Group small string pieces into chunks of about `chunk_size` characters."""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _batches(items: Iterable) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, BATCH_ITEMS))
+        if not batch:
+            return
+        yield batch
+
+
+def _json_object(fields: dict, key: str, items: Iterable,
+                 trailer: Optional[Callable[[], dict]] = None) -> Iterator[str]:
+    """`fields` followed by `key` holding a JSON array of `items`, written lazily.
+
+    `trailer` is called once the items are exhausted and its fields close
+    the object, for values only known at the end.
+    """
+    head = json.dumps(fields)[:-1]
+    yield head + (", " if fields else "") + json.dumps(key) + ": ["
+    for i, batch in enumerate(_batches(items)):
+        yield ("," if i else "") + json.dumps(batch)[1:-1]
+    tail = trailer() if trailer is not None else {}
+    yield "]" + (", " + json.dumps(tail)[1:] if tail else "}")
+
+
+def _ndjson(items: Iterable) -> Iterator[str]:
+    for batch in _batches(items):
+        yield "".join(json.dumps(item) + "\n" for item in batch)
+
+
+def _logged(chunks: Iterator[str], endpoint: str) -> Iterator[str]:
+    # The status line is already sent once streaming starts, so a failure
+    # can only be logged and the body cut short.
+    try:
+        yield from chunks
+    except Exception as e:
+        logger.error(f"Error while streaming {endpoint}: {e}", exc_info=True)
+
+
+def stream_response(endpoint: str, key: str, items: Iterable, fields: Optional[dict] = None,
+                    fmt: str = "json", trailer: Optional[Callable[[], dict]] = None) -> Response:
+    """Stream `items` as {**fields, key: [...], **trailer()} or, with fmt="ndjson", one item per line.
+
+    In NDJSON mode the scalar `fields` are sent as X-<Field> headers instead
+    and there is no trailer.
+    """
+    fields = fields or {}
+    if fmt == "ndjson":
+        headers = {f"X-{name.replace('_', '-').title()}": str(value)
+                   for name, value in fields.items() if value is not None}
+        return Response(_logged(_buffered(_ndjson(items)), endpoint),
+                        mimetype="application/x-ndjson", headers=headers)
+    return Response(_logged(_buffered(_json_object(fields, key, items, trailer)), endpoint),
+                    mimetype="application/json")
@@ -6,3 +6,9 @@ PROJECT_ROOT = os.path.dirname(current_dir)
 
 DATA_LAKE_PATH = os.path.join(PROJECT_ROOT, "datalake")
 DATA_MART_PATH = os.path.join(PROJECT_ROOT, "datamart")
+
+GRAPH_PATH = os.environ.get("GRAPH_PATH", os.path.join(current_dir, "graph.bin"))
+GRAPH_PICKLE_PATH = os.path.join(current_dir, "graph.pkl")
+JOBS_PATH = os.environ.get("JOBS_PATH", os.path.join(current_dir, "jobs"))
+METRICS_PATH = os.environ.get("METRICS_PATH")
+PROFILE_PATH = os.environ.get("PROFILE_PATH", os.path.join(current_dir, "profiles"))
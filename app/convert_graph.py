@@ -0,0 +1,37 @@
+import sys
+import pickle
+import logging
+from graph.compact_graph import CompactGraph
+from graph.graph_builder import annotate_graph
+
+from config import GRAPH_PATH, GRAPH_PICKLE_PATH
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s %(levelname)s %(name)s %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+def main(source_path: str = GRAPH_PICKLE_PATH, target_path: str = GRAPH_PATH):
+    """Convert a legacy pickled networkx graph into the compact graph format.
+
+    Only run this on pickles you produced yourself: unpickling executes
+    arbitrary code from the file.
+    """
+    try:
+        with open(source_path, 'rb') as f:
+            nx_graph = pickle.load(f)
+
+        graph = CompactGraph.from_networkx(nx_graph)
+        annotate_graph(graph)
+        graph.save(target_path)
+        logger.info(f"Converted {source_path} into {target_path}: "
+                    f"{graph.node_count} nodes, {graph.edge_count} edges, version {graph.version}.")
+    except Exception as e:
+        logger.error(f"Error converting graph: {e}", exc_info=True)
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
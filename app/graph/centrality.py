@@ -0,0 +1,196 @@
+import math
+import heapq
+import random
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .compact_graph import CompactGraph
+from .components import ComponentIndex
+
+BETWEENNESS = "betweenness"
+CLOSENESS = "closeness"
+BETWEENNESS_ORDER = "betweenness_order"
+CLOSENESS_ORDER = "closeness_order"
+
+# Additive error on normalised betweenness, holding for every node at
+# once with probability 1 - DEFAULT_DELTA, and a cap on the BFS runs.
+DEFAULT_EPSILON = 0.05
+DEFAULT_DELTA = 0.1
+DEFAULT_MAX_SAMPLES = 1000
+# Below this many BFS steps (sources x (nodes + edges)), starting the
+# worker processes costs more than it saves.
+PARALLEL_WORK = 10 ** 8
+
+
+def sample_size(n: int, epsilon: float, delta: float = DEFAULT_DELTA,
+                max_samples: Optional[int] = None) -> int:
+    """Sources needed for `epsilon` error by Hoeffding's bound over all n nodes."""
+    if n == 0:
+        return 0
+    k = math.ceil(math.log(2 * n / delta) / (2 * epsilon ** 2))
+    return min(n, k, max_samples if max_samples is not None else k)
+
+
+def achieved_epsilon(n: int, samples: int, delta: float = DEFAULT_DELTA) -> float:
+    if samples >= n:
+        return 0.0
+    return math.sqrt(math.log(2 * n / delta) / (2 * samples))
+
+
+def accumulate(adj_offsets, adj, sources: List[int]) -> Tuple[List[float], List[float]]:
+    """Brandes' dependencies and the distance sums from each source, summed over `sources`."""
+    n = len(adj_offsets) - 1
+    dependency = [0.0] * n
+    distance_sum = [0.0] * n
+    dist = [-1] * n
+    sigma = [0.0] * n
+    delta = [0.0] * n
+    for s in sources:
+        dist[s] = 0
+        sigma[s] = 1.0
+        order = [s]
+        i = 0
+        while i < len(order):
+            u = order[i]
+            i += 1
+            du = dist[u] + 1
+            su = sigma[u]
+            for v in adj[adj_offsets[u]:adj_offsets[u + 1]]:
+                if dist[v] < 0:
+                    dist[v] = du
+                    order.append(v)
+                if dist[v] == du:
+                    sigma[v] += su
+
+        for w in reversed(order):
+            dw = dist[w]
+            coefficient = (1.0 + delta[w]) / sigma[w]
+            for v in adj[adj_offsets[w]:adj_offsets[w + 1]]:
+                if dist[v] == dw - 1:
+                    delta[v] += sigma[v] * coefficient
+            if w != s:
+                dependency[w] += delta[w]
+            distance_sum[w] += dw
+
+        for w in order:
+            dist[w] = -1
+            sigma[w] = 0.0
+            delta[w] = 0.0
+    return dependency, distance_sum
+
+
+_worker_adjacency: Optional[Tuple[array, array]] = None
+
+
+def _init_worker(adj_offsets: array, adj: array):
+    global _worker_adjacency
+    _worker_adjacency = (adj_offsets, adj)
+
+
+def _accumulate_worker(sources: List[int]) -> Tuple[List[float], List[float]]:
+    return accumulate(*_worker_adjacency, sources)
+
+
+class CentralityIndex:
+    """Approximate betweenness and closeness from BFS runs out of sampled sources.
+
+    Betweenness is Brandes' accumulation scaled by n / samples (exact when
+    every node is a source), normalised like networkx. Closeness uses the
+    distances from the sampled sources of each node's component to
+    estimate its distance sum, with the Wasserman-Faust correction for
+    disconnected graphs. On large graphs the sources are split across a
+    process pool.
+    Both scores and the nodes ordered by each, highest first, are stored
+    as sections of the graph file.
+    """
+
+    def __init__(self, betweenness, closeness, betweenness_order, closeness_order):
+        self.betweenness = betweenness
+        self.closeness = closeness
+        self.order = {BETWEENNESS: betweenness_order, CLOSENESS: closeness_order}
+
+    @classmethod
+    def build(cls, graph: CompactGraph, samples: Optional[int] = None, seed: int = 0,
+              processes: Optional[int] = None, components: Optional[ComponentIndex] = None) -> "CentralityIndex":
+        """Scores from `samples` random sources (every node when None)."""
+        n = graph.node_count
+        samples = n if samples is None else min(samples, n)
+        sources = sorted(random.Random(seed).sample(range(n), samples))
+        if components is None:
+            components = ComponentIndex.for_graph(graph)
+
+        processes = min(processes if processes is not None else multiprocessing.cpu_count(), len(sources))
+        if processes > 1 and len(sources) * (n + graph.edge_count) >= PARALLEL_WORK:
+            chunks = [sources[i::processes] for i in range(processes)]
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=processes, mp_context=context, initializer=_init_worker,
+                                     initargs=(array("Q", graph.adj_offsets), array("I", graph.adj))) as pool:
+                partials = list(pool.map(_accumulate_worker, chunks))
+            dependency = [sum(values) for values in zip(*(p[0] for p in partials))]
+            distance_sum = [sum(values) for values in zip(*(p[1] for p in partials))]
+        else:
+            dependency, distance_sum = accumulate(graph.adj_offsets, graph.adj, sources)
+
+        scale = n / samples / ((n - 1) * (n - 2)) if samples and n > 2 else 0.0
+        betweenness = array("d", (d * scale for d in dependency))
+
+        sampled = {}
+        for s in sources:
+            c = components.component_of(s)
+            sampled[c] = sampled.get(c, 0) + 1
+        closeness = array("d", [0.0]) * n
+        for u in range(n):
+            c = components.component_of(u)
+            size = components.size(c)
+            if size > 1 and c in sampled and distance_sum[u] > 0:
+                estimated_sum = distance_sum[u] * size / sampled[c]
+                closeness[u] = (size - 1) / (n - 1) * (size - 1) / estimated_sum
+
+        return cls(betweenness, closeness,
+                   array("I", sorted(range(n), key=lambda u: (-betweenness[u], u))),
+                   array("I", sorted(range(n), key=lambda u: (-closeness[u], u))))
+
+    def remapped(self, node_count: int, remap, new_nodes: List[int]) -> "CentralityIndex":
+        """These scores carried over to a graph with `new_nodes` inserted and
+        the old ids renumbered by `remap` (see insert_words); new nodes
+        score 0 until the next full computation."""
+        scores = {}
+        orders = {}
+        for by, values in ((BETWEENNESS, self.betweenness), (CLOSENESS, self.closeness)):
+            carried = array("d", [0.0]) * node_count
+            for u, score in zip(remap, values):
+                carried[u] = score
+            # remap keeps old ids in order, so ties stay sorted by id, and the
+            # new nodes join the zero scores at the tail in id order.
+            order = [remap[u] for u in self.order[by]]
+            positive = len(order)
+            while positive and carried[order[positive - 1]] == 0:
+                positive -= 1
+            orders[by] = array("I", order[:positive])
+            orders[by].extend(heapq.merge(order[positive:], new_nodes))
+            scores[by] = carried
+        return CentralityIndex(scores[BETWEENNESS], scores[CLOSENESS], orders[BETWEENNESS], orders[CLOSENESS])
+
+    @classmethod
+    def for_graph(cls, graph: CompactGraph) -> Optional["CentralityIndex"]:
+        """The index stored in the graph file; None if it was not computed at build time."""
+        sections = graph.sections
+        names = (BETWEENNESS, CLOSENESS, BETWEENNESS_ORDER, CLOSENESS_ORDER)
+        if not all(name in sections and len(sections[name]) == graph.node_count for name in names):
+            return None
+        return cls(*(sections[name] for name in names))
+
+    def sections(self) -> Dict[str, object]:
+        return {
+            BETWEENNESS: self.betweenness,
+            CLOSENESS: self.closeness,
+            BETWEENNESS_ORDER: self.order[BETWEENNESS],
+            CLOSENESS_ORDER: self.order[CLOSENESS],
+        }
+
+    def top(self, count: int, by: str = BETWEENNESS) -> List[int]:
+        if by not in self.order:
+            raise ValueError(f"Unknown centrality '{by}', expected '{BETWEENNESS}' or '{CLOSENESS}'.")
+        return list(self.order[by][:max(count, 0)])
@@ -0,0 +1,281 @@
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+import hashlib
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import networkx as nx
+
+from .edge_models import SUBSTITUTION, edge_index
+from .exceptions import GraphFormatException
+
+MAGIC = b"GWGRAPH\0"
+FORMAT_VERSION = 1
+
+# magic, format version, metadata length. The metadata is a JSON document
+# describing the graph and where each section lives; sections start at the
+# next 8-byte boundary and are stored little-endian.
+HEADER = struct.Struct("<8sII")
+ALIGNMENT = 8
+
+WORD_OFFSETS = "word_offsets"
+WORD_DATA = "word_data"
+ADJ_OFFSETS = "adj_offsets"
+NEIGHBORS = "neighbors"
+
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _typecode(values) -> str:
+    if isinstance(values, (bytes, bytearray)):
+        return "B"
+    return getattr(values, "typecode", None) or values.format
+
+
+def _to_bytes(values) -> bytes:
+    typecode = _typecode(values)
+    if typecode == "B":
+        return bytes(values)
+    if sys.byteorder != "little":
+        values = array(typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class WordTable:
+    """Sorted word table backed by an offsets array and a UTF-8 blob."""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def index(self, word: str, lo: int = 0, hi: Optional[int] = None) -> Optional[int]:
+        hi = len(self) if hi is None else hi
+        i = bisect_left(self, word, lo, hi)
+        if i < hi and self[i] == word:
+            return i
+        return None
+
+    def prefix_range(self, prefix: str, lo: int = 0, hi: Optional[int] = None) -> Tuple[int, int]:
+        """Half-open id range of the words starting with `prefix`."""
+        hi = len(self) if hi is None else hi
+        return bisect_left(self, prefix, lo, hi), bisect_left(self, prefix + "\U0010ffff", lo, hi)
+
+
+class CompactGraph:
+    """Word graph in CSR form: node ids are positions in the sorted word table
+    and the neighbours of node u are neighbors[adj_offsets[u]:adj_offsets[u + 1]].
+
+    Graphs loaded from disk are memory-mapped, so every array is a view over
+    the file and nothing is parsed until it is touched.
+    """
+
+    def __init__(self, words: WordTable, adj_offsets, neighbors, metadata: Optional[dict] = None,
+                 sections: Optional[dict] = None):
+        self.words = words
+        self.adj_offsets = adj_offsets
+        self.adj = neighbors
+        self.metadata = metadata or {}
+        self.sections = sections or {}
+        self.path: Optional[str] = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.adj) // 2
+
+    @property
+    def version(self) -> str:
+        return self.metadata.get("graph_version", "")
+
+    def word(self, node: int) -> str:
+        return self.words[node]
+
+    def index(self, word: str) -> Optional[int]:
+        return self.words.index(word)
+
+    def neighbors(self, node: int):
+        return self.adj[self.adj_offsets[node]:self.adj_offsets[node + 1]]
+
+    def degree(self, node: int) -> int:
+        return self.adj_offsets[node + 1] - self.adj_offsets[node]
+
+    def __contains__(self, word: str) -> bool:
+        return self.index(word) is not None
+
+    def __len__(self):
+        return self.node_count
+
+    def __repr__(self):
+        return f"CompactGraph with {self.node_count} nodes and {self.edge_count} edges."
+
+    @classmethod
+    def from_edges(cls, words: Iterable[str], edges: Iterable[Tuple[str, str]],
+                   metadata: Optional[dict] = None) -> "CompactGraph":
+        sorted_words = sorted(set(words))
+        ids = {w: i for i, w in enumerate(sorted_words)}
+        adjacency: List[List[int]] = [[] for _ in sorted_words]
+        for w1, w2 in edges:
+            u, v = ids[w1], ids[w2]
+            if u != v:
+                adjacency[u].append(v)
+                adjacency[v].append(u)
+
+        word_offsets = array("Q", [0])
+        word_data = bytearray()
+        for w in sorted_words:
+            word_data += w.encode("utf-8")
+            word_offsets.append(len(word_data))
+
+        adj_offsets = array("Q", [0])
+        neighbors = array("I")
+        for nbrs in adjacency:
+            neighbors.extend(sorted(set(nbrs)))
+            adj_offsets.append(len(neighbors))
+
+        return cls(WordTable(word_offsets, bytes(word_data)), adj_offsets, neighbors, dict(metadata or {}))
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], metadata: Optional[dict] = None,
+                   edge_model: str = SUBSTITUTION) -> "CompactGraph":
+        """Graph linking words one edit apart, with edits as defined by `edge_model`."""
+        index = edge_index(edge_model)
+        words = set(words)
+        index.add_words(words)
+        return cls.from_edges(words, index.edges(), dict(metadata or {}, edge_model=edge_model))
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph, metadata: Optional[dict] = None) -> "CompactGraph":
+        def word_of(n):
+            return getattr(n, "word", n)
+
+        words = [word_of(n) for n in graph.nodes]
+        edges = ((word_of(a), word_of(b)) for a, b in graph.edges)
+        return cls.from_edges(words, edges, metadata)
+
+    def to_networkx(self, nodes: Optional[Iterable[int]] = None) -> nx.Graph:
+        g = nx.Graph()
+        selected = range(self.node_count) if nodes is None else set(nodes)
+        for u in selected:
+            g.add_node(self.word(u))
+        for u in selected:
+            for v in self.neighbors(u):
+                if u < v and v in selected:
+                    g.add_edge(self.word(u), self.word(v))
+        return g
+
+    def content_hash(self) -> str:
+        h = hashlib.blake2b(digest_size=8)
+        h.update(_to_bytes(self.words.offsets))
+        h.update(_to_bytes(self.words.data))
+        h.update(_to_bytes(self.adj_offsets))
+        h.update(_to_bytes(self.adj))
+        return h.hexdigest()
+
+    def save(self, path: str, extra_sections: Optional[Dict[str, object]] = None):
+        """Write the graph atomically (temp file + rename) to `path`."""
+        sections = {
+            WORD_OFFSETS: self.words.offsets,
+            WORD_DATA: self.words.data,
+            ADJ_OFFSETS: self.adj_offsets,
+            NEIGHBORS: self.adj,
+        }
+        sections.update(self.sections)
+        sections.update(extra_sections or {})
+
+        metadata = dict(self.metadata)
+        metadata.update({
+            "format_version": FORMAT_VERSION,
+            "node_count": self.node_count,
+            "edge_count": self.edge_count,
+            "graph_version": self.content_hash(),
+            "created_at": metadata.get("created_at", time.time()),
+        })
+
+        layout = {}
+        blobs = []
+        position = 0
+        for name, values in sections.items():
+            typecode = _typecode(values)
+            blob = _to_bytes(values)
+            layout[name] = {"offset": position, "length": len(blob) // array(typecode).itemsize,
+                            "typecode": typecode}
+            blobs.append(blob)
+            position = _align(position + len(blob))
+        metadata["sections"] = layout
+
+        meta_bytes = json.dumps(metadata, sort_keys=True).encode("utf-8")
+        data_start = _align(HEADER.size + len(meta_bytes))
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta_bytes)))
+            f.write(meta_bytes)
+            for name, blob in zip(layout, blobs):
+                f.seek(data_start + layout[name]["offset"])
+                f.write(blob)
+            f.truncate(data_start + position)
+        os.replace(tmp_path, path)
+        self.metadata = metadata
+
+    @classmethod
+    def load(cls, path: str) -> "CompactGraph":
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise GraphFormatException(f"Empty graph file {path}: {e}")
+
+        if len(mm) < HEADER.size:
+            raise GraphFormatException(f"Truncated graph file {path}")
+        magic, version, meta_len = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise GraphFormatException(f"{path} is not a graph file")
+        if version != FORMAT_VERSION:
+            raise GraphFormatException(f"Unsupported graph format version {version} in {path}")
+
+        metadata = json.loads(bytes(mm[HEADER.size:HEADER.size + meta_len]).decode("utf-8"))
+        data_start = _align(HEADER.size + meta_len)
+        buffer = memoryview(mm)
+
+        sections = {}
+        for name, info in metadata["sections"].items():
+            typecode = info["typecode"]
+            start = data_start + info["offset"]
+            end = start + info["length"] * array(typecode).itemsize
+            if end > len(mm):
+                raise GraphFormatException(f"Section {name} runs past the end of {path}")
+            view = buffer[start:end]
+            if typecode != "B":
+                if sys.byteorder == "little":
+                    view = view.cast(typecode)
+                else:
+                    values = array(typecode, bytes(view))
+                    values.byteswap()
+                    view = values
+            sections[name] = view
+
+        words = WordTable(sections.pop(WORD_OFFSETS), sections.pop(WORD_DATA))
+        graph = cls(words, sections.pop(ADJ_OFFSETS), sections.pop(NEIGHBORS), metadata, sections)
+        graph.path = path
+        return graph
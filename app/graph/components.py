@@ -0,0 +1,155 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from .compact_graph import CompactGraph
+
+COMPONENT_LABELS = "component_labels"
+COMPONENT_OFFSETS = "component_offsets"
+COMPONENT_NODES = "component_nodes"
+COMPONENT_BY_SIZE = "component_by_size"
+COMPONENT_SORTED_SIZES = "component_sorted_sizes"
+
+
+def component_labels(graph: CompactGraph) -> array:
+    """Label every node with the id of its connected component.
+
+    Component ids are dense and numbered in order of their smallest node id.
+    """
+    n = graph.node_count
+    unlabeled = 0xFFFFFFFF
+    labels = array("I", [unlabeled]) * n
+    next_label = 0
+    for root in range(n):
+        if labels[root] != unlabeled:
+            continue
+        labels[root] = next_label
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for v in graph.neighbors(u):
+                if labels[v] == unlabeled:
+                    labels[v] = next_label
+                    stack.append(v)
+        next_label += 1
+    return labels
+
+
+class ComponentIndex:
+    """Connected components of a graph, computed once.
+
+    `labels[u]` is the component of node u and the members of component c
+    are nodes[offsets[c]:offsets[c + 1]], in node id order. The arrays,
+    including the size ordering used by `query`, are stored as sections of
+    the graph file, so loading the index costs nothing and every process
+    mapping the file shares them; graphs saved without them get the index
+    computed on first use.
+    """
+
+    def __init__(self, labels, offsets, nodes):
+        self.labels = labels
+        self.offsets = offsets
+        self.nodes = nodes
+        self._by_size: Optional[Tuple[array, array]] = None
+
+    @classmethod
+    def build(cls, graph: CompactGraph) -> "ComponentIndex":
+        labels = component_labels(graph)
+        count = max(labels) + 1 if len(labels) else 0
+        offsets = array("Q", [0]) * (count + 1)
+        for c in labels:
+            offsets[c + 1] += 1
+        for c in range(count):
+            offsets[c + 1] += offsets[c]
+        nodes = array("I", [0]) * len(labels)
+        fill = array("Q", offsets[:-1])
+        for u, c in enumerate(labels):
+            nodes[fill[c]] = u
+            fill[c] += 1
+        return cls(labels, offsets, nodes)
+
+    @classmethod
+    def for_graph(cls, graph: CompactGraph) -> "ComponentIndex":
+        """The index stored in the graph file, or a freshly computed one."""
+        sections = graph.sections
+        if all(name in sections for name in (COMPONENT_LABELS, COMPONENT_OFFSETS, COMPONENT_NODES)) \
+                and len(sections[COMPONENT_LABELS]) == graph.node_count:
+            index = cls(sections[COMPONENT_LABELS], sections[COMPONENT_OFFSETS], sections[COMPONENT_NODES])
+            if COMPONENT_BY_SIZE in sections and COMPONENT_SORTED_SIZES in sections:
+                index._by_size = sections[COMPONENT_BY_SIZE], sections[COMPONENT_SORTED_SIZES]
+            return index
+        return cls.build(graph)
+
+    def sections(self) -> Dict[str, object]:
+        by_size, sizes = self._sorted_by_size()
+        return {
+            COMPONENT_LABELS: self.labels,
+            COMPONENT_OFFSETS: self.offsets,
+            COMPONENT_NODES: self.nodes,
+            COMPONENT_BY_SIZE: by_size,
+            COMPONENT_SORTED_SIZES: sizes,
+        }
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets) - 1
+
+    def component_of(self, node: int) -> int:
+        return self.labels[node]
+
+    def connected(self, u: int, v: int) -> bool:
+        return self.labels[u] == self.labels[v]
+
+    def size(self, component: int) -> int:
+        return self.offsets[component + 1] - self.offsets[component]
+
+    def members(self, component: int):
+        return self.nodes[self.offsets[component]:self.offsets[component + 1]]
+
+    def groups(self) -> List:
+        """Members of every component, largest component first."""
+        return [self.members(c) for c in reversed(self._sorted_by_size()[0])]
+
+    def largest_size(self) -> int:
+        sizes = self._sorted_by_size()[1]
+        return sizes[-1] if sizes else 0
+
+    def size_distribution(self) -> Dict[int, int]:
+        """Number of components of each size."""
+        distribution: Dict[int, int] = {}
+        for c in range(self.count):
+            size = self.size(c)
+            distribution[size] = distribution.get(size, 0) + 1
+        return distribution
+
+    def query(self, offset: int = 0, limit: Optional[int] = None, min_size: Optional[int] = None,
+              max_size: Optional[int] = None, order: str = "desc") -> Tuple[int, List[int]]:
+        """Page through the components whose size is within [min_size, max_size].
+
+        Returns (number of matching components, ids of the requested page).
+        `order` is "desc" (largest first, equal sizes by ascending id) or
+        "asc", which is exactly the reverse.
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unknown order '{order}', expected 'asc' or 'desc'.")
+        by_size, sizes = self._sorted_by_size()
+        lo = bisect_left(sizes, min_size) if min_size is not None else 0
+        hi = bisect_right(sizes, max_size) if max_size is not None else len(sizes)
+        total = max(hi - lo, 0)
+        offset = max(offset, 0)
+        if limit is None:
+            limit = total
+        if order == "asc":
+            start = lo + offset
+            page = list(by_size[start:min(start + limit, hi)])
+        else:
+            end = hi - offset
+            page = list(by_size[max(end - limit, lo):max(end, lo)])
+            page.reverse()
+        return total, page
+
+    def _sorted_by_size(self) -> Tuple[array, array]:
+        if self._by_size is None:
+            by_size = array("I", sorted(range(self.count), key=lambda c: (self.size(c), -c)))
+            self._by_size = by_size, array("Q", (self.size(c) for c in by_size))
+        return self._by_size
@@ -0,0 +1,85 @@
+from array import array
+from typing import Dict, Optional
+
+from .compact_graph import CompactGraph
+
+DEGREE_ORDER = "degree_order"
+DEGREE_AT_LEAST = "degree_at_least"
+
+
+class DegreeIndex:
+    """Nodes sorted by degree, highest first, equal degrees by node id.
+
+    `at_least[d]` is the number of nodes of degree >= d, so the nodes of
+    degree >= k are order[:at_least[k]] and those of degree k are
+    order[at_least[k + 1]:at_least[k]]. Like the component index, both
+    arrays are stored as sections of the graph file.
+    """
+
+    def __init__(self, order, at_least):
+        self.order = order
+        self.at_least = at_least
+
+    @classmethod
+    def build(cls, graph: CompactGraph) -> "DegreeIndex":
+        offsets = graph.adj_offsets
+        n = graph.node_count
+        max_degree = max((offsets[u + 1] - offsets[u] for u in range(n)), default=0)
+        at_least = array("Q", [0]) * (max_degree + 2)
+        for u in range(n):
+            at_least[offsets[u + 1] - offsets[u]] += 1
+        for d in range(max_degree - 1, -1, -1):
+            at_least[d] += at_least[d + 1]
+
+        # Counting sort: degree d fills order[at_least[d + 1]:at_least[d]].
+        fill = array("Q", at_least[1:])
+        order = array("I", [0]) * n
+        for u in range(n):
+            d = offsets[u + 1] - offsets[u]
+            order[fill[d]] = u
+            fill[d] += 1
+        return cls(order, at_least)
+
+    @classmethod
+    def for_graph(cls, graph: CompactGraph) -> "DegreeIndex":
+        """The index stored in the graph file, or a freshly computed one."""
+        sections = graph.sections
+        if DEGREE_ORDER in sections and DEGREE_AT_LEAST in sections \
+                and len(sections[DEGREE_ORDER]) == graph.node_count:
+            return cls(sections[DEGREE_ORDER], sections[DEGREE_AT_LEAST])
+        return cls.build(graph)
+
+    def sections(self) -> Dict[str, object]:
+        return {DEGREE_ORDER: self.order, DEGREE_AT_LEAST: self.at_least}
+
+    @property
+    def max_degree(self) -> int:
+        return len(self.at_least) - 2
+
+    def count_at_least(self, degree: int) -> int:
+        return self.at_least[min(max(degree, 0), len(self.at_least) - 1)]
+
+    def count(self, degree: int) -> int:
+        if degree < 0 or degree > self.max_degree:
+            return 0
+        return self.at_least[degree] - self.at_least[degree + 1]
+
+    def at_least_slice(self, degree: int, offset: int = 0, limit: Optional[int] = None):
+        """Nodes of degree >= `degree`, highest degree first."""
+        return self._page(0, self.count_at_least(degree), offset, limit)
+
+    def exactly(self, degree: int, offset: int = 0, limit: Optional[int] = None):
+        """Nodes of degree exactly `degree`, in node id order."""
+        if degree < 0 or degree > self.max_degree:
+            return self.order[0:0]
+        return self._page(self.at_least[degree + 1], self.at_least[degree], offset, limit)
+
+    def distribution(self) -> Dict[int, int]:
+        """Number of nodes of each degree that occurs."""
+        return {d: self.count(d) for d in range(self.max_degree + 1) if self.count(d)}
+
+    def _page(self, start: int, end: int, offset: int, limit: Optional[int]):
+        start = min(start + max(offset, 0), end)
+        if limit is not None:
+            end = min(end, start + max(limit, 0))
+        return self.order[start:end]
@@ -0,0 +1,68 @@
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+
+def _substitution_key(a: str, b: str) -> Optional[str]:
+    """The deletion `a` and `b` share if they differ by one substitution, else None."""
+    if len(a) != len(b):
+        return None
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if i == len(a) or a[i + 1:] != b[i + 1:]:
+        return None
+    return a[:i] + a[i + 1:]
+
+
+class DeletionIndex:
+    """Buckets words by the strings left after deleting one letter (SymSpell).
+
+    'cart' goes into the buckets 'art', 'crt', 'cat' and 'car'. Words one
+    edit apart always meet in a bucket: 'cat' is the key of the bucket
+    holding 'cart' (an insertion), and 'cat' and 'cut' both sit in 'ct' (a
+    substitution). Edges are read off bucket by bucket, so the build costs
+    O(total word length) lookups plus the pairs inside each bucket, instead
+    of comparing words of equal and adjacent lengths pairwise.
+    """
+
+    def __init__(self):
+        self.words: Set[str] = set()
+        self.buckets: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def deletions(word: str) -> Set[str]:
+        return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+    def add(self, word: str):
+        self.words.add(word)
+        for d in self.deletions(word):
+            self.buckets.setdefault(d, set()).add(word)
+
+    def add_words(self, words: Iterable[str]):
+        for w in words:
+            self.add(w)
+
+    def neighbors(self, word: str) -> Set[str]:
+        result = set(self.buckets.get(word, ()))
+        for d in self.deletions(word):
+            if d in self.words:
+                result.add(d)
+            result.update(w for w in self.buckets.get(d, ()) if _substitution_key(word, w) is not None)
+        result.discard(word)
+        return result
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        for key, bucket in self.buckets.items():
+            if key in self.words:
+                for w in sorted(bucket):
+                    yield key, w
+            if len(bucket) > 1:
+                # Words of one bucket share a deletion but may differ by a
+                # transposition ('ab', 'ba'); a substitution pair is only
+                # reported from the bucket of its own deletion, so once.
+                for a, b in combinations(sorted(bucket), 2):
+                    if _substitution_key(a, b) == key:
+                        yield a, b
+
+    def __len__(self):
+        return len(self.buckets)
@@ -0,0 +1,111 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .compact_graph import CompactGraph
+from .components import ComponentIndex
+from .path_engine import PathEngine
+
+
+class _BFS:
+    """Level-by-level BFS over the CSR arrays with a reusable visited stamp."""
+
+    def __init__(self, graph: CompactGraph):
+        self.graph = graph
+        self.stamp = array("I", [0]) * graph.node_count
+        self.generation = 0
+        self.runs = 0
+
+    def levels(self, source: int) -> List[List[int]]:
+        adj = self.graph.adj
+        offsets = self.graph.adj_offsets
+        self.generation += 1
+        self.runs += 1
+        gen = self.generation
+        stamp = self.stamp
+        stamp[source] = gen
+        levels = [[source]]
+        while True:
+            frontier = []
+            for u in levels[-1]:
+                for v in adj[offsets[u]:offsets[u + 1]]:
+                    if stamp[v] != gen:
+                        stamp[v] = gen
+                        frontier.append(v)
+            if not frontier:
+                return levels
+            levels.append(frontier)
+
+    def eccentricity(self, source: int) -> Tuple[int, int]:
+        """Return (eccentricity, one farthest node) of `source`."""
+        levels = self.levels(source)
+        return len(levels) - 1, levels[-1][0]
+
+
+def component_diameter(bfs: _BFS, nodes: List[int]) -> Tuple[int, int, int]:
+    """Exact diameter of one component with iFUB; returns (diameter, a, b).
+
+    A double sweep from the highest-degree node gives a lower bound and a
+    central start node u. Walking u's BFS levels from the outside in, the
+    nodes of level i have eccentricity at most 2*i, so once the best
+    eccentricity found exceeds 2*(i - 1) no inner level can beat it.
+    """
+    if len(nodes) == 1:
+        return 0, nodes[0], nodes[0]
+    graph = bfs.graph
+    if len(nodes) == 2:
+        return 1, nodes[0], nodes[1]
+
+    r = max(nodes, key=graph.degree)
+    _, a = bfs.eccentricity(r)
+    sweep = bfs.levels(a)
+    best, best_a, best_b = len(sweep) - 1, a, sweep[-1][0]
+
+    # Middle node of the a -> b sweep: walk back from b halfway.
+    u = best_b
+    dist = {v: d for d, level in enumerate(sweep) for v in level} if best > 1 else {}
+    for _ in range(best // 2):
+        u = next(v for v in graph.neighbors(u) if dist.get(v) == dist[u] - 1)
+
+    levels = bfs.levels(u)
+    if len(levels) - 1 > best:
+        best, best_a, best_b = len(levels) - 1, u, levels[-1][0]
+
+    for i in range(len(levels) - 1, 0, -1):
+        for v in levels[i]:
+            ecc, far = bfs.eccentricity(v)
+            if ecc > best:
+                best, best_a, best_b = ecc, v, far
+        if best >= 2 * (i - 1):
+            break
+    return best, best_a, best_b
+
+
+def graph_diameter(graph: CompactGraph, components: Optional[ComponentIndex] = None,
+                   path_engine=None) -> Dict[str, object]:
+    """Largest eccentricity over all components, its endpoints and one path."""
+    if components is None:
+        components = ComponentIndex.for_graph(graph)
+
+    bfs = _BFS(graph)
+    best: Optional[Tuple[int, int, int]] = None
+    for nodes in components.groups():
+        # A component of k nodes cannot have a diameter above k - 1.
+        if best is not None and len(nodes) - 1 <= best[0]:
+            break
+        result = component_diameter(bfs, nodes)
+        if best is None or result[0] > best[0]:
+            best = result
+
+    if best is None:
+        return {"diameter": 0, "endpoints": [], "path": [], "bfs_runs": 0}
+
+    diameter, a, b = best
+    if path_engine is None:
+        path_engine = PathEngine(graph, components)
+    path = [graph.word(u) for u in path_engine.shortest_path_ids(a, b)]
+    return {
+        "diameter": diameter,
+        "endpoints": [graph.word(a), graph.word(b)],
+        "path": path,
+        "bfs_runs": bfs.runs,
+    }
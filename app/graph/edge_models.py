@@ -0,0 +1,24 @@
+from .deletion_index import DeletionIndex
+from .pattern_index import PatternIndex
+
+# Words are linked when one letter is replaced...
+SUBSTITUTION = "substitution"
+# ...or also when one letter is inserted or deleted (Levenshtein distance 1).
+LEVENSHTEIN = "levenshtein"
+
+EDGE_MODELS = {
+    SUBSTITUTION: PatternIndex,
+    LEVENSHTEIN: DeletionIndex,
+}
+
+
+def edge_index(model: str):
+    """An empty word index whose `edges()` follow `model`."""
+    if model not in EDGE_MODELS:
+        raise ValueError(f"Unknown edge model '{model}', expected one of {', '.join(EDGE_MODELS)}.")
+    return EDGE_MODELS[model]()
+
+
+def edge_model(graph) -> str:
+    """The edge model a graph was built with; graphs predating the setting used substitution."""
+    return graph.metadata.get("edge_model", SUBSTITUTION)
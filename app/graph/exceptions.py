@@ -0,0 +1,2 @@
+class GraphFormatException(Exception):
+    pass
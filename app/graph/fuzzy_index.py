@@ -0,0 +1,195 @@
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+from .compact_graph import CompactGraph
+from .edge_models import SUBSTITUTION
+
+FUZZY_KEYS = "fuzzy_keys"
+FUZZY_OFFSETS = "fuzzy_offsets"
+FUZZY_NODES = "fuzzy_nodes"
+
+MAX_DISTANCE = 2
+
+
+def _key(s: str) -> int:
+    return zlib.crc32(s.encode("utf-8"))
+
+
+def _reduced(word: str) -> Set[str]:
+    """`word` and every string left after deleting one of its letters."""
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _edits(word: str, alphabet: List[str]) -> Set[str]:
+    """Every string one substitution, insertion or deletion away from `word`."""
+    result = {word[:i] + word[i + 1:] for i in range(len(word))}
+    for i in range(len(word) + 1):
+        prefix, rest = word[:i], word[i:]
+        for c in alphabet:
+            result.add(prefix + c + rest)
+            if rest:
+                result.add(prefix + c + rest[1:])
+    result.discard(word)
+    return result
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between `a` and `b`, or limit + 1 once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class FuzzyIndex:
+    """Finds the graph words within a small edit distance of any string.
+
+    Every word is filed under a 32-bit hash of itself and of each string
+    left after deleting one of its letters. Two strings one edit apart
+    share such a string, so the words one edit away from a query are among
+    those filed under the query's own reductions: len(query) + 1 binary
+    searches, whatever the vocabulary size. Hash collisions and
+    transpositions are weeded out by computing the real distance of each
+    candidate. Words two edits away are the words one edit away from one
+    of the query's single edits over the graph's alphabet.
+
+    Like the component index, the sorted hashes and the node lists are
+    stored as sections of the graph file.
+    """
+
+    def __init__(self, graph: CompactGraph, keys, offsets, nodes):
+        self.graph = graph
+        self.keys = keys
+        self.offsets = offsets
+        self.nodes = nodes
+        self._alphabet: Optional[List[str]] = None
+        self._max_length: Optional[int] = None
+
+    @classmethod
+    def build(cls, graph: CompactGraph) -> "FuzzyIndex":
+        packed = sorted(_key(r) << 32 | u for u in range(graph.node_count) for r in _reduced(graph.word(u)))
+        keys = array("I")
+        offsets = array("Q", [0])
+        nodes = array("I")
+        for entry in packed:
+            key = entry >> 32
+            if not keys or keys[-1] != key:
+                if keys:
+                    offsets.append(len(nodes))
+                keys.append(key)
+            nodes.append(entry & 0xFFFFFFFF)
+        if keys:
+            offsets.append(len(nodes))
+        return cls(graph, keys, offsets, nodes)
+
+    def merge(self, graph: CompactGraph, remap, new_nodes: List[int]) -> "FuzzyIndex":
+        """The index of `graph`, which is this index's graph with `new_nodes`
+        inserted and the old node ids renumbered by `remap` (see insert_words).
+
+        Old entries are copied over in runs between the keys the new words
+        add, so only the new words are hashed.
+        """
+        added: Dict[int, List[int]] = {}
+        for u in new_nodes:
+            for r in _reduced(graph.word(u)):
+                added.setdefault(_key(r), []).append(u)
+
+        old_keys, old_offsets = self.keys, self.offsets
+        old_nodes = array("I", map(remap.__getitem__, self.nodes))
+        keys = array("I")
+        offsets = array("Q", [0])
+        nodes = array("I")
+
+        def copy(a: int, b: int):
+            if a >= b:
+                return
+            shift = len(nodes) - old_offsets[a]
+            keys.frombytes(bytes(old_keys[a:b]))
+            nodes.extend(old_nodes[old_offsets[a]:old_offsets[b]])
+            offsets.extend(o + shift for o in old_offsets[a + 1:b + 1])
+
+        done = 0
+        for key in sorted(added):
+            i = bisect_left(old_keys, key, done)
+            copy(done, i)
+            group = added[key]
+            if i < len(old_keys) and old_keys[i] == key:
+                group = list(old_nodes[old_offsets[i]:old_offsets[i + 1]]) + group
+                i += 1
+            keys.append(key)
+            nodes.extend(sorted(group))
+            offsets.append(len(nodes))
+            done = i
+        copy(done, len(old_keys))
+        return FuzzyIndex(graph, keys, offsets, nodes)
+
+    @classmethod
+    def for_graph(cls, graph: CompactGraph) -> "FuzzyIndex":
+        """The index stored in the graph file, or a freshly computed one."""
+        sections = graph.sections
+        if all(name in sections for name in (FUZZY_KEYS, FUZZY_OFFSETS, FUZZY_NODES)):
+            return cls(graph, sections[FUZZY_KEYS], sections[FUZZY_OFFSETS], sections[FUZZY_NODES])
+        return cls.build(graph)
+
+    def sections(self) -> Dict[str, object]:
+        return {FUZZY_KEYS: self.keys, FUZZY_OFFSETS: self.offsets, FUZZY_NODES: self.nodes}
+
+    @property
+    def alphabet(self) -> List[str]:
+        if self._alphabet is None:
+            self._alphabet = sorted(set(str(self.graph.words.data, "utf-8")))
+        return self._alphabet
+
+    @property
+    def max_length(self) -> int:
+        """Length in bytes of the longest word, never less than its length in letters."""
+        if self._max_length is None:
+            offsets = self.graph.words.offsets
+            self._max_length = max((b - a for a, b in zip(offsets, offsets[1:])), default=0)
+        return self._max_length
+
+    def _candidates(self, s: str) -> Set[int]:
+        found = set()
+        for r in _reduced(s):
+            key = _key(r)
+            i = bisect_left(self.keys, key)
+            if i < len(self.keys) and self.keys[i] == key:
+                found.update(self.nodes[self.offsets[i]:self.offsets[i + 1]])
+        return found
+
+    def nearest(self, word: str, max_distance: int = 1) -> List[Tuple[int, int]]:
+        """(node, distance) for every word within `max_distance` edits of `word`,
+        closest first and then in word order."""
+        if not 0 <= max_distance <= MAX_DISTANCE:
+            raise ValueError(f"max_distance must be between 0 and {MAX_DISTANCE}.")
+        # Nothing is within reach of a longer word, and the edits of a long
+        # word grow with the square of its length.
+        if len(word) > self.max_length + max_distance:
+            return []
+        if max_distance == 0:
+            u = self.graph.index(word)
+            return [] if u is None else [(u, 0)]
+
+        queries = {word}
+        if max_distance == 2:
+            queries |= _edits(word, self.alphabet)
+        found: Dict[int, int] = {}
+        for q in queries:
+            for u in self._candidates(q):
+                if u not in found:
+                    found[u] = edit_distance(self.graph.word(u), word, max_distance)
+        return sorted(((u, d) for u, d in found.items() if d <= max_distance), key=lambda item: (item[1], item[0]))
+
+    def neighbors(self, word: str, edge_model: str) -> List[int]:
+        """The words `word` would be linked to if it were added under `edge_model`."""
+        return [u for u, d in self.nearest(word, 1)
+                if d == 1 and (edge_model != SUBSTITUTION or len(self.graph.word(u)) == len(word))]
@@ -1,9 +1,12 @@
 import networkx as nx
+from typing import Iterable
 from .node import Node
+from .edge_models import LEVENSHTEIN, SUBSTITUTION, edge_index
 
 class Graph:
-    def __init__(self):
+    def __init__(self, edge_model: str = SUBSTITUTION):
         self.graph = nx.Graph()
+        self.edge_model = edge_model
 
     def add_node(self, word: str):
         n = Node(word)
@@ -22,10 +25,31 @@ class Graph:
                 return True
         return False
 
+    def add_words(self, words: Iterable[str]) -> int:
+        index = edge_index(self.edge_model)
+        for w in words:
+            self.add_node(w)
+            index.add(w)
+
+        total_edges = 0
+        for w1, w2 in index.edges():
+            n1 = Node(w1)
+            n2 = Node(w2)
+            if not self.graph.has_edge(n1, n2):
+                self.graph.add_edge(n1, n2)
+                total_edges += 1
+        return total_edges
+
     def _is_one_letter_apart(self, w1, w2):
-        if len(w1) != len(w2):
+        if len(w1) == len(w2):
+            return sum(a != b for a, b in zip(w1, w2)) == 1
+        if self.edge_model != LEVENSHTEIN or abs(len(w1) - len(w2)) != 1:
             return False
-        return sum(a != b for a, b in zip(w1, w2)) == 1
+        short, long = (w1, w2) if len(w1) < len(w2) else (w2, w1)
+        i = 0
+        while i < len(short) and short[i] == long[i]:
+            i += 1
+        return short[i:] == long[i + 1:]
 
     def shortest_path(self, w1: str, w2: str):
         return nx.shortest_path(self.graph, Node(w1), Node(w2))
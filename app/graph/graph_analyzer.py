@@ -1,147 +1,305 @@
+import time
+from itertools import islice
+from typing import Iterator, Optional, List, Sequence, Tuple
 import networkx as nx
-from typing import Optional, List
-import matplotlib.pyplot as plt
-from graph.node import Node
+from graph.centrality import BETWEENNESS, CentralityIndex
+from graph.compact_graph import CompactGraph
+from graph.components import ComponentIndex
+from graph.degrees import DegreeIndex
+from graph.path_engine import PathEngine
+from graph.diameter import graph_diameter
+from graph.edge_models import edge_model
+from graph.fuzzy_index import FuzzyIndex
+from graph.k_shortest import k_shortest_paths
+from graph.longest_path import SearchBudget, longest_path
+from graph.render import draw, layout, neighborhood
 
 class GraphAnalyzer:
-    def __init__(self, graph: nx.Graph):
+    def __init__(self, graph: CompactGraph):
         self.graph = graph
+        self.components = ComponentIndex.for_graph(graph)
+        self.degrees = DegreeIndex.for_graph(graph)
+        self.fuzzy = FuzzyIndex.for_graph(graph)
+        self.centrality = CentralityIndex.for_graph(graph)
+        self.path_engine = PathEngine(graph, self.components)
+        self._diameter = None
 
     def get_basic_info(self) -> dict:
-        n = self.graph.number_of_nodes()
-        degree_sum = sum(dict(self.graph.degree()).values())
-        connected_components = list(nx.connected_components(self.graph))
+        n = self.graph.node_count
 
         info = {
             'number_of_nodes': n,
-            'number_of_edges': self.graph.number_of_edges(),
-            'average_degree': degree_sum / n if n > 0 else 0,
-            'number_of_connected_components': len(connected_components),
-            'largest_component_size': max(len(c) for c in connected_components) if connected_components else 0
+            'number_of_edges': self.graph.edge_count,
+            'average_degree': 2 * self.graph.edge_count / n if n > 0 else 0,
+            'number_of_connected_components': self.components.count,
+            'largest_component_size': self.components.largest_size(),
+            'edge_model': edge_model(self.graph)
         }
         return info
 
     def get_degree_distribution(self) -> dict:
-        distribution = {}
-        for _, deg in self.graph.degree():
-            distribution[deg] = distribution.get(deg, 0) + 1
-        return distribution
-    
-    def maximum_distance_among_all(self, limit: Optional[int] = None) -> (int, List[str]): # type: ignore
-        best_dist = 0
-        best_path_nodes = []
+        return self.degrees.distribution()
 
-        nodes_list = list(self.graph.nodes)
-        n = len(nodes_list)
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                start_node = nodes_list[i]
-                end_node = nodes_list[j]
-                cutoff_val = limit if limit is not None else None
+    def maximum_distance_among_all(self, limit: Optional[int] = None) -> (int, List[str]): # type: ignore
+        result = self.longest_path(limit)
+        return result["distance"], result["path"]
 
-                for path_nodes in nx.all_simple_paths(
-                        self.graph, start_node, end_node, cutoff=cutoff_val):
-                    dist = len(path_nodes) - 1
-                    if dist > best_dist:
-                        best_dist = dist
-                        best_path_nodes = path_nodes
+    def longest_path(self, limit: Optional[int] = None, time_budget: Optional[float] = None,
+                     max_expansions: Optional[int] = None, processes: Optional[int] = None,
+                     budget: Optional[SearchBudget] = None) -> dict:
+        """Longest simple path in the graph within the given budget.
 
-        best_path_str = [n.word for n in best_path_nodes]
-        return best_dist, best_path_str
+        The diameter path seeds the search as a lower bound; the result says
+        whether the returned path is proven optimal.
+        """
+        diameter = self.diameter()
+        return longest_path(self.graph, max_length=limit, time_limit=time_budget,
+                            max_expansions=max_expansions, components=self.components,
+                            lower_bound=(diameter["diameter"], diameter["path"]),
+                            processes=processes, budget=budget)
 
-    def maximum_distance_between(self, source: str, target: str, limit: Optional[int] = None) -> (int, List[str]): # type: ignore
-        s_node = Node(source)
-        t_node = Node(target)
+    def maximum_distance_between(self, source: str, target: str, limit: Optional[int] = None,
+                                 budget: Optional[SearchBudget] = None) -> (int, List[str]): # type: ignore
+        s = self.graph.index(source)
+        t = self.graph.index(target)
 
-        if s_node not in self.graph or t_node not in self.graph:
+        if s is None or t is None:
             return 0, []
 
         best_dist = 0
         best_path_nodes = []
-        cutoff_val = limit if limit is not None else None
 
-        for path_nodes in nx.all_simple_paths(self.graph, s_node, t_node, cutoff=cutoff_val):
+        for path_nodes in self._simple_paths(s, t, cutoff=limit, budget=budget):
             dist = len(path_nodes) - 1
             if dist > best_dist:
                 best_dist = dist
                 best_path_nodes = path_nodes
 
-        best_path_str = [n.word for n in best_path_nodes]
-        return best_dist, best_path_str
+        return best_dist, self._words(best_path_nodes)
+
+    def neighbors_of(self, word: str) -> List[str]:
+        """Words linked to `word`, or that it would be linked to if it were in the graph."""
+        u = self.graph.index(word)
+        if u is not None:
+            return self._words(self.graph.neighbors(u))
+        return self._words(self.fuzzy.neighbors(word, edge_model(self.graph)))
+
+    def nearest(self, word: str, max_distance: int = 1, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Graph words within `max_distance` edits of `word`, closest first."""
+        matches = self.fuzzy.nearest(word, max_distance)
+        return [(self.graph.word(u), d) for u, d in matches[:limit]]
 
     def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
-        s_node = Node(source)
-        t_node = Node(target)
+        return self.path_engine.shortest_path(source, target)
 
-        if s_node not in self.graph or t_node not in self.graph:
-            return None
+    def shortest_paths(self, pairs: Sequence[Tuple[str, str]], include_paths: bool = True) -> dict:
+        """Distances (and paths) for many word pairs, sharing work between pairs.
 
-        try:
-            path_nodes = nx.shortest_path(self.graph, source=s_node, target=t_node)
-            return [n.word for n in path_nodes]
-        except nx.NetworkXNoPath:
-            return None
+        Each result has `distance` None when the words are not connected and
+        an `error` when a word is not in the graph.
+        """
+        start = time.perf_counter()
+        results = []
+        known = []
+        for w1, w2 in pairs:
+            result = {'word1': w1, 'word2': w2, 'distance': None}
+            missing = [w for w in (w1, w2) if self.graph.index(w) is None]
+            if missing:
+                result['error'] = f"Unknown word '{missing[0]}'"
+            else:
+                known.append((len(results), self.graph.index(w1), self.graph.index(w2)))
+            results.append(result)
+
+        paths, stats = self.path_engine.shortest_paths([(s, t) for _, s, t in known])
+        for (i, _, _), path in zip(known, paths):
+            if path is not None:
+                results[i]['distance'] = len(path) - 1
+            if include_paths:
+                results[i]['path'] = self._words(path) if path is not None else None
 
-    def all_paths(self, source: str, target: str, limit: int = 10) -> List[List[str]]:
-        s_node = Node(source)
-        t_node = Node(target)
+        stats['pairs'] = len(results)
+        stats['unknown'] = len(results) - len(known)
+        stats['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        return {'results': results, 'stats': stats}
 
-        if s_node not in self.graph or t_node not in self.graph:
-            return []
+    def all_paths(self, source: str, target: str, limit: int = 10, order: str = "dfs",
+                  max_length: Optional[int] = None, time_budget: Optional[float] = None,
+                  budget: Optional[SearchBudget] = None) -> List[List[str]]:
+        budget = budget or SearchBudget(time_limit=time_budget)
+        return list(self.iter_all_paths(source, target, limit, order, max_length, budget))
 
-        paths_generator = nx.all_simple_paths(self.graph, s_node, t_node)
-        paths_list = []
-        for i, p in enumerate(paths_generator):
-            if i >= limit:
-                break
-            path_str = [node.word for node in p]
-            paths_list.append(path_str)
-        return paths_list
+    def iter_all_paths(self, source: str, target: str, limit: int = 10, order: str = "dfs",
+                       max_length: Optional[int] = None,
+                       budget: Optional[SearchBudget] = None) -> Iterator[List[str]]:
+        """Up to `limit` simple paths with at most `max_length` edges.
+
+        order="dfs" enumerates them depth-first, in no particular length
+        order; order="shortest" yields the shortest ones first. Either
+        stops early when `budget` runs out.
+        """
+        if order not in ("dfs", "shortest"):
+            raise ValueError(f"Unknown order '{order}', expected 'dfs' or 'shortest'.")
+        s = self.graph.index(source)
+        t = self.graph.index(target)
+
+        if s is None or t is None:
+            return
+
+        if order == "shortest":
+            if not self.components.connected(s, t):
+                return
+            paths = k_shortest_paths(self.graph, s, t, max_length, budget)
+        else:
+            paths = self._simple_paths(s, t, cutoff=max_length, budget=budget)
+        for p in islice(paths, max(limit, 0)):
+            yield self._words(p)
+
+    def diameter(self) -> dict:
+        """Exact diameter, its endpoint words and one realising path.
+
+        Read from the graph metadata when initialize_graph stored it, otherwise
+        computed once for this graph.
+        """
+        if self._diameter is None:
+            cached = self.graph.metadata.get("diameter")
+            if cached is None:
+                cached = graph_diameter(self.graph, self.components, self.path_engine)
+            self._diameter = cached
+        return self._diameter
 
     def maximum_distance(self) -> int:
-        max_dist = 0
-        for node in self.graph.nodes:
-            lengths = nx.single_source_shortest_path_length(self.graph, node)
-            max_node_dist = max(lengths.values(), default=0)
-            max_dist = max(max_dist, max_node_dist)
-        return max_dist
-
-    def clusters(self):
-        return list(nx.connected_components(self.graph))
-
-    def high_connectivity_nodes(self, threshold: int = 1) -> List[str]:
-        result = []
-        for n, d in self.graph.degree():
-            if d >= threshold:
-                result.append(n.word)
-        return result
-
-    def nodes_by_degree(self, degree: int) -> List[str]:
-        result = []
-        for n, d in self.graph.degree():
-            if d == degree:
-                result.append(n.word)
-        return result
-
-    def isolated_nodes(self) -> List[str]:
-        return [n.word for n in nx.isolates(self.graph)]
+        return self.diameter()["diameter"]
+
+    def clusters(self, offset: int = 0, limit: Optional[int] = None, min_size: Optional[int] = None,
+                 max_size: Optional[int] = None, order: str = "desc") -> dict:
+        """One page of connected components, filtered by size and sorted by size."""
+        total, clusters = self.iter_clusters(offset, limit, min_size, max_size, order)
+        return {
+            'total': total,
+            'clusters': list(clusters)
+        }
+
+    def iter_clusters(self, offset: int = 0, limit: Optional[int] = None, min_size: Optional[int] = None,
+                      max_size: Optional[int] = None, order: str = "desc") -> Tuple[int, Iterator[dict]]:
+        """Like `clusters`, but returns (total, lazy iterator over the page)."""
+        total, ids = self.components.query(offset, limit, min_size, max_size, order)
+        return total, (self._cluster(c) for c in ids)
+
+    def cluster_of(self, word: str, limit: Optional[int] = None) -> Optional[dict]:
+        """The component containing `word`, with at most `limit` of its words."""
+        u = self.graph.index(word)
+        if u is None:
+            return None
+        return self._cluster(self.components.component_of(u), limit)
+
+    def high_connectivity_nodes(self, threshold: int = 1, offset: int = 0,
+                                limit: Optional[int] = None) -> List[str]:
+        """Words with degree >= `threshold`, highest degree first."""
+        return list(self.iter_high_connectivity_nodes(threshold, offset, limit))
+
+    def iter_high_connectivity_nodes(self, threshold: int = 1, offset: int = 0,
+                                     limit: Optional[int] = None) -> Iterator[str]:
+        return self._iter_words(self.degrees.at_least_slice(threshold, offset, limit))
+
+    def nodes_by_degree(self, degree: int, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        return list(self.iter_nodes_by_degree(degree, offset, limit))
+
+    def iter_nodes_by_degree(self, degree: int, offset: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+        return self._iter_words(self.degrees.exactly(degree, offset, limit))
+
+    def isolated_nodes(self, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        return self.nodes_by_degree(0, offset, limit)
+
+    def hubs(self, top: int = 20, by: str = BETWEENNESS) -> Optional[List[dict]]:
+        """The `top` words by approximate betweenness or closeness; None if the
+        graph was built without centrality."""
+        if self.centrality is None:
+            return None
+        return [{'word': self.graph.word(u),
+                 'betweenness': self.centrality.betweenness[u],
+                 'closeness': self.centrality.closeness[u],
+                 'degree': self.graph.degree(u)} for u in self.centrality.top(top, by)]
+
+    def ego_layout(self, word: str, radius: int = 1, target: Optional[str] = None,
+                   max_nodes: int = 300) -> Optional[dict]:
+        """Layout of the words within `radius` hops of `word`, or of the shortest
+        path to `target` when given; None if a word is unknown or unreachable."""
+        s = self.graph.index(word)
+        if s is None:
+            return None
+        path = []
+        if target is not None:
+            t = self.graph.index(target)
+            path = self.path_engine.shortest_path_ids(s, t) if t is not None else None
+            if path is None:
+                return None
+        nodes, truncated = neighborhood(self.graph, path or [s], radius, max_nodes)
+        return {"positions": layout(self.graph, nodes), "path": path, "truncated": truncated}
+
+    def render(self, ego: dict, fmt: str = "svg") -> bytes:
+        """SVG or PNG image of an `ego_layout`."""
+        return draw(self.graph, ego["positions"], fmt, ego["path"])
 
     def visualize_graph(self, show_labels: bool = True):
+        # Imported here: pyplot is slow to import and only needed for plots.
+        import matplotlib.pyplot as plt
+
+        g = self.graph.to_networkx()
         plt.figure(figsize=(12, 8))
-        pos = nx.spring_layout(self.graph)
+        pos = nx.spring_layout(g)
 
-        nx.draw_networkx_nodes(self.graph, pos,
+        nx.draw_networkx_nodes(g, pos,
                                node_color='lightblue',
                                node_size=500,
                                alpha=0.8)
-        nx.draw_networkx_edges(self.graph, pos, edge_color='gray')
+        nx.draw_networkx_edges(g, pos, edge_color='gray')
 
         if show_labels:
-            labels = {n: n.word for n in self.graph.nodes}
-            nx.draw_networkx_labels(self.graph, pos, labels=labels,
-                                    font_size=10, font_color='black')
+            nx.draw_networkx_labels(g, pos, font_size=10, font_color='black')
 
         plt.axis('off')
         plt.title("Graph Visualization")
         plt.show()
+
+    def _words(self, nodes) -> List[str]:
+        return [self.graph.word(u) for u in nodes]
+
+    def _iter_words(self, nodes) -> Iterator[str]:
+        word = self.graph.word
+        return (word(u) for u in nodes)
+
+    def _cluster(self, component: int, limit: Optional[int] = None) -> dict:
+        members = self.components.members(component)
+        return {
+            'id': component,
+            'size': len(members),
+            'words': self._words(members[:limit] if limit is not None else members)
+        }
+
+    def _simple_paths(self, source: int, target: int, cutoff: Optional[int] = None,
+                      budget: Optional[SearchBudget] = None) -> Iterator[List[int]]:
+        """Depth-first enumeration of simple paths with at most `cutoff` edges.
+
+        Stops early, without error, once `budget` is exhausted.
+        """
+        if cutoff is None:
+            cutoff = self.graph.node_count - 1
+        if cutoff < 1 or source == target:
+            return
+
+        path = [source]
+        on_path = {source}
+        stack = [iter(self.graph.neighbors(source))]
+        while stack:
+            if budget is not None and not budget.spend():
+                return
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                on_path.discard(path.pop())
+            elif child == target:
+                yield path + [target]
+            elif child not in on_path and len(path) < cutoff:
+                path.append(child)
+                on_path.add(child)
+                stack.append(iter(self.graph.neighbors(child)))
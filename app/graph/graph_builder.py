@@ -0,0 +1,114 @@
+import time
+import logging
+from typing import Iterable, Optional, Tuple
+
+from .centrality import DEFAULT_DELTA, DEFAULT_EPSILON, DEFAULT_MAX_SAMPLES, CentralityIndex, \
+    achieved_epsilon, sample_size
+from .compact_graph import CompactGraph
+from .components import ComponentIndex
+from .degrees import DegreeIndex
+from .diameter import graph_diameter
+from .edge_models import SUBSTITUTION
+from .fuzzy_index import FuzzyIndex
+from .incremental import insert_words_with_ids
+
+logger = logging.getLogger(__name__)
+
+
+def annotate_graph(graph: CompactGraph, centrality_epsilon: float = DEFAULT_EPSILON,
+                   centrality_samples: Optional[int] = DEFAULT_MAX_SAMPLES,
+                   fuzzy: Optional[FuzzyIndex] = None, centrality: bool = True) -> CompactGraph:
+    """Compute the derived results stored alongside the graph at build time.
+
+    Centrality is estimated from enough BFS sources for `centrality_epsilon`
+    error, but at most `centrality_samples` of them; it costs BFS runs over
+    the whole graph, so incremental updates pass centrality=False and carry
+    the old scores over instead. A `fuzzy` index already brought up to date
+    (see update_graph) is stored instead of a new one.
+    """
+    start = time.perf_counter()
+    components = ComponentIndex.build(graph)
+    graph.sections.update(components.sections())
+    graph.sections.update(DegreeIndex.build(graph).sections())
+    logger.info(f"Degrees and {components.count} components indexed in {time.perf_counter() - start:.2f}s, "
+                f"largest has {components.largest_size()} nodes.")
+
+    if fuzzy is None:
+        start = time.perf_counter()
+        fuzzy = FuzzyIndex.build(graph)
+        logger.info(f"Fuzzy lookup index with {len(fuzzy.keys)} keys built in {time.perf_counter() - start:.2f}s.")
+    graph.sections.update(fuzzy.sections())
+
+    start = time.perf_counter()
+    graph.metadata["diameter"] = graph_diameter(graph, components)
+    logger.info(f"Diameter {graph.metadata['diameter']['diameter']} computed in "
+                f"{time.perf_counter() - start:.2f}s with {graph.metadata['diameter']['bfs_runs']} BFS runs.")
+
+    if not centrality:
+        return graph
+    start = time.perf_counter()
+    samples = sample_size(graph.node_count, centrality_epsilon, DEFAULT_DELTA, centrality_samples)
+    graph.sections.update(CentralityIndex.build(graph, samples, components=components).sections())
+    graph.metadata["centrality"] = {
+        "samples": samples,
+        "epsilon": achieved_epsilon(graph.node_count, samples, DEFAULT_DELTA),
+        "delta": DEFAULT_DELTA,
+        "requested_epsilon": centrality_epsilon,
+        "max_samples": centrality_samples,
+    }
+    logger.info(f"Centrality estimated from {samples} sources in {time.perf_counter() - start:.2f}s, "
+                f"error <= {graph.metadata['centrality']['epsilon']:.4f}.")
+    return graph
+
+
+def build_graph(words: Iterable[str], edge_model: str = SUBSTITUTION, centrality_epsilon: float = DEFAULT_EPSILON,
+                centrality_samples: Optional[int] = DEFAULT_MAX_SAMPLES) -> CompactGraph:
+    start = time.perf_counter()
+    graph = CompactGraph.from_words(words, edge_model=edge_model)
+    logger.info(f"Graph was built successfully in {time.perf_counter() - start:.2f}s: "
+                f"{graph.node_count} nodes, {graph.edge_count} {edge_model} edges.")
+    return annotate_graph(graph, centrality_epsilon, centrality_samples)
+
+
+def carry_centrality(graph: CompactGraph, updated: CompactGraph, remap, new_nodes):
+    """Store `graph`'s centrality in `updated`, marked stale with the version it was computed on."""
+    previous = CentralityIndex.for_graph(graph)
+    if previous is None:
+        updated.metadata.pop("centrality", None)
+        return
+    updated.sections.update(previous.remapped(updated.node_count, remap, new_nodes).sections())
+    settings = graph.metadata["centrality"]
+    updated.metadata["centrality"] = dict(settings, stale=True,
+                                          computed_on=settings.get("computed_on", graph.version))
+
+
+def update_graph(path: str, words: Iterable[str], refresh_centrality: bool = False) -> Tuple[CompactGraph, int]:
+    """Insert `words` into the graph stored at `path` and save it in place.
+
+    Centrality is carried over from the previous version, new words scoring
+    0, unless `refresh_centrality` asks for it to be estimated again.
+    Returns the updated graph and the number of nodes added.
+    """
+    graph = CompactGraph.load(path)
+    start = time.perf_counter()
+    updated, remap, new_nodes = insert_words_with_ids(graph, words)
+    added = len(new_nodes)
+    if not added:
+        logger.info(f"No new words for graph {graph.version}.")
+        return graph, 0
+
+    logger.info(f"Inserted {added} words in {time.perf_counter() - start:.2f}s: "
+                f"{updated.node_count} nodes, {updated.edge_count} edges "
+                f"({updated.edge_count - graph.edge_count} new).")
+    start = time.perf_counter()
+    fuzzy = FuzzyIndex.for_graph(graph).merge(updated, remap, new_nodes)
+    logger.info(f"Fuzzy lookup index merged in {time.perf_counter() - start:.2f}s.")
+    # Keep the centrality settings the graph was built with.
+    settings = graph.metadata.get("centrality", {})
+    annotate_graph(updated, settings.get("requested_epsilon", DEFAULT_EPSILON),
+                   settings.get("max_samples", DEFAULT_MAX_SAMPLES), fuzzy, centrality=refresh_centrality)
+    if not refresh_centrality:
+        carry_centrality(graph, updated, remap, new_nodes)
+    updated.save(path)
+    logger.info(f"Serialized graph {updated.version} in {path}")
+    return updated, added
@@ -5,11 +5,8 @@ class GraphManager:
     def __init__(self):
         self.graph_obj = Graph()
 
-    def build_graph(self, words: List[str]):
-        for i, w1 in enumerate(words):
-            self.graph_obj.add_node(w1)
-            for w2 in words[i+1:]:
-                self.graph_obj.add_edge(w1, w2)
+    def build_graph(self, words: List[str]) -> int:
+        return self.graph_obj.add_words(set(words))
 
     def get_graph(self) -> Graph:
         return self.graph_obj
@@ -0,0 +1,129 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .compact_graph import CompactGraph, WordTable
+from .edge_models import LEVENSHTEIN, edge_index, edge_model
+
+
+def _alphabet(graph: CompactGraph, words: Iterable[str]) -> Set[str]:
+    letters = set(str(graph.words.data, "utf-8"))
+    for w in words:
+        letters.update(w)
+    return letters
+
+
+def _new_edges(graph: CompactGraph, new_words: List[str]) -> List[Tuple[str, str]]:
+    """Edges touching at least one new word, found without scanning the graph.
+
+    New/new pairs come from an index over the new words built for the
+    graph's edge model; new/old pairs from looking up every one-letter
+    substitution (and, for Levenshtein graphs, insertion and deletion) of
+    a new word in the word table.
+    """
+    model = edge_model(graph)
+    index = edge_index(model)
+    index.add_words(new_words)
+    edges = list(index.edges())
+    edits = model == LEVENSHTEIN
+
+    table = graph.words
+    alphabet = sorted(_alphabet(graph, new_words))
+    for w in new_words:
+        # Candidates for position i share the prefix w[:i], so each search is
+        # confined to that prefix's range, which narrows as i grows.
+        lo, hi = 0, len(table)
+        for i, original in enumerate(w):
+            prefix, suffix = w[:i], w[i + 1:]
+            for c in alphabet:
+                if c != original:
+                    candidate = prefix + c + suffix
+                    if table.index(candidate, lo, hi) is not None:
+                        edges.append((w, candidate))
+                if edits and table.index(prefix + c + w[i:], lo, hi) is not None:
+                    edges.append((w, prefix + c + w[i:]))
+            if edits and table.index(prefix + suffix, lo, hi) is not None:
+                edges.append((w, prefix + suffix))
+            lo, hi = table.prefix_range(w[:i + 1], lo, hi)
+            if lo == hi:
+                break
+        else:
+            if edits:
+                for c in alphabet:
+                    if table.index(w + c, lo, hi) is not None:
+                        edges.append((w, w + c))
+    return edges
+
+
+def insert_words(graph: CompactGraph, words: Iterable[str]) -> Tuple[CompactGraph, int]:
+    """Return (graph with `words` added, number of new nodes).
+
+    Only the new words and their one-letter neighbours are examined; the
+    rest of the graph is carried over by renumbering node ids, so the result
+    is identical to rebuilding from the full word set.
+    """
+    updated, _, new_nodes = insert_words_with_ids(graph, words)
+    return updated, len(new_nodes)
+
+
+def insert_words_with_ids(graph: CompactGraph, words: Iterable[str]) -> Tuple[CompactGraph, array, List[int]]:
+    """Like insert_words, but return (graph, remap, new node ids), where
+    remap[i] is the new id of old node i, for carrying indexes over."""
+    new_words = sorted({w for w in words if graph.index(w) is None})
+    if not new_words:
+        return graph, array("I", range(graph.node_count)), []
+
+    n = graph.node_count
+    k = len(new_words)
+    positions = [bisect_left(graph.words, w) for w in new_words]
+    new_ids = {w: p + j for j, (w, p) in enumerate(zip(new_words, positions))}
+    is_new = bytearray(n + k)
+    for i in new_ids.values():
+        is_new[i] = 1
+
+    # Old id i moves up by the number of new words sorted before it.
+    remap = array("I")
+    prev = 0
+    for j, p in enumerate(positions + [n]):
+        remap.extend(range(prev + j, p + j))
+        prev = p
+
+    added: Dict[int, List[int]] = {}
+    for w1, w2 in _new_edges(graph, new_words):
+        u = new_ids.get(w1)
+        if u is None:
+            u = remap[graph.index(w1)]
+        v = new_ids.get(w2)
+        if v is None:
+            v = remap[graph.index(w2)]
+        added.setdefault(u, []).append(v)
+        added.setdefault(v, []).append(u)
+
+    old_offsets = graph.words.offsets
+    old_data = graph.words.data
+    word_offsets = array("Q", [0])
+    word_data = bytearray()
+    adj_offsets = array("Q", [0])
+    neighbors = array("I")
+    old = 0
+    new = 0
+    for node in range(n + k):
+        if is_new[node]:
+            word_data += new_words[new].encode("utf-8")
+            nbrs = sorted(set(added.get(node, ())))
+            new += 1
+        else:
+            word_data += old_data[old_offsets[old]:old_offsets[old + 1]]
+            nbrs = [remap[v] for v in graph.neighbors(old)]
+            extra = added.get(node)
+            if extra:
+                nbrs = sorted(set(nbrs).union(extra))
+            old += 1
+        word_offsets.append(len(word_data))
+        neighbors.extend(nbrs)
+        adj_offsets.append(len(neighbors))
+
+    metadata = {key: value for key, value in graph.metadata.items()
+                if key not in ("sections", "graph_version", "created_at")}
+    updated = CompactGraph(WordTable(word_offsets, bytes(word_data)), adj_offsets, neighbors, metadata)
+    return updated, remap, sorted(new_ids.values())
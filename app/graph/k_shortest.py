@@ -0,0 +1,87 @@
+import heapq
+from typing import Dict, Iterator, List, Optional, Set
+
+from .compact_graph import CompactGraph
+from .longest_path import SearchBudget
+
+
+def _bfs_path(graph: CompactGraph, s: int, t: int, blocked_nodes: Set[int], blocked_first: Set[int],
+              max_edges: Optional[int], budget: SearchBudget) -> Optional[List[int]]:
+    """Shortest s -> t path avoiding `blocked_nodes`, whose first hop is not in `blocked_first`."""
+    if max_edges is not None and max_edges < 1:
+        return None
+    adj = graph.adj
+    offsets = graph.adj_offsets
+    parent: Dict[int, int] = {s: -1}
+    frontier = [s]
+    depth = 0
+    while frontier and (max_edges is None or depth < max_edges):
+        if not budget.spend(len(frontier)):
+            return None
+        depth += 1
+        next_frontier = []
+        for u in frontier:
+            for v in adj[offsets[u]:offsets[u + 1]]:
+                if v in parent or v in blocked_nodes or (u == s and v in blocked_first):
+                    continue
+                parent[v] = u
+                if v == t:
+                    path = [t]
+                    while parent[path[-1]] >= 0:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    return path
+                next_frontier.append(v)
+        frontier = next_frontier
+    return None
+
+
+def k_shortest_paths(graph: CompactGraph, s: int, t: int, max_length: Optional[int] = None,
+                     budget: Optional[SearchBudget] = None) -> Iterator[List[int]]:
+    """Simple s -> t paths in order of increasing length (Yen's algorithm).
+
+    A generator: each path is yielded as soon as it is known to be the next
+    shortest, so callers take as many as they need. Paths longer than
+    `max_length` edges are never produced. When the budget runs out the
+    generator stops early and `budget.exhausted` is set.
+    """
+    budget = budget or SearchBudget()
+    if s == t:
+        return
+    first = _bfs_path(graph, s, t, set(), set(), max_length, budget)
+    if first is None:
+        return
+
+    accepted = [first]
+    seen = {tuple(first)}
+    # (length, tie-breaker, path, index of the node where it left its parent)
+    candidates: list = []
+    counter = 0
+    deviation = 0
+    yield first
+
+    while True:
+        previous = accepted[-1]
+        # Spur nodes before the deviation point were already tried when the
+        # path this one branched from was accepted (Lawler's refinement).
+        for i in range(deviation, len(previous) - 1):
+            root = previous[:i + 1]
+            blocked_first = {p[i + 1] for p in accepted if len(p) > i + 1 and p[:i + 1] == root}
+            remaining = max_length - i if max_length is not None else None
+            spur = _bfs_path(graph, previous[i], t, set(root[:-1]), blocked_first, remaining, budget)
+            if budget.exhausted:
+                return
+            if spur is None:
+                continue
+            path = root[:-1] + spur
+            key = tuple(path)
+            if key not in seen:
+                seen.add(key)
+                counter += 1
+                heapq.heappush(candidates, (len(path), counter, path, i))
+
+        if not candidates:
+            return
+        _, _, path, deviation = heapq.heappop(candidates)
+        accepted.append(path)
+        yield path
@@ -0,0 +1,201 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .compact_graph import CompactGraph
+from .components import ComponentIndex
+
+
+class SearchBudget:
+    """Wall-clock deadline and expansion cap for long-running searches.
+
+    `deadline` is an absolute time.time() value so it can be handed to
+    worker processes unchanged. A budget with a `parent` also spends from
+    it, so one budget can bound and cancel several searches; `cancel` may
+    be called from another thread and takes effect at the next expansion.
+    """
+
+    CHECK_EVERY = 256
+
+    def __init__(self, time_limit: Optional[float] = None, max_expansions: Optional[int] = None,
+                 deadline: Optional[float] = None, parent: Optional["SearchBudget"] = None):
+        if deadline is None and time_limit is not None:
+            deadline = time.time() + time_limit
+        self.deadline = deadline
+        self.max_expansions = max_expansions
+        self.parent = parent
+        self.expansions = 0
+        self.exhausted = False
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        self.exhausted = True
+
+    def spend(self, n: int = 1) -> bool:
+        """Account for `n` expansions; False once the budget is used up."""
+        if self.exhausted:
+            return False
+        if self.parent is not None and not self.parent.spend(n):
+            self.exhausted = True
+            return False
+        self.expansions += n
+        if self.max_expansions is not None and self.expansions > self.max_expansions:
+            self.exhausted = True
+        elif self.deadline is not None and self.expansions % self.CHECK_EVERY < n \
+                and time.time() >= self.deadline:
+            self.exhausted = True
+        return not self.exhausted
+
+
+def _reachable_count(graph: CompactGraph, source: int, on_path: bytearray, seen: dict) -> int:
+    """Nodes reachable from `source` without touching the current path."""
+    seen.clear()
+    seen[source] = True
+    stack = [source]
+    while stack:
+        u = stack.pop()
+        for v in graph.neighbors(u):
+            if not on_path[v] and v not in seen:
+                seen[v] = True
+                stack.append(v)
+    return len(seen) - 1
+
+
+def search_component(graph: CompactGraph, nodes: List[int], lower_bound: int = 0,
+                     max_length: Optional[int] = None,
+                     budget: Optional[SearchBudget] = None) -> Tuple[int, List[int], bool]:
+    """Longest simple path inside one component by branch and bound.
+
+    Depth-first search from every node of the component; a branch is cut
+    when its length plus the number of nodes still reachable from its tip
+    cannot beat the best path so far. Returns (length, node ids, proven),
+    where `proven` is False if the budget ran out before the search space
+    was exhausted. Only paths longer than `lower_bound` are reported.
+    """
+    budget = budget or SearchBudget()
+    cap = len(nodes) - 1 if max_length is None else min(max_length, len(nodes) - 1)
+    best_len = lower_bound
+    best_path: List[int] = []
+    if best_len >= cap:
+        return best_len, best_path, True
+
+    on_path = bytearray(graph.node_count)
+    seen: dict = {}
+    # Endpoints of long paths tend to be low-degree nodes, so try them first
+    # to raise the bound early.
+    for start in sorted(nodes, key=graph.degree):
+        path = [start]
+        on_path[start] = 1
+        stack = [iter(graph.neighbors(start))]
+        while stack:
+            if not budget.spend():
+                for u in path:
+                    on_path[u] = 0
+                return best_len, best_path, False
+            v = next(stack[-1], None)
+            if v is None:
+                stack.pop()
+                on_path[path.pop()] = 0
+                continue
+            if on_path[v]:
+                continue
+
+            length = len(path)
+            if length > best_len:
+                best_len = length
+                best_path = path + [v]
+                if best_len >= cap:
+                    for u in path:
+                        on_path[u] = 0
+                    return best_len, best_path, True
+            if length >= cap:
+                continue
+            on_path[v] = 1
+            if length + _reachable_count(graph, v, on_path, seen) <= best_len:
+                on_path[v] = 0
+                continue
+            path.append(v)
+            stack.append(iter(graph.neighbors(v)))
+    return best_len, best_path, True
+
+
+_worker_graphs: Dict[str, CompactGraph] = {}
+
+
+def _search_worker(graph_path: str, nodes: List[int], lower_bound: int, max_length: Optional[int],
+                   deadline: Optional[float], max_expansions: Optional[int]):
+    graph = _worker_graphs.get(graph_path)
+    if graph is None:
+        graph = _worker_graphs[graph_path] = CompactGraph.load(graph_path)
+    budget = SearchBudget(max_expansions=max_expansions, deadline=deadline)
+    length, path, proven = search_component(graph, nodes, lower_bound, max_length, budget)
+    return length, path, proven, budget.expansions
+
+
+def longest_path(graph: CompactGraph, max_length: Optional[int] = None,
+                 time_limit: Optional[float] = None, max_expansions: Optional[int] = None,
+                 components: Optional[ComponentIndex] = None, lower_bound: Optional[Tuple[int, List[str]]] = None,
+                 processes: Optional[int] = None, budget: Optional[SearchBudget] = None) -> dict:
+    """Longest simple path over the whole graph, one component at a time.
+
+    `lower_bound` is a known (length, words) pair, typically the diameter,
+    used to skip every component too small to beat it. Components are
+    searched in a process pool when the graph is backed by a file (each
+    worker memory-maps it); `max_expansions` applies per component and
+    `time_limit` to the whole call. A `budget` bounds the whole call as
+    well and can cancel it; the search then runs in this process. The
+    result reports the best path found and whether it is proven optimal.
+    """
+    start = time.perf_counter()
+    deadline = time.time() + time_limit if time_limit is not None else None
+    if budget is not None:
+        processes = 1
+    if components is None:
+        components = ComponentIndex.for_graph(graph)
+
+    best_len, best_path = lower_bound if lower_bound is not None else (0, [])
+    if max_length is not None and best_len > max_length:
+        best_len, best_path = max_length, best_path[:max_length + 1]
+
+    cap = max_length if max_length is not None else graph.node_count
+    candidates = [list(nodes) for nodes in components.groups() if min(len(nodes) - 1, cap) > best_len]
+
+    proven = True
+    expansions = 0
+    processes = processes if processes is not None else os.cpu_count() or 1
+    graph_path = getattr(graph, "path", None)
+    if processes > 1 and len(candidates) > 1 and graph_path:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(processes, len(candidates)), mp_context=context) as pool:
+            futures = [pool.submit(_search_worker, graph_path, nodes, best_len, max_length,
+                                   deadline, max_expansions) for nodes in candidates]
+            results = [f.result() for f in futures]
+    else:
+        results = []
+        bound = best_len
+        for nodes in candidates:
+            component_budget = SearchBudget(max_expansions=max_expansions, deadline=deadline, parent=budget)
+            length, path, ok = search_component(graph, nodes, bound, max_length, component_budget)
+            results.append((length, path, ok, component_budget.expansions))
+            bound = max(bound, length)
+            if budget is not None and budget.exhausted:
+                proven = False
+                break
+
+    for length, path, ok, spent in results:
+        proven = proven and ok
+        expansions += spent
+        if path and length > best_len:
+            best_len, best_path = length, [graph.word(u) for u in path]
+
+    return {
+        "distance": best_len,
+        "path": best_path,
+        "proven_optimal": proven,
+        "components_searched": len(candidates),
+        "expansions": expansions,
+        "elapsed": time.perf_counter() - start,
+    }
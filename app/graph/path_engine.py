@@ -0,0 +1,215 @@
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .compact_graph import CompactGraph
+from .components import ComponentIndex
+
+_GENERATION_LIMIT = 0xFFFFFFFF
+
+
+class _SearchBuffers:
+    """Per-thread visited/parent arrays reused across queries.
+
+    A node counts as visited in the current query only if its stamp equals the
+    current generation, so buffers never need clearing between queries.
+    """
+
+    def __init__(self, n: int):
+        self.generation = 0
+        self.fwd_stamp = array("I", [0]) * n
+        self.bwd_stamp = array("I", [0]) * n
+        self.fwd_parent = array("i", [-1]) * n
+        self.bwd_parent = array("i", [-1]) * n
+        self.fwd_dist = array("I", [0]) * n
+        self.bwd_dist = array("I", [0]) * n
+
+    def next_generation(self) -> int:
+        self.generation += 1
+        if self.generation == _GENERATION_LIMIT:
+            n = len(self.fwd_stamp)
+            self.fwd_stamp = array("I", [0]) * n
+            self.bwd_stamp = array("I", [0]) * n
+            self.generation = 1
+        return self.generation
+
+
+class PathEngine:
+    """Shortest paths on integer node ids with bidirectional BFS."""
+
+    def __init__(self, graph: CompactGraph, components: Optional[ComponentIndex] = None):
+        self.graph = graph
+        self.components = components if components is not None else ComponentIndex.for_graph(graph)
+        self._local = threading.local()
+
+    def _buffers(self) -> _SearchBuffers:
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = _SearchBuffers(self.graph.node_count)
+        return buffers
+
+    def connected(self, s: int, t: int) -> bool:
+        return self.components.connected(s, t)
+
+    def shortest_path_ids(self, s: int, t: int) -> Optional[List[int]]:
+        if s == t:
+            return [s]
+        if not self.connected(s, t):
+            return None
+
+        adj = self.graph.adj
+        offsets = self.graph.adj_offsets
+        buf = self._buffers()
+        gen = buf.next_generation()
+        fwd_stamp, bwd_stamp = buf.fwd_stamp, buf.bwd_stamp
+        fwd_parent, bwd_parent = buf.fwd_parent, buf.bwd_parent
+        fwd_dist, bwd_dist = buf.fwd_dist, buf.bwd_dist
+
+        fwd_stamp[s] = gen
+        fwd_parent[s] = -1
+        fwd_dist[s] = 0
+        bwd_stamp[t] = gen
+        bwd_parent[t] = -1
+        bwd_dist[t] = 0
+        fwd_frontier = [s]
+        bwd_frontier = [t]
+
+        while fwd_frontier and bwd_frontier:
+            # Grow the cheaper side by one full level; after a level that
+            # touches the other side, the best meeting node of that level
+            # lies on a shortest path.
+            forward = len(fwd_frontier) <= len(bwd_frontier)
+            if forward:
+                frontier, stamp, parent, dist = fwd_frontier, fwd_stamp, fwd_parent, fwd_dist
+                other_stamp, other_dist = bwd_stamp, bwd_dist
+            else:
+                frontier, stamp, parent, dist = bwd_frontier, bwd_stamp, bwd_parent, bwd_dist
+                other_stamp, other_dist = fwd_stamp, fwd_dist
+
+            next_frontier = []
+            meet = -1
+            meet_dist = 0
+            level = dist[frontier[0]] + 1
+            for u in frontier:
+                for v in adj[offsets[u]:offsets[u + 1]]:
+                    if stamp[v] == gen:
+                        continue
+                    stamp[v] = gen
+                    parent[v] = u
+                    dist[v] = level
+                    next_frontier.append(v)
+                    if other_stamp[v] == gen and (meet < 0 or other_dist[v] < meet_dist):
+                        meet = v
+                        meet_dist = other_dist[v]
+
+            if meet >= 0:
+                return self._join(meet, fwd_parent, bwd_parent)
+            if forward:
+                fwd_frontier = next_frontier
+            else:
+                bwd_frontier = next_frontier
+        return None
+
+    def tree_paths(self, s: int, targets: Iterable[int]) -> Dict[int, Optional[List[int]]]:
+        """Shortest paths from `s` to every target out of a single BFS tree.
+
+        The search stops as soon as every reachable target has been found;
+        targets in other components are answered without searching.
+        """
+        paths: Dict[int, Optional[List[int]]] = {}
+        remaining = set()
+        for t in targets:
+            if t == s:
+                paths[t] = [s]
+            elif self.connected(s, t):
+                remaining.add(t)
+            else:
+                paths[t] = None
+        if not remaining:
+            return paths
+        found = list(remaining)
+
+        adj = self.graph.adj
+        offsets = self.graph.adj_offsets
+        buf = self._buffers()
+        gen = buf.next_generation()
+        stamp, parent = buf.fwd_stamp, buf.fwd_parent
+        stamp[s] = gen
+        parent[s] = -1
+        frontier = [s]
+        while frontier and remaining:
+            next_frontier = []
+            for u in frontier:
+                for v in adj[offsets[u]:offsets[u + 1]]:
+                    if stamp[v] != gen:
+                        stamp[v] = gen
+                        parent[v] = u
+                        next_frontier.append(v)
+                        remaining.discard(v)
+            frontier = next_frontier
+
+        for t in found:
+            path = []
+            u = t
+            while u >= 0:
+                path.append(u)
+                u = parent[u]
+            path.reverse()
+            paths[t] = path
+        return paths
+
+    def shortest_paths(self, pairs: List[Tuple[int, int]]) -> Tuple[List[Optional[List[int]]], Dict[str, int]]:
+        """Shortest paths for many (source, target) pairs.
+
+        Pairs are grouped by source so each source with several reachable
+        targets costs one BFS tree; a source with a single target uses the
+        bidirectional search instead. Returns the paths in input order and
+        counters of how each pair was answered.
+        """
+        by_source: Dict[int, List[int]] = {}
+        for s, t in pairs:
+            by_source.setdefault(s, []).append(t)
+
+        stats = {"bfs_trees": 0, "bidirectional": 0, "disconnected": 0}
+        answers: Dict[Tuple[int, int], Optional[List[int]]] = {}
+        for s, targets in by_source.items():
+            reachable = {t for t in targets if self.connected(s, t) and t != s}
+            for t in targets:
+                if t == s:
+                    answers[s, t] = [s]
+                elif t not in reachable:
+                    answers[s, t] = None
+                    stats["disconnected"] += 1
+            if len(reachable) == 1:
+                t = reachable.pop()
+                answers[s, t] = self.shortest_path_ids(s, t)
+                stats["bidirectional"] += 1
+            elif reachable:
+                for t, path in self.tree_paths(s, reachable).items():
+                    answers[s, t] = path
+                stats["bfs_trees"] += 1
+        return [answers[s, t] for s, t in pairs], stats
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        s = self.graph.index(source)
+        t = self.graph.index(target)
+        if s is None or t is None:
+            return None
+        path = self.shortest_path_ids(s, t)
+        if path is None:
+            return None
+        return [self.graph.word(u) for u in path]
+
+    @staticmethod
+    def _join(meet: int, fwd_parent, bwd_parent) -> List[int]:
+        path = []
+        u = meet
+        while u >= 0:
+            path.append(u)
+            u = fwd_parent[u]
+        path.reverse()
+        u = bwd_parent[meet]
+        while u >= 0:
+            path.append(u)
+            u = bwd_parent[u]
+        return path
@@ -0,0 +1,43 @@
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+WILDCARD = "*"
+
+
+class PatternIndex:
+    """Buckets words by wildcard pattern, e.g. 'c*t' -> {'cat', 'cot', 'cut'}.
+
+    Two words are one letter apart exactly when they share a pattern, and a
+    pair shares at most one, so edges can be read off bucket by bucket
+    instead of comparing every pair of words.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def patterns(word: str) -> List[str]:
+        return [word[:i] + WILDCARD + word[i + 1:] for i in range(len(word))]
+
+    def add(self, word: str):
+        for p in self.patterns(word):
+            self.buckets.setdefault(p, set()).add(word)
+
+    def add_words(self, words: Iterable[str]):
+        for w in words:
+            self.add(w)
+
+    def neighbors(self, word: str) -> Set[str]:
+        result = set()
+        for p in self.patterns(word):
+            result.update(self.buckets.get(p, ()))
+        result.discard(word)
+        return result
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        for bucket in self.buckets.values():
+            if len(bucket) > 1:
+                yield from combinations(sorted(bucket), 2)
+
+    def __len__(self):
+        return len(self.buckets)
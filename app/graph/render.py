@@ -0,0 +1,78 @@
+import io
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+
+from .compact_graph import CompactGraph
+
+IMAGE_FORMATS = {"svg": "image/svg+xml", "png": "image/png"}
+# Labels are unreadable beyond this many nodes, so they are left out.
+MAX_LABELLED_NODES = 150
+
+
+def neighborhood(graph: CompactGraph, sources: Iterable[int], radius: int,
+                 max_nodes: int) -> Tuple[List[int], bool]:
+    """Nodes within `radius` hops of any source, nearest first.
+
+    Stops at `max_nodes` nodes; the flag says whether any were left out.
+    """
+    seen = {}
+    frontier = []
+    for s in sources:
+        if s not in seen:
+            seen[s] = 0
+            frontier.append(s)
+    for depth in range(1, radius + 1):
+        next_frontier = []
+        for u in frontier:
+            for v in graph.neighbors(u):
+                if v in seen:
+                    continue
+                if len(seen) >= max_nodes:
+                    return list(seen), True
+                seen[v] = depth
+                next_frontier.append(v)
+        frontier = next_frontier
+    return list(seen), False
+
+
+def layout(graph: CompactGraph, nodes: Sequence[int]) -> Dict[int, Tuple[float, float]]:
+    """Spring layout of the subgraph induced by `nodes`, the same on every call."""
+    g = nx.Graph()
+    g.add_nodes_from(nodes)
+    selected = set(nodes)
+    g.add_edges_from((u, v) for u in nodes for v in graph.neighbors(u) if u < v and v in selected)
+    positions = nx.spring_layout(g, seed=0, iterations=50)
+    return {u: (float(x), float(y)) for u, (x, y) in positions.items()}
+
+
+def draw(graph: CompactGraph, positions: Dict[int, Tuple[float, float]], fmt: str,
+         highlight: Optional[Sequence[int]] = None) -> bytes:
+    """Image of the laid out subgraph, with the `highlight` path in red.
+
+    Drawn on a bare Figure with the Agg canvas rather than through pyplot,
+    which keeps global state and needs a display.
+    """
+    from matplotlib.figure import Figure
+
+    nodes = list(positions)
+    g = nx.Graph()
+    g.add_nodes_from(nodes)
+    g.add_edges_from((u, v) for u in nodes for v in graph.neighbors(u) if u < v and v in positions)
+    highlight = list(highlight or ())
+    path_edges = list(zip(highlight, highlight[1:]))
+
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+    nx.draw_networkx_edges(g, positions, ax=ax, edge_color="lightgray")
+    nx.draw_networkx_nodes(g, positions, ax=ax, node_color="lightblue", node_size=200)
+    if highlight:
+        nx.draw_networkx_edges(g, positions, ax=ax, edgelist=path_edges, edge_color="red", width=2)
+        nx.draw_networkx_nodes(g, positions, ax=ax, nodelist=highlight, node_color="salmon", node_size=300)
+    if len(nodes) <= MAX_LABELLED_NODES:
+        nx.draw_networkx_labels(g, positions, ax=ax, labels={u: graph.word(u) for u in nodes}, font_size=8)
+    ax.axis("off")
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, bbox_inches="tight")
+    return buf.getvalue()
@@ -1,10 +1,11 @@
-import os
-import sys
-import pickle
 import logging
-from graph.graph import Graph
+import argparse
+from graph.centrality import DEFAULT_EPSILON, DEFAULT_MAX_SAMPLES
+from graph.edge_models import EDGE_MODELS, SUBSTITUTION
+from graph.graph_builder import build_graph
+from word_manager import read_datamart_words
 
-from config import DATA_MART_PATH
+from config import DATA_MART_PATH, GRAPH_PATH
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,45 +17,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
-    graph = Graph()
+def main(edge_model: str = SUBSTITUTION, centrality_epsilon: float = DEFAULT_EPSILON,
+         centrality_samples: int = DEFAULT_MAX_SAMPLES):
     try:
         logger.info("Starting graph building...")
-        all_words = set()
-        for file_name in os.listdir(DATA_MART_PATH):
-            if file_name.startswith("words_") and file_name.endswith(".txt"):
-                file_path = os.path.join(DATA_MART_PATH, file_name)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        w = line.strip()
-                        if w:
-                            all_words.add(w)
+        all_words = read_datamart_words(DATA_MART_PATH)
 
         if not all_words:
             logger.warning("No words found in datamart.")
             return
 
-        for w in all_words:
-            graph.add_node(w)
-
-        all_words_list = list(all_words)
-        total_edges = 0
-        for i in range(len(all_words_list)):
-            for j in range(i + 1, len(all_words_list)):
-                w1 = all_words_list[i]
-                w2 = all_words_list[j]
-                if graph.add_edge(w1, w2):
-                    total_edges += 1
-
-        logger.info(f"Graph was built successfully: {len(graph.graph.nodes)} nodes, {len(graph.graph.edges)} edges.")
-
-        serialized_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'graph.pkl')
-        with open(serialized_path, 'wb') as f:
-            pickle.dump(graph.graph, f)
-        logger.info(f"Serialized graph in {serialized_path}")
+        graph = build_graph(all_words, edge_model, centrality_epsilon, centrality_samples)
+        graph.save(GRAPH_PATH)
+        logger.info(f"Serialized graph {graph.version} in {GRAPH_PATH}")
 
     except Exception as e:
         logger.error(f"Error building and serializing graph: {e}", exc_info=True)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Build app/graph.bin from the datamart.")
+    parser.add_argument("--edge-model", choices=list(EDGE_MODELS), default=SUBSTITUTION,
+                        help="substitution links words of equal length differing in one letter; "
+                             "levenshtein also links words one insertion or deletion apart")
+    parser.add_argument("--centrality-epsilon", type=float, default=DEFAULT_EPSILON,
+                        help="target error of the approximate betweenness behind /hubs")
+    parser.add_argument("--centrality-samples", type=int, default=DEFAULT_MAX_SAMPLES,
+                        help="at most this many BFS sources, whatever the target error")
+    args = parser.parse_args()
+    main(args.edge_model, args.centrality_epsilon, args.centrality_samples)
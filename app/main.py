@@ -5,15 +5,21 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from word_manager import WordManager
 from word_sources.local_dictionary_word_source import LocalDictionaryWordSource
-from word_sources.project_gutenberg_word_source import ProjectGutenbergWordSource
+from word_sources.project_gutenberg_word_source import ProjectGutenbergWordSource, make_session
+from word_sources.batch_word_source import BatchWordSource
 from word_sources.exceptions import WordSourceException
-from config import DATA_LAKE_PATH, DATA_MART_PATH
+from graph.graph_builder import update_graph
+from graph.exceptions import GraphFormatException
+from config import DATA_LAKE_PATH, DATA_MART_PATH, GRAPH_PATH
+
+BATCH_MAX_WORKERS = 8
 
 def main():
     print("Select the data source:")
     print("1. Local dictionary file")
     print("2. Project Gutenberg Book")
-    option = input("Enter 1 or 2: ")
+    print("3. Batch of Project Gutenberg Books")
+    option = input("Enter 1, 2 or 3: ")
 
     try:
         if option == '1':
@@ -22,6 +28,14 @@ def main():
         elif option == '2':
             book_url = input("Write the URL of the Project Gutenberg book: ")
             word_source = ProjectGutenbergWordSource(book_url)
+        elif option == '3':
+            books = input("Write the URLs or ids of the books, separated by commas or spaces: ")
+            entries = list(dict.fromkeys(books.replace(",", " ").split()))
+            workers = min(BATCH_MAX_WORKERS, max(1, len(entries)))
+            session = make_session(workers)
+            word_source = BatchWordSource(
+                [ProjectGutenbergWordSource(entry, session=session) for entry in entries],
+                max_workers=workers)
         else:
             print("Invalid option")
             return
@@ -29,12 +43,21 @@ def main():
         word_manager = WordManager(word_source)
         new_words_count = word_manager.process_words(DATA_LAKE_PATH, DATA_MART_PATH)
         print("Processing completed.")
+        if isinstance(word_source, BatchWordSource):
+            cached = sum(getattr(source, "from_cache", False) for source in word_source.succeeded)
+            print(f"Books ingested: {len(word_source.succeeded)} ({cached} from the datalake cache)")
+            for name, error in word_source.errors.items():
+                print(f"Failed {name}: {error}")
         
         total_new_words = sum(new_words_count.values())
         print(f"Total number of new words added: {total_new_words}")
         for length, count in sorted(new_words_count.items()):
             print(f"Length {length}: {count} new words")
-    except (WordSourceException, ValueError, IOError) as e:
+
+        if total_new_words and os.path.isfile(GRAPH_PATH):
+            graph, added = update_graph(GRAPH_PATH, word_manager.new_word_list())
+            print(f"Graph updated with {added} new nodes: {graph.node_count} nodes, {graph.edge_count} edges.")
+    except (WordSourceException, GraphFormatException, ValueError, IOError) as e:
         print(f"Error: {e}")
 
 if __name__ == "__main__":
@@ -1,13 +1,100 @@
 import os
-from typing import Dict, Set
+import mmap
+from typing import Dict, Iterable, List, Set
 from word_sources.word_source import WordSource
 
+
+def _bisect_lines(mm, key: bytes, lo: int = 0) -> int:
+    """Offset of the first line >= `key` in a sorted, newline-separated file.
+
+    `lo` must be the start of a line; every line before it must be < `key`.
+    """
+    hi = len(mm)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = mm.rfind(b"\n", lo, mid) + 1 or lo
+        end = mm.find(b"\n", start)
+        if end < 0:
+            end = len(mm)
+        if mm[start:end].strip() < key:
+            lo = end + 1
+        else:
+            hi = start
+    return min(lo, len(mm))
+
+
+def merge_words(file_path: str, words: Iterable[str]) -> List[str]:
+    """Merge `words` into a sorted datamart file and return the new ones.
+
+    Each word is located by binary search over the memory-mapped file, so
+    finding the new words costs O(k log n) and nothing is written when there
+    are none. Otherwise the file is copied in the spans between insertion
+    points into a temporary file that is renamed over the original, so a
+    crash leaves either the old or the new file.
+    """
+    incoming = sorted(set(words))
+    if not incoming:
+        return []
+    if not os.path.isfile(file_path) or os.path.getsize(file_path) == 0:
+        inserts = [(0, w) for w in incoming]
+        mm = b""
+    else:
+        with open(file_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        inserts = []
+        pos = 0
+        for w in incoming:
+            key = w.encode('utf-8')
+            pos = _bisect_lines(mm, key, pos)
+            end = mm.find(b"\n", pos)
+            if mm[pos:end if end >= 0 else len(mm)].strip() != key:
+                inserts.append((pos, w))
+
+    try:
+        if inserts:
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, 'wb') as f, memoryview(mm) as view:
+                prev = 0
+                for pos, w in inserts:
+                    f.write(view[prev:pos])
+                    if pos == len(view) and prev < pos and view[pos - 1] != ord("\n"):
+                        f.write(b"\n")
+                    f.write(w.encode('utf-8') + b"\n")
+                    prev = pos
+                f.write(view[prev:])
+            os.replace(tmp_path, file_path)
+    finally:
+        if isinstance(mm, mmap.mmap):
+            mm.close()
+    return [w for _, w in inserts]
+
+
+def read_datamart_words(data_mart_path: str) -> Set[str]:
+    """Every word in the datamart's words_<length>.txt files."""
+    words = set()
+    for file_name in os.listdir(data_mart_path):
+        if file_name.startswith("words_") and file_name.endswith(".txt"):
+            with open(os.path.join(data_mart_path, file_name), 'r', encoding='utf-8') as f:
+                for line in f:
+                    w = line.strip()
+                    if w:
+                        words.add(w)
+    return words
+
+
 class WordManager:
     def __init__(self, word_source: WordSource):
         self.word_source = word_source
+        self.new_words: Dict[int, Set[str]] = {}
 
     def process_words(self, data_lake_path: str, data_mart_path: str) -> Dict[int, int]:
+        """Merge the source's words into the datamart.
+
+        Returns the number of new words per length; the new words themselves
+        are kept in `self.new_words` so the graph can be updated incrementally.
+        """
         new_words_count = {}
+        self.new_words = {}
 
         self.word_source.save_raw_data(data_lake_path)
 
@@ -19,17 +106,12 @@ class WordManager:
             file_name = f"words_{length}.txt"
             file_path = os.path.join(data_mart_path, file_name)
 
-            existing = set()
-            if os.path.isfile(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    existing = {line.strip() for line in f if line.strip()}
-
-            new_set = word_set - existing
+            new_set = set(merge_words(file_path, word_set))
             new_words_count[length] = len(new_set)
-
-            combined = existing.union(word_set)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                for w in sorted(combined):
-                    f.write(w + "\n")
+            if new_set:
+                self.new_words[length] = new_set
 
         return new_words_count
+
+    def new_word_list(self) -> List[str]:
+        return [w for words in self.new_words.values() for w in words]
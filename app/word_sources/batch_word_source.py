@@ -0,0 +1,54 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set
+from .word_source import WordSource
+from .exceptions import WordSourceException
+
+logger = logging.getLogger(__name__)
+
+class BatchWordSource(WordSource):
+    """Several word sources fetched concurrently and merged into one.
+
+    A source that fails is recorded in `errors` and skipped, so one bad book
+    does not abort the batch; if every source fails the batch fails.
+    """
+
+    def __init__(self, sources: List[WordSource], max_workers: int = 4):
+        if not sources:
+            raise ValueError("A batch needs at least one source.")
+        self.sources = sources
+        self.max_workers = max_workers
+        self.errors: Dict[str, str] = {}
+        self.succeeded: List[WordSource] = []
+
+    def save_raw_data(self, data_lake_path: str) -> None:
+        def fetch(source: WordSource):
+            source.save_raw_data(data_lake_path)
+            source.get_words()
+            return source
+
+        self.errors = {}
+        self.succeeded = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [(source, pool.submit(fetch, source)) for source in self.sources]
+            for source, future in futures:
+                try:
+                    self.succeeded.append(future.result())
+                except WordSourceException as e:
+                    name = self._name(source)
+                    self.errors[name] = str(e)
+                    logger.warning(f"Skipping {name}: {e}")
+
+        if not self.succeeded:
+            raise WordSourceException(f"Every source in the batch failed: {self.errors}")
+
+    def get_words(self) -> Dict[int, Set[str]]:
+        words_by_length: Dict[int, Set[str]] = {}
+        for source in self.succeeded:
+            for length, words in source.get_words().items():
+                words_by_length.setdefault(length, set()).update(words)
+        return words_by_length
+
+    @staticmethod
+    def _name(source: WordSource) -> str:
+        return getattr(source, "book_url", None) or getattr(source, "file_path", None) or repr(source)
@@ -1,30 +1,19 @@
 import os
-import re
 from typing import Dict, Set
 from .word_source import WordSource
 from .exceptions import WordSourceException
+from .tokenizer import iter_vocabulary, iter_file_chunks, group_by_length
 
 class LocalDictionaryWordSource(WordSource):
     def __init__(self, file_path: str):
         if not os.path.isfile(file_path):
             raise ValueError(f"File does not exist: {file_path}")
         self.file_path = file_path
-        self.raw_content = ""
 
     def get_words(self) -> Dict[int, Set[str]]:
-        words_by_length = {}
         try:
             with open(self.file_path, 'r', encoding='utf-8') as f:
-                self.raw_content = f.read()
-
-            all_words = re.findall(r"\b[a-zA-Z]+\b", self.raw_content)
-
-            for w in all_words:
-                w_lower = w.lower()
-                if len(w_lower) >= 3:
-                    words_by_length.setdefault(len(w_lower), set()).add(w_lower)
-
-            return words_by_length
+                return group_by_length(iter_vocabulary(iter_file_chunks(f)))
         except OSError as e:
             raise WordSourceException(f"Error reading file {self.file_path}: {e}")
 
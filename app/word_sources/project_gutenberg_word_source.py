@@ -1,49 +1,150 @@
 import os
 import re
+import json
+import codecs
+import hashlib
+import tempfile
 import requests
-from typing import Dict, Set
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, Optional, Set
 from .word_source import WordSource
 from .exceptions import WordSourceException
+from .tokenizer import CHUNK_SIZE, iter_vocabulary, iter_file_chunks, group_by_length
+
+BOOK_URL_TEMPLATE = "https://www.gutenberg.org/cache/epub/{id}/pg{id}.txt"
+DEFAULT_TIMEOUT = (10, 60)
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """Session whose connection pool can serve `pool_size` concurrent downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 class ProjectGutenbergWordSource(WordSource):
-    def __init__(self, book_url: str):
+    def __init__(self, book_url: str, session: Optional[requests.Session] = None,
+                 timeout=DEFAULT_TIMEOUT, revalidate: bool = False):
         if not book_url:
             raise ValueError("URL cannot be empty.")
+        if book_url.isdigit():
+            book_url = BOOK_URL_TEMPLATE.format(id=book_url)
         self.book_url = book_url
-        self.raw_content = ""
         self.book_id = self._extract_book_id()
+        self.session = session
+        self.timeout = timeout
+        self.revalidate = revalidate
+        self.from_cache = False
+        self.words_by_length: Optional[Dict[int, Set[str]]] = None
 
     def get_words(self) -> Dict[int, Set[str]]:
-        self._download_book()
-        all_words = re.findall(r"\b[a-zA-Z]+\b", self.raw_content)
-        words_by_length = {}
-        for w in all_words:
-            w_lower = w.lower()
-            if len(w_lower) >= 3:
-                words_by_length.setdefault(len(w_lower), set()).add(w_lower)
-        return words_by_length
+        if self.words_by_length is None:
+            self.words_by_length = self._download_book()
+        return self.words_by_length
 
     def save_raw_data(self, data_lake_path: str) -> None:
+        """Stream the book into the datalake, tokenizing it on the way.
+
+        A book already in the datalake is read from there instead of being
+        downloaded again; with `revalidate` the server is asked, with the
+        validators saved last time, whether it changed.
+        """
         if not os.path.isdir(data_lake_path):
             os.makedirs(data_lake_path)
-        file_name = f"gutenberg_{self.book_id}.txt"
-        file_path = os.path.join(data_lake_path, file_name)
+        name = self._cache_name()
+        file_path = os.path.join(data_lake_path, f"{name}.txt")
+        meta_path = os.path.join(data_lake_path, f"{name}.headers.json")
+
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(self.raw_content)
+            # A file saved for another URL with the same book id is not a hit.
+            validators = {}
+            if os.path.isfile(meta_path):
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    try:
+                        validators = json.load(f)
+                    except ValueError:
+                        pass
+                # A corrupt file is a cache miss: the book is downloaded again.
+                if not isinstance(validators, dict):
+                    validators = {}
+            cached = (validators.get("url") == self.book_url
+                      and os.path.isfile(file_path) and os.path.getsize(file_path) > 0)
+            if cached and not self.revalidate:
+                self._read_cached(file_path)
+                return
+
+            headers = {}
+            if cached and validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if cached and validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+            # Download next to the final file, under a name of its own so that
+            # concurrent fetches do not share it, and rename it on success, so
+            # an interrupted download is never mistaken for a cached book.
+            fd, part_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".part", dir=data_lake_path)
+            try:
+                with open(fd, 'w', encoding='utf-8') as f:
+                    self.words_by_length, resp = self._fetch(f, headers)
+                if resp.status_code == 304:
+                    self._read_cached(file_path)
+                    return
+                os.replace(part_path, file_path)
+            finally:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({"url": self.book_url,
+                           "etag": resp.headers.get("ETag"),
+                           "last_modified": resp.headers.get("Last-Modified")}, f)
         except OSError as e:
             raise WordSourceException(f"Error saving to datalake: {e}")
 
-    def _download_book(self):
+    def _read_cached(self, file_path: str):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            self.words_by_length = group_by_length(iter_vocabulary(iter_file_chunks(f)))
+        self.from_cache = True
+
+    def _download_book(self, sink=None) -> Dict[int, Set[str]]:
+        words_by_length, _ = self._fetch(sink)
+        return words_by_length
+
+    def _fetch(self, sink=None, headers: Optional[Dict[str, str]] = None):
+        getter = self.session.get if self.session is not None else requests.get
         try:
-            resp = requests.get(self.book_url)
-            resp.raise_for_status()
-            self.raw_content = resp.text.lower()
+            with getter(self.book_url, stream=True, timeout=self.timeout, headers=headers) as resp:
+                if resp.status_code == 304:
+                    return None, resp
+                resp.raise_for_status()
+                return group_by_length(iter_vocabulary(self._iter_text(resp, sink))), resp
         except requests.RequestException as e:
             raise WordSourceException(f"Error downloading PG book: {e}")
 
+    def _iter_text(self, resp, sink=None) -> Iterator[str]:
+        # Gutenberg serves UTF-8; without an explicit charset requests would
+        # fall back to ISO-8859-1.
+        content_type = resp.headers.get('Content-Type', '').lower()
+        encoding = resp.encoding if 'charset' in content_type and resp.encoding else 'utf-8'
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        for block in resp.iter_content(chunk_size=CHUNK_SIZE):
+            text = decoder.decode(block).lower()
+            if sink is not None:
+                sink.write(text)
+            yield text
+        text = decoder.decode(b'', final=True).lower()
+        if sink is not None:
+            sink.write(text)
+        yield text
+
+    def _cache_name(self) -> str:
+        """Datalake file name for this book: its id, or a hash of a URL without one."""
+        if self.book_id != "unknown":
+            return f"gutenberg_{self.book_id}"
+        return f"gutenberg_url_{hashlib.sha1(self.book_url.encode('utf-8')).hexdigest()[:16]}"
+
     def _extract_book_id(self):
-        match = re.search(r"/(\d+)/?", self.book_url)
+        match = re.search(r"/(\d+)/?", urlparse(self.book_url).path)
         if match:
             return match.group(1)
         return "unknown"
@@ -0,0 +1,73 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Set
+
+CHUNK_SIZE = 1 << 20
+MAX_TOKEN_LENGTH = 1024
+MIN_WORD_LENGTH = 3
+
+_WORD_RUN = re.compile(r"\w+")
+_WORD = re.compile(r"\b[a-zA-Z]+\b")
+
+
+def _words_in(text: str) -> List[str]:
+    return " ".join(_WORD.findall(text)).lower().split()
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def iter_word_batches(chunks: Iterable[str]) -> Iterator[List[str]]:
+    """Lower-cased words from a stream of text chunks, one list per chunk.
+
+    A word run touching the end of a chunk is held back and joined with the
+    next chunk, so words split across chunk boundaries are not cut. Runs
+    longer than MAX_TOKEN_LENGTH are dropped to keep memory bounded.
+    """
+    carry = ""
+    skipping = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if skipping:
+            lead = _WORD_RUN.match(chunk)
+            if lead is not None:
+                if lead.end() == len(chunk):
+                    continue
+                chunk = chunk[lead.end():]
+            skipping = False
+
+        text = carry + chunk
+        i = len(text)
+        while i > 0 and _is_word_char(text[i - 1]):
+            i -= 1
+        carry = text[i:]
+        if len(carry) > MAX_TOKEN_LENGTH:
+            carry = ""
+            skipping = True
+        yield _words_in(text[:i])
+    if carry:
+        yield _words_in(carry)
+
+
+def iter_words(chunks: Iterable[str]) -> Iterator[str]:
+    for batch in iter_word_batches(chunks):
+        yield from batch
+
+
+def iter_vocabulary(chunks: Iterable[str]) -> Iterator[str]:
+    """Like iter_words, but each word is yielded at most once per chunk."""
+    for batch in iter_word_batches(chunks):
+        yield from set(batch)
+
+
+def iter_file_chunks(f, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    return iter(lambda: f.read(chunk_size), "")
+
+
+def group_by_length(words: Iterable[str], min_length: int = MIN_WORD_LENGTH) -> Dict[int, Set[str]]:
+    words_by_length: Dict[int, Set[str]] = {}
+    for w in words:
+        if len(w) >= min_length:
+            words_by_length.setdefault(len(w), set()).add(w)
+    return words_by_length
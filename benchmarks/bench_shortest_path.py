@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+import networkx as nx
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from config import GRAPH_PATH
+from graph.graph import Graph
+from graph.node import Node
+from graph.compact_graph import CompactGraph
+from graph.path_engine import PathEngine
+from synthetic import synthetic_words
+
+
+def networkx_shortest_path(nx_graph, w1, w2):
+    # Mirrors the pre-engine GraphAnalyzer.shortest_path.
+    s_node = Node(w1)
+    t_node = Node(w2)
+    if s_node not in nx_graph or t_node not in nx_graph:
+        return None
+    try:
+        return [n.word for n in nx.shortest_path(nx_graph, source=s_node, target=t_node)]
+    except nx.NetworkXNoPath:
+        return None
+
+
+def latencies(fn, pairs):
+    result = []
+    for w1, w2 in pairs:
+        start = time.perf_counter()
+        fn(w1, w2)
+        result.append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def report(label, values):
+    values = sorted(values)
+    p = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    print(f"  {label:<10} mean {statistics.mean(values):8.3f} ms  p50 {p(0.5):8.3f}  "
+          f"p95 {p(0.95):8.3f}  p99 {p(0.99):8.3f}")
+
+
+def bench(name, compact, queries, seed):
+    nx_graph = Graph()
+    nx_graph.add_words(compact.words)
+    engine = PathEngine(compact)
+
+    rng = random.Random(seed)
+    # Same-length pairs (the only ones that can be connected) and pairs
+    # inside the largest component, where the search actually has to walk.
+    by_length = {}
+    for w in compact.words:
+        by_length.setdefault(len(w), []).append(w)
+    pools = [p for p in by_length.values() if len(p) > 1]
+    random_pairs = [tuple(rng.sample(rng.choice(pools), 2)) for _ in range(queries)]
+    largest = max(nx.connected_components(nx_graph.graph), key=len)
+    largest = [n.word for n in largest]
+    connected_pairs = [tuple(rng.sample(largest, 2)) for _ in range(queries)]
+
+    print(f"{name}: {compact.node_count} nodes, {compact.edge_count} edges, "
+          f"largest component {len(largest)}")
+    for label, pairs in (("same-length pairs", random_pairs), ("largest-component pairs", connected_pairs)):
+        print(f" {label} ({queries}):")
+        report("networkx", latencies(lambda a, b: networkx_shortest_path(nx_graph.graph, a, b), pairs))
+        report("engine", latencies(engine.shortest_path, pairs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shortest-path latency: networkx vs PathEngine")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--synthetic", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    bench("datamart", CompactGraph.load(GRAPH_PATH), args.queries, args.seed)
+    if args.synthetic:
+        words = synthetic_words(args.synthetic, seed=args.seed)
+        bench(f"synthetic-{args.synthetic}", CompactGraph.from_words(words), args.queries, args.seed)
+
+
+if __name__ == "__main__":
+    main()
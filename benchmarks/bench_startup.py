@@ -0,0 +1,70 @@
+"""Cold start of an API worker: a fresh interpreter importing the app.
+
+For every run a new Python process imports app/api/api.py the way a
+gunicorn worker does and reports, from the start of the process:
+
+  import   until the module is imported and /healthz can be answered
+  ready    until the background load has finished and /readyz says ready
+
+The graph file is GRAPH_PATH (app/graph.bin by default) or --graph.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, "app", "api")
+
+WORKER = """
+import time
+start = time.perf_counter()
+import json, logging, tempfile
+logging.basicConfig(level=logging.WARNING)
+from api import api
+imported = time.perf_counter() - start
+client = api.app.test_client()
+assert client.get("/healthz").status_code == 200
+api.graph_loaded.wait()
+assert client.get("/readyz").status_code == 200, "graph failed to load"
+ready = time.perf_counter() - start
+api.job_queue.shutdown()
+print(json.dumps({"import": imported, "ready": ready}))
+"""
+
+
+def run_once(graph_path: str, tmp: str) -> dict:
+    env = dict(os.environ, GRAPH_PATH=graph_path, JOBS_PATH=os.path.join(tmp, "jobs"))
+    env.pop("METRICS_PATH", None)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.join(ROOT, "app"), env.get("PYTHONPATH")]))
+    out = subprocess.run([sys.executable, "-c", WORKER], cwd=tmp, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    import tempfile
+
+    sys.path.append(os.path.join(ROOT, "app"))
+    from config import GRAPH_PATH
+
+    parser = argparse.ArgumentParser(description="Cold-start time of an API worker")
+    parser.add_argument("--graph", default=GRAPH_PATH)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(args.runs):
+            samples.append(run_once(os.path.abspath(args.graph), tmp))
+    result = {"graph": args.graph, "runs": args.runs}
+    for key in ("import", "ready"):
+        values = [s[key] * 1000 for s in samples]
+        result[f"{key}_ms"] = {"median": statistics.median(values), "min": min(values), "max": max(values)}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import resource
+import subprocess
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from config import DATA_MART_PATH
+from word_sources.local_dictionary_word_source import LocalDictionaryWordSource
+
+
+def make_corpus(path: str, size_mb: int, seed: int = 0):
+    """Prose-like text from datamart words with punctuation, digits and case."""
+    rng = random.Random(seed)
+    words = []
+    for name in sorted(os.listdir(DATA_MART_PATH)):
+        with open(os.path.join(DATA_MART_PATH, name), encoding="utf-8") as f:
+            words.extend(line.strip() for line in f if line.strip())
+    block = []
+    for _ in range(200000):
+        w = rng.choice(words)
+        r = rng.random()
+        if r < 0.1:
+            w = w.capitalize() + rng.choice([".", ",", ";", "!"])
+        elif r < 0.12:
+            w = f"{w}'s"
+        elif r < 0.13:
+            w = str(rng.randint(1, 1999))
+        block.append(w)
+        block.append("\n" if rng.random() < 0.08 else " ")
+    block = "".join(block)
+
+    target = size_mb * 1024 * 1024
+    with open(path, "w", encoding="utf-8") as f:
+        written = 0
+        while written < target:
+            f.write(block)
+            written += len(block)
+
+
+def whole_file_words(path: str):
+    # The pre-streaming implementation: read everything, then findall.
+    with open(path, encoding="utf-8") as f:
+        raw_content = f.read()
+    words_by_length = {}
+    for w in re.findall(r"\b[a-zA-Z]+\b", raw_content):
+        w_lower = w.lower()
+        if len(w_lower) >= 3:
+            words_by_length.setdefault(len(w_lower), set()).add(w_lower)
+    return words_by_length
+
+
+def run_one(mode: str, path: str):
+    start = time.perf_counter()
+    if mode == "streaming":
+        words = LocalDictionaryWordSource(path).get_words()
+    else:
+        words = whole_file_words(path)
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    vocabulary = sum(len(s) for s in words.values())
+    print(f"  {mode:<10} {elapsed:7.2f}s  {size_mb / elapsed:7.1f} MB/s  peak RSS {peak_mb:8.1f} MB  "
+          f"vocabulary {vocabulary}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokenizer throughput and peak memory")
+    parser.add_argument("--size-mb", type=int, default=300)
+    parser.add_argument("--modes", default="whole-file,streaming",
+                        help="comma-separated; whole-file needs several GB of RAM at 300 MB")
+    parser.add_argument("--mode", choices=["streaming", "whole-file"])
+    parser.add_argument("--path")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_one(args.mode, args.path)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        make_corpus(path, args.size_mb)
+        print(f"corpus: {os.path.getsize(path) / (1024 * 1024):.0f} MB", flush=True)
+        for mode in args.modes.split(","):
+            result = subprocess.run([sys.executable, __file__, "--mode", mode, "--path", path])
+            if result.returncode:
+                print(f"  {mode:<10} failed with exit code {result.returncode}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
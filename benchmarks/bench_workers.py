@@ -0,0 +1,178 @@
+"""Memory per API worker when N processes serve the same graph.
+
+Each worker loads the graph, builds a GraphAnalyzer and runs a workload
+that touches every page of it, then reports its memory from
+/proc/<pid>/smaps_rollup while all workers are alive. PSS splits shared
+pages evenly between the processes mapping them, so it is the real cost of
+one more worker; "private" is memory no other process can share.
+
+  --mode mmap     the graph file is memory-mapped (how the API loads it)
+  --mode private  every worker copies the graph into its own arrays, as
+                  when each worker unpickled its own graph
+  --gunicorn      measure a real gunicorn server started with
+                  app/api/gunicorn.conf.py instead of simulated workers
+
+Linux only.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+import multiprocessing
+from array import array
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from config import GRAPH_PATH
+from graph.compact_graph import CompactGraph, WordTable
+from graph.graph_builder import build_graph
+from synthetic import synthetic_words
+
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "api")
+
+
+def memory(pid) -> dict:
+    """Rss, Pss and private/shared memory of a process, in MiB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss": values.get("Rss", 0.0),
+        "pss": values.get("Pss", 0.0),
+        "private": values.get("Private_Clean", 0.0) + values.get("Private_Dirty", 0.0),
+        "shared": values.get("Shared_Clean", 0.0) + values.get("Shared_Dirty", 0.0),
+    }
+
+
+def private_copy(graph: CompactGraph) -> CompactGraph:
+    words = WordTable(array("Q", graph.words.offsets), bytes(graph.words.data))
+    sections = {name: array(values.format, values) if hasattr(values, "format") else bytes(values)
+                for name, values in graph.sections.items()}
+    return CompactGraph(words, array("Q", graph.adj_offsets), array("I", graph.adj),
+                        dict(graph.metadata), sections)
+
+
+def workload(analyzer, seed: int = 0):
+    graph = analyzer.graph
+    sum(len(w) for w in graph.words)
+    sum(graph.adj)
+    analyzer.get_basic_info()
+    analyzer.high_connectivity_nodes(2)
+    analyzer.clusters(0, 1000)
+    rng = random.Random(seed)
+    for _ in range(200):
+        analyzer.shortest_path(graph.word(rng.randrange(graph.node_count)),
+                               graph.word(rng.randrange(graph.node_count)))
+
+
+def worker(path, mode, ready, done, results):
+    from graph.graph_analyzer import GraphAnalyzer
+
+    graph = CompactGraph.load(path)
+    if mode == "private":
+        graph = private_copy(graph)
+    analyzer = GraphAnalyzer(graph)
+    workload(analyzer, os.getpid())
+    ready.wait()
+    results.put(memory(os.getpid()))
+    done.wait()
+
+
+def simulate(path: str, workers: int, mode: str):
+    context = multiprocessing.get_context("spawn")
+    ready = context.Barrier(workers + 1)
+    done = context.Barrier(workers + 1)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(path, mode, ready, done, results))
+                 for _ in range(workers)]
+    for p in processes:
+        p.start()
+    ready.wait()
+    measured = [results.get() for _ in processes]
+    done.wait()
+    for p in processes:
+        p.join()
+    return measured
+
+
+def gunicorn(path: str, workers: int, port: int):
+    env = dict(os.environ, GRAPH_PATH=path, GRAPH_API_WORKERS=str(workers),
+               GRAPH_API_BIND=f"127.0.0.1:{port}")
+    server = subprocess.Popen(["gunicorn", "-c", "gunicorn.conf.py", "api:app"], cwd=API_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        deadline = time.time() + 120
+        while True:
+            try:
+                if requests.get(f"{base}/diameter", timeout=5).ok:
+                    break
+            except requests.ConnectionError:
+                pass
+            if time.time() > deadline:
+                raise RuntimeError("gunicorn did not come up")
+            time.sleep(0.5)
+
+        graph = CompactGraph.load(path)
+        rng = random.Random(0)
+        session = requests.Session()
+        # Enough requests that every worker serves several of each kind.
+        for _ in range(workers * 20):
+            session.get(f"{base}/high-connectivity", params={"degree": 2})
+            session.get(f"{base}/clusters", params={"limit": 1000})
+            session.get(f"{base}/isolated-nodes")
+            session.get(f"{base}/shortest-path", params={
+                "word1": graph.word(rng.randrange(graph.node_count)),
+                "word2": graph.word(rng.randrange(graph.node_count))})
+
+        children = subprocess.run(["pgrep", "-P", str(server.pid)], capture_output=True, text=True)
+        return [memory(int(pid)) for pid in children.stdout.split()]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=["mmap", "private"], default="mmap")
+    parser.add_argument("--words", type=int, default=0,
+                        help="build a synthetic graph of this many words instead of using app/graph.bin")
+    parser.add_argument("--gunicorn", action="store_true")
+    parser.add_argument("--port", type=int, default=5099)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = GRAPH_PATH
+        if args.words:
+            path = os.path.join(tmp, "graph.bin")
+            build_graph(synthetic_words(args.words)).save(path)
+        graph = CompactGraph.load(path)
+        print(f"graph: {graph.node_count} nodes, {graph.edge_count} edges, "
+              f"{os.path.getsize(path) / 2 ** 20:.1f} MiB on disk")
+
+        if args.gunicorn:
+            measured = gunicorn(path, args.workers, args.port)
+            label = "gunicorn"
+        else:
+            measured = simulate(path, args.workers, args.mode)
+            label = args.mode
+
+    print(f"{label}, {len(measured)} workers (MiB):")
+    for i, m in enumerate(measured):
+        print(f"  worker {i}: rss {m['rss']:7.1f}  pss {m['pss']:7.1f}  "
+              f"private {m['private']:7.1f}  shared {m['shared']:7.1f}")
+    total_pss = sum(m["pss"] for m in measured)
+    print(f"  total pss {total_pss:.1f}, {total_pss / len(measured):.1f} per worker")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Build, load and query benchmarks with results as JSON.
+
+Every dataset runs in a fresh process:
+
+  build    build_graph + save, as initialize_graph does, with the peak RSS
+           of the process and the size of the graph file
+  load     api.load_graph on the saved file, repeated --load-runs times
+  queries  latency percentiles of each GraphAnalyzer method, on word pairs
+           drawn with --seed so that runs are comparable
+
+Datasets are the shipped datamart and synthetic dictionaries with the
+datamart's length distribution (see synthetic.py):
+
+  python3 benchmarks/suite.py --sizes 10000,100000,1000000 -o before.json
+  python3 benchmarks/suite.py -o after.json --compare before.json
+
+Timings vary from run to run by 10-20% on a shared machine; compare runs
+made on the same machine and raise --queries for steadier percentiles.
+Linux only (peak RSS is read from getrusage in kB).
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import multiprocessing
+from queue import Empty
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "app"))
+
+from synthetic import synthetic_words
+
+# Per-call budget of the searches that would otherwise run unbounded.
+SEARCH_TIME_BUDGET = 0.5
+# Metrics --compare reports; lower is better for all of them.
+COMPARED = ("build.seconds", "build.peak_rss_mb", "load.median_ms", "queries.*.p50_ms", "queries.*.p95_ms")
+# Changes between values this small (ms or s) are timer noise, never flagged.
+NOISE_FLOOR = 0.05
+
+
+def percentiles(samples_ms) -> dict:
+    values = sorted(samples_ms)
+    p = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {
+        "n": len(values),
+        "mean_ms": statistics.mean(values),
+        "p50_ms": p(0.5),
+        "p90_ms": p(0.9),
+        "p95_ms": p(0.95),
+        "p99_ms": p(0.99),
+        "max_ms": values[-1],
+    }
+
+
+def timed(fn, calls) -> dict:
+    # One untimed call first, so lazily built indices are not counted.
+    fn(*calls[0])
+    samples = []
+    for args in calls:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def dataset_words(name: str, seed: int):
+    if name == "datamart":
+        from config import DATA_MART_PATH
+        from word_manager import read_datamart_words
+        return sorted(read_datamart_words(DATA_MART_PATH))
+    return synthetic_words(int(name.split("-")[1]), seed=seed)
+
+
+def bench_queries(analyzer, queries: int, seed: int) -> dict:
+    from graph.longest_path import SearchBudget
+
+    graph = analyzer.graph
+    rng = random.Random(seed)
+    largest = list(analyzer.components.groups()[0])
+    # Pairs inside the largest component, where searches have to walk, and
+    # random pairs of the same length, most of them not connected.
+    connected = [(graph.word(a), graph.word(b)) for a, b in
+                 (rng.sample(largest, 2) if len(largest) > 1 else (largest[0],) * 2 for _ in range(queries))]
+    by_length = {}
+    for w in graph.words:
+        by_length.setdefault(len(w), []).append(w)
+    pools = [p for p in by_length.values() if len(p) > 1]
+    same_length = [tuple(rng.sample(rng.choice(pools), 2)) for _ in range(queries)]
+    words = [(graph.word(rng.randrange(graph.node_count)),) for _ in range(queries)]
+    few = max(queries // 25, 3)
+    pages = [() for _ in range(max(queries // 10, 5))]
+
+    def max_distance(a, b):
+        analyzer.maximum_distance_between(a, b, 8, SearchBudget(time_limit=SEARCH_TIME_BUDGET))
+
+    batches = [(connected[i:i + 100],) for i in range(0, len(connected), 100)]
+    return {
+        "shortest_path.connected": timed(analyzer.shortest_path, connected),
+        "shortest_path.same_length": timed(analyzer.shortest_path, same_length),
+        "shortest_paths.batch_100": timed(analyzer.shortest_paths, batches),
+        "all_paths.dfs": timed(lambda a, b: analyzer.all_paths(a, b, 10, time_budget=SEARCH_TIME_BUDGET),
+                               connected[:few]),
+        "all_paths.shortest": timed(lambda a, b: analyzer.all_paths(a, b, 10, "shortest",
+                                                                    time_budget=SEARCH_TIME_BUDGET),
+                                    connected[:few]),
+        "maximum_distance_between": timed(max_distance, connected[:few]),
+        "longest_path": timed(lambda: analyzer.longest_path(time_budget=SEARCH_TIME_BUDGET, processes=1),
+                              [()] * 3),
+        "diameter": timed(analyzer.diameter, pages),
+        "get_basic_info": timed(analyzer.get_basic_info, pages),
+        "get_degree_distribution": timed(analyzer.get_degree_distribution, pages),
+        "clusters": timed(lambda: analyzer.clusters(0, 100), pages),
+        "cluster_of": timed(lambda w: analyzer.cluster_of(w, 100), words),
+        "high_connectivity_nodes": timed(lambda: analyzer.high_connectivity_nodes(2, 0, 100), pages),
+        "nodes_by_degree": timed(lambda: analyzer.nodes_by_degree(1, 0, 100), pages),
+        "isolated_nodes": timed(lambda: analyzer.isolated_nodes(0, 100), pages),
+    }
+
+
+def run_dataset(name: str, edge_model: str, seed: int, queries: int, load_runs: int, results):
+    # Keeps the build's and the API's INFO logs out of the output; set
+    # before api is imported so its logging setup does nothing.
+    logging.basicConfig(level=logging.WARNING)
+    from graph.graph_builder import build_graph
+
+    words = dataset_words(name, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.bin")
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        start = time.perf_counter()
+        graph = build_graph(words, edge_model)
+        built = time.perf_counter() - start
+        graph.save(path)
+        saved = time.perf_counter() - start - built
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        result = {
+            "name": name,
+            "edge_model": edge_model,
+            "words": len(words),
+            "nodes": graph.node_count,
+            "edges": graph.edge_count,
+            "build": {"seconds": built, "save_seconds": saved, "peak_rss_mb": peak,
+                      "rss_growth_mb": peak - rss_before, "file_mb": os.path.getsize(path) / 2 ** 20},
+        }
+        del graph, words
+
+        os.environ.update(GRAPH_PATH=path, JOBS_PATH=os.path.join(tmp, "jobs"))
+        os.environ.pop("METRICS_PATH", None)
+        os.chdir(tmp)
+        from api import api
+        api.graph_loaded.wait()
+
+        samples = []
+        for _ in range(load_runs):
+            start = time.perf_counter()
+            if not api.load_graph():
+                raise RuntimeError(f"api.load_graph failed for {path}")
+            samples.append((time.perf_counter() - start) * 1000)
+        result["load"] = {"median_ms": statistics.median(samples), "min_ms": min(samples),
+                          "max_ms": max(samples), "runs": load_runs}
+        result["components"] = api.analyzer.components.count
+        result["queries"] = bench_queries(api.analyzer, queries, seed)
+        api.job_queue.shutdown()
+    results.put(result)
+
+
+def environment() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        except OSError:
+            return ""
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def flatten(dataset: dict) -> dict:
+    values = {f"build.{k}": v for k, v in dataset["build"].items()}
+    values.update({f"load.{k}": v for k, v in dataset["load"].items()})
+    for method, stats in dataset["queries"].items():
+        values.update({f"queries.{method}.{k}": v for k, v in stats.items()})
+    return values
+
+
+def compare(baseline: dict, current: dict, threshold: float):
+    """Print the change of every compared metric to stderr; flags changes beyond `threshold`."""
+    import fnmatch
+
+    key = lambda d: (d["name"], d.get("edge_model", "substitution"))
+    before = {key(d): flatten(d) for d in baseline["datasets"]}
+    print(f"compared with {baseline['environment']['commit'][:10]} ({baseline['environment']['timestamp']}):",
+          file=sys.stderr)
+    for dataset in current["datasets"]:
+        if key(dataset) not in before:
+            continue
+        print(f" {dataset['name']} ({dataset['edge_model']}):", file=sys.stderr)
+        old = before[key(dataset)]
+        for metric, value in flatten(dataset).items():
+            if metric not in old or not any(fnmatch.fnmatch(metric, pattern) for pattern in COMPARED):
+                continue
+            change = value / old[metric] - 1 if old[metric] else 0.0
+            flag = ""
+            if max(value, old[metric]) >= NOISE_FLOOR:
+                flag = "  REGRESSION" if change > threshold else "  improved" if change < -threshold else ""
+            print(f"  {metric:<45} {old[metric]:10.3f} -> {value:10.3f}  {change:+7.1%}{flag}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000",
+                        help="comma-separated synthetic dictionary sizes, empty for none")
+    parser.add_argument("--no-datamart", action="store_true")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--load-runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--edge-model", default="substitution", help="substitution or levenshtein")
+    parser.add_argument("-o", "--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative change reported as a regression or improvement")
+    args = parser.parse_args()
+
+    names = [] if args.no_datamart else ["datamart"]
+    names += [f"synthetic-{int(size)}" for size in args.sizes.split(",") if size.strip()]
+
+    context = multiprocessing.get_context("spawn")
+    report = {"environment": environment(), "seed": args.seed, "queries": args.queries, "datasets": []}
+    for name in names:
+        results = context.Queue()
+        process = context.Process(target=run_dataset, args=(name, args.edge_model, args.seed, args.queries,
+                                                                args.load_runs, results))
+        process.start()
+        while True:
+            try:
+                dataset = results.get(timeout=1)
+                break
+            except Empty:
+                if not process.is_alive():
+                    raise SystemExit(f"{name}: benchmark process exited with code {process.exitcode}")
+        process.join()
+        report["datasets"].append(dataset)
+        print(f"{name}: {dataset['nodes']} nodes, {dataset['edges']} edges, built in "
+              f"{dataset['build']['seconds']:.2f}s (peak RSS {dataset['build']['peak_rss_mb']:.0f} MiB), "
+              f"loaded in {dataset['load']['median_ms']:.2f} ms", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
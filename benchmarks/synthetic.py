@@ -0,0 +1,45 @@
+import random
+from typing import List
+
+# Share of each word length in the shipped datamart (lengths 3..18).
+LENGTH_WEIGHTS = {
+    3: 359, 4: 1125, 5: 1719, 6: 2309, 7: 2520, 8: 2255, 9: 1854, 10: 1263,
+    11: 815, 12: 443, 13: 219, 14: 76, 15: 31, 16: 10, 17: 1, 18: 1,
+}
+
+# English letter frequencies (percent).
+LETTER_WEIGHTS = {
+    "e": 12.7, "t": 9.1, "a": 8.2, "o": 7.5, "i": 7.0, "n": 6.7, "s": 6.3, "h": 6.1,
+    "r": 6.0, "d": 4.3, "l": 4.0, "c": 2.8, "u": 2.8, "m": 2.4, "w": 2.4, "f": 2.2,
+    "g": 2.0, "y": 2.0, "p": 1.9, "b": 1.5, "v": 1.0, "k": 0.8, "j": 0.2, "x": 0.2,
+    "q": 0.1, "z": 0.1,
+}
+
+
+def synthetic_words(count: int, seed: int = 0, mutation_rate: float = 0.6) -> List[str]:
+    """Random dictionary with the datamart's length distribution.
+
+    A share of the words are one-letter mutations of earlier words, which
+    gives the word-ladder clusters real dictionaries have instead of a
+    graph made only of isolated nodes.
+    """
+    rng = random.Random(seed)
+    lengths = list(LENGTH_WEIGHTS)
+    length_weights = list(LENGTH_WEIGHTS.values())
+    letters = list(LETTER_WEIGHTS)
+    letter_weights = list(LETTER_WEIGHTS.values())
+
+    words = set()
+    ordered = []
+    while len(ordered) < count:
+        if ordered and rng.random() < mutation_rate:
+            base = rng.choice(ordered)
+            i = rng.randrange(len(base))
+            word = base[:i] + rng.choices(letters, letter_weights)[0] + base[i + 1:]
+        else:
+            length = rng.choices(lengths, length_weights)[0]
+            word = "".join(rng.choices(letters, letter_weights, k=length))
+        if word not in words:
+            words.add(word)
+            ordered.append(word)
+    return ordered
@@ -142,8 +142,8 @@ resource "aws_instance" "graph_ec2" {
     cd /home/ec2-user/graphword-mj/app/api
     echo "Navegación al directorio de la API Flask completada"
 
-    # Iniciar la API con Gunicorn (modo simple)
-    nohup gunicorn --bind 127.0.0.1:5000 api:app > app.log 2>&1 &
+    # Iniciar la API con Gunicorn (un worker por CPU, el grafo compartido por mmap)
+    nohup gunicorn -c gunicorn.conf.py api:app > app.log 2>&1 &
     echo "Gunicorn iniciado"
   EOF
 
@@ -0,0 +1,14 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from graph.compact_graph import CompactGraph  # noqa: E402
+
+
+def random_graph(seed, n=400, alphabet="abcd", max_len=5):
+    """Graph of up to `n` random words of 2 to `max_len` letters from `alphabet`."""
+    rng = random.Random(seed)
+    words = {"".join(rng.choice(alphabet) for _ in range(rng.randint(2, max_len))) for _ in range(n)}
+    return CompactGraph.from_words(words)
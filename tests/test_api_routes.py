@@ -0,0 +1,180 @@
+import os
+import time
+import importlib
+
+import pytest
+
+from graph.graph_builder import build_graph
+
+WORDS = ["cat", "cot", "cog", "dog", "bat", "cut", "dig", "xyz"]
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    # The module logs to files in the working directory when it is imported.
+    root = tmp_path_factory.mktemp("api")
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        module = importlib.import_module("api.api")
+    finally:
+        os.chdir(cwd)
+    module.graph_loaded.wait(30)
+    path = str(root / "graph.bin")
+    build_graph(WORDS).save(path)
+    module.snapshots.path = path
+    assert module.snapshots.load(force=True)
+    return module
+
+
+@pytest.fixture
+def client(api):
+    return api.app.test_client()
+
+
+def test_health_and_readiness(api, client):
+    assert client.get("/healthz").get_json() == {"status": "ok"}
+    resp = client.get("/readyz")
+    assert resp.status_code == 200
+    ready = resp.get_json()
+    assert ready["status"] == "ready" and ready["number_of_nodes"] == len(WORDS)
+    assert ready["graph_version"] == api.snapshots.current.version == resp.headers["X-Graph-Version"]
+    assert client.get("/info").headers["X-Graph-Version"] == ready["graph_version"]
+
+
+def test_shortest_path_batch(api, client, monkeypatch):
+    resp = client.post("/shortest-path/batch", json={"pairs": [["cat", "dog"], ["cat", "xyz"], ["cat", "nope"]]})
+    assert resp.status_code == 200 and "X-Graph-Version" in resp.headers
+    results = resp.get_json()["results"]
+    assert results[0] == {"word1": "cat", "word2": "dog", "distance": 3, "path": ["cat", "cot", "cog", "dog"]}
+    assert results[1]["distance"] is None and results[1]["path"] is None
+    assert results[2]["error"] == "Unknown word 'nope'"
+    assert resp.get_json()["stats"]["pairs"] == 3
+
+    resp = client.post("/shortest-path/batch", json={"source": "cat", "targets": ["cut", "bat"], "paths": False})
+    assert [(r["word2"], r["distance"]) for r in resp.get_json()["results"]] == [("cut", 1), ("bat", 1)]
+    assert "path" not in resp.get_json()["results"][0]
+
+    for body in ([["cat", "dog"]], {"pairs": [["cat"]]}, {"pairs": [["cat", 1]]}, {"pairs": "cat,dog"},
+                 {"source": "cat", "targets": "dog"}, {"source": "cat"}):
+        assert client.post("/shortest-path/batch", json=body).status_code == 400
+    assert client.post("/shortest-path/batch", data="not json").status_code == 400
+    monkeypatch.setattr(api, "MAX_BATCH_PAIRS", 2)
+    assert client.post("/shortest-path/batch", json={"source": "cat", "targets": ["a", "b", "c"]}).status_code == 400
+
+
+@pytest.mark.parametrize("budget", ["nan", "inf", "-inf", "0", "-1", "1e9", "soon"])
+def test_time_budget_must_be_bounded(client, budget):
+    for url in ("/all-paths?word1=cat&word2=dog", "/maximum-distance?word1=cat&word2=dog", "/maximum-distance?"):
+        assert client.get(f"{url}&time_budget={budget}").status_code == 400
+
+
+def test_searches_within_a_time_budget(client):
+    resp = client.get("/all-paths?word1=cat&word2=dog&time_budget=2")
+    assert resp.status_code == 200 and resp.get_json()["complete"]
+    assert ["cat", "cot", "cog", "dog"] in resp.get_json()["all_paths"]
+    resp = client.get("/maximum-distance?word1=cat&word2=dog&time_budget=2")
+    assert resp.get_json()["complete"] and resp.get_json()["distance"] >= 3
+    resp = client.get("/maximum-distance?time_budget=2")
+    assert resp.status_code == 200 and resp.get_json()["proven_optimal"]
+
+
+def test_jobs(client):
+    assert client.post("/jobs", json={"kind": "longest-path", "time_budget": "nan"}).status_code == 400
+    assert client.post("/jobs", json={"kind": "longest-path", "time_budget": 0}).status_code == 400
+    assert client.post("/jobs", json={"kind": "nothing"}).status_code == 400
+    assert client.post("/jobs", json={"kind": "all-paths", "params": {"word1": "cat"}}).status_code == 400
+    assert client.post("/jobs", json=["longest-path"]).status_code == 400
+
+    resp = client.post("/jobs", json={"kind": "maximum-distance", "params": {"word1": "cat", "word2": "dog"},
+                                      "time_budget": 5})
+    assert resp.status_code in (200, 202)
+    job = resp.get_json()
+    assert resp.headers["Location"] == f"/jobs/{job['id']}"
+    deadline = time.monotonic() + 10
+    while job["status"] in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.02)
+        job = client.get(f"/jobs/{job['id']}").get_json()
+    assert job["status"] == "done" and job["result"]["distance"] >= 3
+    assert client.get("/jobs/unknown").status_code == 404
+    assert client.delete("/jobs/unknown").status_code == 404
+
+
+def test_metrics(client):
+    # Requests are counted when their response is closed.
+    client.get("/healthz").close()
+    resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.mimetype == "text/plain"
+    text = resp.get_data(as_text=True)
+    assert f"graph_nodes {len(WORDS)}" in text
+    assert 'graph_api_requests_total{method="GET",route="/healthz",status="200"}' in text
+
+
+def test_render(client):
+    resp = client.get("/render?word=cat&radius=1")
+    assert resp.status_code == 200 and resp.mimetype == "image/svg+xml"
+    assert int(resp.headers["X-Render-Nodes"]) == 4 and resp.headers["X-Render-Truncated"] == "false"
+    assert client.get("/render?word=cat&word2=xyz").status_code == 404
+    assert client.get("/render?word=nope").status_code == 404
+    assert client.get("/render").status_code == 400
+    assert client.get("/render?word=cat&radius=9").status_code == 400
+    assert client.get("/render?word=cat&format=gif").status_code == 400
+
+
+def test_admin_reload(api, client, monkeypatch):
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "secret")
+    assert client.post("/admin/reload").status_code == 403
+    assert client.post("/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    resp = client.post("/admin/reload", headers={"X-Admin-Token": "secret"})
+    assert resp.status_code in (202, 409)
+    assert resp.get_json()["graph_version"] == api.snapshots.current.version
+    deadline = time.monotonic() + 5
+    while api.snapshots.loading and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+
+def test_admin_reload_without_a_token_is_local_only(api, client, monkeypatch):
+    monkeypatch.setattr(api, "ADMIN_TOKEN", None)
+    remote = {"REMOTE_ADDR": "203.0.113.5"}
+    assert client.post("/admin/reload", environ_base=remote).status_code == 403
+    # Neither a forged X-Forwarded-For nor a request relayed by a local proxy passes.
+    assert client.post("/admin/reload", environ_base=remote,
+                       headers={"X-Forwarded-For": "127.0.0.1"}).status_code == 403
+    assert client.post("/admin/reload", headers={"X-Forwarded-For": "203.0.113.5"}).status_code == 403
+    assert client.post("/admin/reload").status_code in (202, 409)
+    deadline = time.monotonic() + 5
+    while api.snapshots.loading and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+
+def test_word_lookups(client):
+    assert client.get("/cluster-of?word=cat").get_json() == {
+        "id": 0, "size": 7, "words": ["bat", "cat", "cog", "cot", "cut", "dig", "dog"]}
+    assert client.get("/cluster-of?word=cat&limit=2").get_json()["words"] == ["bat", "cat"]
+    assert client.get("/cluster-of?word=nope").status_code == 404
+    assert client.get("/cluster-of").status_code == 400
+
+    assert client.get("/neighbors?word=cat").get_json() == {
+        "word": "cat", "in_graph": True, "edge_model": "substitution", "neighbors": ["bat", "cot", "cut"]}
+    assert client.get("/neighbors?word=dot").get_json()["in_graph"] is False
+    assert client.get("/neighbors").status_code == 400
+
+    assert client.get("/nearest?word=cab").get_json() == {
+        "word": "cab", "max_distance": 1, "in_graph": False, "nearest": [{"word": "cat", "distance": 1}]}
+    assert [m["word"] for m in client.get("/nearest?word=cab&max_distance=2&limit=3").get_json()["nearest"]] == \
+        ["cat", "bat", "cog"]
+    assert client.get("/nearest?word=cat&max_distance=3").status_code == 400
+    assert client.get("/nearest?word=cat&limit=-1").status_code == 400
+    assert client.get("/nearest").status_code == 400
+    assert client.get(f"/nearest?word={'a' * 200}&max_distance=2").get_json()["nearest"] == []
+
+
+def test_hubs(client):
+    resp = client.get("/hubs?top=2")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["by"] == "betweenness" and len(body["hubs"]) == 2
+    assert set(body["hubs"][0]) == {"word", "betweenness", "closeness", "degree"}
+    assert body["estimate"]["samples"] > 0
+    assert client.get("/hubs?top=-1").status_code == 400
+    assert client.get("/hubs?by=degree").status_code == 400
@@ -0,0 +1,132 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from word_sources.batch_word_source import BatchWordSource
+from word_sources.exceptions import WordSourceException
+from word_sources.project_gutenberg_word_source import ProjectGutenbergWordSource, make_session
+
+BOOKS = {
+    "11": "Alice was beginning to get very tired",
+    "12": "Through the looking glass",
+    "13": "The cat sat on the mat",
+}
+# Books also served under URLs without a numeric id.
+NAMED = {"alice": "11", "glass": "12"}
+
+
+class BookHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        book_id = self.path.strip("/").split("/")[0]
+        book_id = NAMED.get(book_id, book_id)
+        if book_id not in BOOKS:
+            self.send_error(404)
+            return
+        etag = f'"v{book_id}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = BOOKS[book_id].encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    BookHandler.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), BookHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def batch(base_url, ids, **kwargs):
+    session = make_session(len(ids))
+    return BatchWordSource([ProjectGutenbergWordSource(f"{base_url}/{i}/", session=session, **kwargs)
+                            for i in ids], max_workers=len(ids))
+
+
+def test_books_are_fetched_and_merged(server, tmp_path):
+    source = batch(server, ["11", "12", "13"])
+    source.save_raw_data(str(tmp_path))
+    words = source.get_words()
+    assert {"alice", "looking", "cat", "mat"} <= words[3] | words[5] | words[7]
+    assert len(BookHandler.requests_seen) == 3
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [f"gutenberg_{i}.txt" for i in BOOKS] + [f"gutenberg_{i}.headers.json" for i in BOOKS])
+
+
+def test_cached_books_are_not_downloaded_again(server, tmp_path):
+    batch(server, ["11", "12"]).save_raw_data(str(tmp_path))
+    again = batch(server, ["11", "12"])
+    again.save_raw_data(str(tmp_path))
+    assert len(BookHandler.requests_seen) == 2
+    assert all(s.from_cache for s in again.succeeded)
+    assert "alice" in again.get_words()[5]
+
+
+def test_revalidation_uses_etag(server, tmp_path):
+    batch(server, ["13"]).save_raw_data(str(tmp_path))
+    again = batch(server, ["13"], revalidate=True)
+    again.save_raw_data(str(tmp_path))
+    assert BookHandler.requests_seen[-1] == ("/13/", '"v13"')
+    assert again.succeeded[0].from_cache
+    assert "cat" in again.get_words()[3]
+
+
+def test_failed_book_does_not_abort_batch(server, tmp_path):
+    source = batch(server, ["11", "99"])
+    source.save_raw_data(str(tmp_path))
+    assert list(source.errors) == [f"{server}/99/"]
+    assert "alice" in source.get_words()[5]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+    with pytest.raises(WordSourceException):
+        batch(server, ["98", "99"]).save_raw_data(str(tmp_path))
+
+
+def test_urls_without_a_book_id_are_cached_apart(server, tmp_path):
+    batch(server, ["alice", "glass"]).save_raw_data(str(tmp_path))
+    again = batch(server, ["glass", "alice"])
+    again.save_raw_data(str(tmp_path))
+    assert len(BookHandler.requests_seen) == 2
+    assert all(s.from_cache for s in again.succeeded)
+    glass, alice = (s.get_words() for s in again.succeeded)
+    assert "looking" in glass[7] and "alice" in alice[5] and "alice" not in glass.get(5, set())
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".txt")]) == 2
+
+    # The same file name under another URL is downloaded, not served from cache.
+    other = ProjectGutenbergWordSource(f"{server}/13/?mirror=1")
+    other.save_raw_data(str(tmp_path))
+    batch(server, ["13"]).save_raw_data(str(tmp_path))
+    assert len(BookHandler.requests_seen) == 4 and not other.from_cache
+
+
+def test_corrupt_headers_file_is_a_cache_miss(server, tmp_path):
+    batch(server, ["11", "12"]).save_raw_data(str(tmp_path))
+    (tmp_path / "gutenberg_11.headers.json").write_text('{"url": "http', encoding="utf-8")
+    (tmp_path / "gutenberg_12.headers.json").write_text('["not", "an", "object"]', encoding="utf-8")
+    again = batch(server, ["11", "12"])
+    again.save_raw_data(str(tmp_path))
+    assert not again.errors and not any(s.from_cache for s in again.succeeded)
+    assert len(BookHandler.requests_seen) == 4
+    assert "alice" in again.get_words()[5]
+    # The headers were written again, so the next run is served from cache.
+    third = batch(server, ["11", "12"])
+    third.save_raw_data(str(tmp_path))
+    assert all(s.from_cache for s in third.succeeded) and len(BookHandler.requests_seen) == 4
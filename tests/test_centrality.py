@@ -0,0 +1,82 @@
+import networkx as nx
+import pytest
+
+from graph import centrality
+from graph.centrality import CentralityIndex, achieved_epsilon, sample_size
+from graph.compact_graph import CompactGraph
+from graph.graph_analyzer import GraphAnalyzer
+from graph.graph_builder import build_graph, update_graph
+from conftest import random_graph
+
+
+def test_every_source_gives_exact_centrality():
+    graph = random_graph(2, n=200, max_len=4)
+    index = CentralityIndex.build(graph)
+    g = graph.to_networkx()
+    betweenness = nx.betweenness_centrality(g)
+    closeness = nx.closeness_centrality(g)
+    for u in range(graph.node_count):
+        assert index.betweenness[u] == pytest.approx(betweenness[graph.word(u)], abs=1e-12)
+        assert index.closeness[u] == pytest.approx(closeness[graph.word(u)], abs=1e-12)
+    assert index.betweenness[index.top(1)[0]] == max(betweenness.values())
+
+
+def test_process_pool_matches_a_single_process(monkeypatch):
+    graph = random_graph(4, n=200, max_len=4)
+    single = CentralityIndex.build(graph, samples=40, processes=1)
+    monkeypatch.setattr(centrality, "PARALLEL_WORK", 0)
+    pooled = CentralityIndex.build(graph, samples=40, processes=2)
+    assert list(pooled.betweenness) == pytest.approx(list(single.betweenness))
+    assert list(pooled.closeness) == pytest.approx(list(single.closeness))
+
+
+def test_sample_budget():
+    assert sample_size(100, 0.05) == 100
+    assert sample_size(10 ** 6, 0.05) == 3363
+    assert sample_size(10 ** 6, 0.05, max_samples=500) == 500
+    assert achieved_epsilon(100, 100) == 0.0
+    assert achieved_epsilon(10 ** 6, 3363) <= 0.05
+
+
+def test_hubs_are_stored_with_the_graph(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    build_graph(["cat", "cot", "cog", "dog", "bat", "cut"], centrality_samples=3).save(path)
+    update_graph(path, ["dig"])
+    graph = CompactGraph.load(path)
+    assert graph.metadata["centrality"]["samples"] == 3
+
+    full = build_graph(["cat", "cot", "cog", "dog", "bat", "cut", "dig"])
+    hubs = GraphAnalyzer(full).hubs(2)
+    assert [h["word"] for h in hubs] == ["cot", "cog"]
+    assert hubs[0]["degree"] == 3 and hubs[0]["betweenness"] > hubs[1]["betweenness"]
+    assert GraphAnalyzer(full).hubs(1, "closeness")[0]["word"] == "cot"
+    assert GraphAnalyzer(CompactGraph.from_words(["cat"])).hubs() is None
+
+
+def test_updates_carry_centrality_over_without_recomputing(tmp_path, monkeypatch):
+    path = str(tmp_path / "graph.bin")
+    words = ["cat", "cot", "cog", "dog", "bat", "cut"]
+    before = build_graph(words)
+    before.save(path)
+    before = CompactGraph.load(path)
+
+    def build(*args, **kwargs):
+        raise AssertionError("update_graph recomputed centrality")
+
+    monkeypatch.setattr(CentralityIndex, "build", build)
+    updated, added = update_graph(path, ["dig", "ant"])
+    assert added == 2
+    estimate = updated.metadata["centrality"]
+    assert estimate["stale"] and estimate["computed_on"] == before.version
+
+    old, new = CentralityIndex.for_graph(before), CentralityIndex.for_graph(CompactGraph.load(path))
+    for w in words:
+        assert new.betweenness[updated.index(w)] == old.betweenness[before.index(w)]
+        assert new.closeness[updated.index(w)] == old.closeness[before.index(w)]
+    assert new.closeness[updated.index("dig")] == 0 == new.betweenness[updated.index("ant")]
+    for by, scores in ((centrality.BETWEENNESS, new.betweenness), (centrality.CLOSENESS, new.closeness)):
+        assert list(new.order[by]) == sorted(range(updated.node_count), key=lambda u: (-scores[u], u))
+
+    monkeypatch.undo()
+    refreshed, _ = update_graph(path, ["cap"], refresh_centrality=True)
+    assert "stale" not in refreshed.metadata["centrality"]
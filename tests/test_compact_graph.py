@@ -0,0 +1,43 @@
+import pytest
+
+from graph.graph import Graph
+from graph.compact_graph import CompactGraph
+from graph.exceptions import GraphFormatException
+
+WORDS = ["cat", "cot", "cut", "dog", "dot", "cog", "hat", "zebra"]
+
+
+def neighbor_words(graph, word):
+    return sorted(graph.word(v) for v in graph.neighbors(graph.index(word)))
+
+
+def test_from_words_matches_networkx_graph():
+    nx_graph = Graph()
+    nx_graph.add_words(WORDS)
+
+    compact = CompactGraph.from_words(WORDS)
+    assert compact.node_count == nx_graph.graph.number_of_nodes()
+    assert compact.edge_count == nx_graph.graph.number_of_edges()
+    assert list(compact.words) == sorted(WORDS)
+    assert CompactGraph.from_networkx(nx_graph.graph).content_hash() == compact.content_hash()
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    compact = CompactGraph.from_words(WORDS, metadata={"source": "test"})
+    compact.save(path)
+
+    loaded = CompactGraph.load(path)
+    assert loaded.version == compact.content_hash()
+    assert loaded.metadata["source"] == "test"
+    assert loaded.node_count == len(WORDS)
+    assert "zebra" in loaded and "bat" not in loaded
+    assert neighbor_words(loaded, "cot") == ["cat", "cog", "cut", "dot"]
+    assert loaded.degree(loaded.index("zebra")) == 0
+
+
+def test_load_rejects_foreign_files(tmp_path):
+    path = tmp_path / "graph.bin"
+    path.write_bytes(b"not a graph file at all")
+    with pytest.raises(GraphFormatException):
+        CompactGraph.load(str(path))
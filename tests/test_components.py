@@ -0,0 +1,48 @@
+import networkx as nx
+
+from graph.compact_graph import CompactGraph
+from graph.components import ComponentIndex
+from graph.graph_builder import annotate_graph
+from conftest import random_graph
+
+
+def test_index_matches_networkx_components():
+    graph = random_graph(7)
+    index = ComponentIndex.build(graph)
+    expected = {frozenset(c) for c in nx.connected_components(graph.to_networkx())}
+    found = {frozenset(graph.word(u) for u in index.members(c)) for c in range(index.count)}
+    assert found == expected
+    for c in range(index.count):
+        assert all(index.component_of(u) == c for u in index.members(c))
+    assert index.largest_size() == max(len(c) for c in expected)
+
+
+def test_query_pages_through_size_ordered_components():
+    index = ComponentIndex.build(random_graph(11))
+    total, ordered = index.query()
+    assert total == index.count
+    sizes = [index.size(c) for c in ordered]
+    assert sizes == sorted(sizes, reverse=True)
+
+    pages = []
+    for offset in range(0, total, 7):
+        pages += index.query(offset, 7)[1]
+    assert pages == ordered
+    assert index.query(order="asc")[1] == ordered[::-1]
+
+    total, page = index.query(min_size=2, max_size=3, order="asc")
+    assert total == sum(1 for c in ordered if 2 <= index.size(c) <= 3)
+    assert page == [c for c in ordered[::-1] if 2 <= index.size(c) <= 3]
+    assert index.query(offset=total + 5, min_size=2, max_size=3) == (total, [])
+
+
+def test_index_is_stored_in_the_graph_file(tmp_path):
+    graph = annotate_graph(random_graph(13))
+    path = str(tmp_path / "graph.bin")
+    graph.save(path)
+    loaded = CompactGraph.load(path)
+    stored = ComponentIndex.for_graph(loaded)
+    built = ComponentIndex.build(loaded)
+    assert stored.labels is loaded.sections["component_labels"]
+    assert list(stored.labels) == list(built.labels)
+    assert list(stored.nodes) == list(built.nodes)
@@ -0,0 +1,37 @@
+from graph.compact_graph import CompactGraph
+from graph.degrees import DegreeIndex
+from graph.graph_builder import annotate_graph
+from conftest import random_graph
+
+
+def test_degree_queries_match_a_scan():
+    graph = random_graph(17)
+    index = DegreeIndex.build(graph)
+    degrees = [graph.degree(u) for u in range(graph.node_count)]
+    assert index.max_degree == max(degrees)
+    for k in range(-1, index.max_degree + 3):
+        assert list(index.exactly(k)) == [u for u, d in enumerate(degrees) if d == k]
+        at_least = list(index.at_least_slice(k))
+        assert sorted(at_least) == [u for u, d in enumerate(degrees) if d >= k]
+        assert [degrees[u] for u in at_least] == sorted((degrees[u] for u in at_least), reverse=True)
+        assert index.count(k) == degrees.count(k)
+    assert sum(index.distribution().values()) == graph.node_count
+
+
+def test_pages_are_slices_of_the_full_result():
+    index = DegreeIndex.build(random_graph(19))
+    full = list(index.at_least_slice(1))
+    assert list(index.at_least_slice(1, 5, 10)) == full[5:15]
+    assert list(index.at_least_slice(1, len(full) + 3, 10)) == []
+    bucket = list(index.exactly(2))
+    assert list(index.exactly(2, 1, 3)) == bucket[1:4]
+
+
+def test_index_is_stored_in_the_graph_file(tmp_path):
+    graph = annotate_graph(random_graph(23))
+    path = str(tmp_path / "graph.bin")
+    graph.save(path)
+    loaded = CompactGraph.load(path)
+    stored = DegreeIndex.for_graph(loaded)
+    assert stored.order is loaded.sections["degree_order"]
+    assert list(stored.order) == list(DegreeIndex.build(loaded).order)
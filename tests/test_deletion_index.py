@@ -0,0 +1,81 @@
+import os
+import random
+from itertools import combinations
+
+import pytest
+
+from config import DATA_MART_PATH
+from graph.compact_graph import CompactGraph
+from graph.deletion_index import DeletionIndex
+from graph.edge_models import LEVENSHTEIN, edge_index, edge_model
+from graph.graph import Graph
+from graph.graph_builder import build_graph, update_graph
+from graph.incremental import insert_words
+
+
+def brute_force_edges(words):
+    g = Graph(LEVENSHTEIN)
+    return {(a, b) for a, b in combinations(sorted(words), 2) if g._is_one_letter_apart(a, b)}
+
+
+def compact_edges(graph):
+    return {(graph.word(u), graph.word(v))
+            for u in range(graph.node_count) for v in graph.neighbors(u) if u < v}
+
+
+def test_deletion_index_buckets_and_neighbors():
+    index = DeletionIndex()
+    index.add_words(["cat", "cart", "card", "cut", "at", "act", "tac"])
+    assert index.buckets["cat"] == {"cart"}
+    assert index.buckets["ct"] == {"cat", "cut", "act"}
+    assert index.neighbors("cat") == {"cart", "cut", "at"}
+    assert index.neighbors("card") == {"cart"}
+    # "cat" and "tac" share buckets with "act" but are transpositions away.
+    assert index.neighbors("act") == {"at"}
+
+
+def test_levenshtein_build_matches_brute_force():
+    rng = random.Random(3)
+    # Short words over a small alphabet are full of transpositions and
+    # repeated letters, where the deletion buckets are easy to get wrong.
+    words = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 5))) for _ in range(400)}
+    for length in (3, 4):
+        with open(os.path.join(DATA_MART_PATH, f"words_{length}.txt"), encoding="utf-8") as f:
+            words.update(line.strip() for line in f if line.strip())
+
+    expected = brute_force_edges(words)
+    assert compact_edges(CompactGraph.from_words(words, edge_model=LEVENSHTEIN)) == expected
+    graph = Graph(LEVENSHTEIN)
+    assert graph.add_words(words) == len(expected)
+
+
+def test_levenshtein_links_words_of_different_lengths():
+    graph = build_graph(["cat", "cart", "card", "dog"], LEVENSHTEIN)
+    assert edge_model(graph) == LEVENSHTEIN
+    assert compact_edges(graph) == {("cart", "cat"), ("card", "cart")}
+    assert graph.metadata["diameter"]["diameter"] == 2
+    substitution = build_graph(["cat", "cart", "card", "dog"])
+    assert edge_model(substitution) == "substitution" and compact_edges(substitution) == {("card", "cart")}
+
+
+def test_incremental_update_keeps_the_edge_model(tmp_path):
+    rng = random.Random(5)
+    words = sorted({"".join(rng.choice("abcd") for _ in range(rng.randint(2, 6))) for _ in range(1500)})
+    rng.shuffle(words)
+    base, delta = words[:1000], words[1000:]
+
+    updated, added = insert_words(CompactGraph.from_words(base, edge_model=LEVENSHTEIN), delta)
+    assert added == len(delta)
+    assert updated.content_hash() == CompactGraph.from_words(words, edge_model=LEVENSHTEIN).content_hash()
+
+    path = str(tmp_path / "graph.bin")
+    build_graph(["cat", "dog"], LEVENSHTEIN).save(path)
+    update_graph(path, ["cart", "dig"])
+    reloaded = CompactGraph.load(path)
+    assert edge_model(reloaded) == LEVENSHTEIN
+    assert compact_edges(reloaded) == {("cart", "cat"), ("dig", "dog")}
+
+
+def test_unknown_edge_model_is_rejected():
+    with pytest.raises(ValueError):
+        edge_index("transposition")
@@ -0,0 +1,34 @@
+import random
+
+import networkx as nx
+
+from graph.compact_graph import CompactGraph
+from graph.diameter import graph_diameter
+from graph.graph_analyzer import GraphAnalyzer
+
+
+def test_diameter_matches_networkx_per_component():
+    for seed in range(20):
+        rng = random.Random(seed)
+        words = {"".join(rng.choice("abcde") for _ in range(rng.randint(2, 4)))
+                 for _ in range(rng.randint(5, 300))}
+        graph = CompactGraph.from_words(words)
+        reference = graph.to_networkx()
+        expected = max(nx.diameter(reference.subgraph(c)) for c in nx.connected_components(reference))
+
+        result = graph_diameter(graph)
+        assert result["diameter"] == expected
+        assert len(result["path"]) - 1 == expected
+        assert result["path"][0] == result["endpoints"][0]
+        assert result["path"][-1] == result["endpoints"][1]
+
+
+def test_analyzer_uses_diameter_stored_at_build_time(tmp_path):
+    graph = CompactGraph.from_words(["cat", "cot", "dot", "dog"])
+    graph.metadata["diameter"] = graph_diameter(graph)
+    path = str(tmp_path / "graph.bin")
+    graph.save(path)
+
+    analyzer = GraphAnalyzer(CompactGraph.load(path))
+    assert analyzer.maximum_distance() == 3
+    assert sorted(analyzer.diameter()["endpoints"]) == ["cat", "dog"]
@@ -0,0 +1,101 @@
+import os
+import random
+
+import pytest
+
+from config import DATA_MART_PATH
+from graph.compact_graph import CompactGraph
+from graph.edge_models import LEVENSHTEIN
+from graph.fuzzy_index import FUZZY_KEYS, FuzzyIndex, edit_distance
+from graph.graph_analyzer import GraphAnalyzer
+from graph.graph_builder import build_graph, update_graph
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def brute_force_nearest(words, query, max_distance):
+    found = ((w, levenshtein(w, query)) for w in words)
+    return sorted(((w, d) for w, d in found if d <= max_distance), key=lambda item: (item[1], item[0]))
+
+
+def test_edit_distance_stops_at_the_limit():
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("kitten", "sitting", 2) == 3
+    assert edit_distance("ab", "ba", 1) == 2
+    assert edit_distance("", "abc", 5) == 3
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(11)
+    words = {"".join(rng.choice("abcd") for _ in range(rng.randint(1, 6))) for _ in range(600)}
+    with open(os.path.join(DATA_MART_PATH, "words_4.txt"), encoding="utf-8") as f:
+        words.update(line.strip() for line in f if line.strip())
+    analyzer = GraphAnalyzer(CompactGraph.from_words(words))
+
+    queries = rng.sample(sorted(words), 30)
+    queries += ["".join(rng.choice("abcdez") for _ in range(rng.randint(0, 7))) for _ in range(30)]
+    for query in queries:
+        for max_distance in (0, 1, 2):
+            assert analyzer.nearest(query, max_distance) == brute_force_nearest(words, query, max_distance)
+
+
+def test_neighbors_follow_the_edge_model():
+    words = ["cat", "cot", "cart", "at", "act", "dog"]
+    substitution = GraphAnalyzer(build_graph(words))
+    levenshtein_ = GraphAnalyzer(build_graph(words, LEVENSHTEIN))
+
+    assert substitution.neighbors_of("cat") == ["cot"]
+    assert levenshtein_.neighbors_of("cat") == ["at", "cart", "cot"]
+    # Words outside the graph get the links they would have if inserted.
+    assert substitution.neighbors_of("cut") == ["cat", "cot"]
+    assert levenshtein_.neighbors_of("ct") == ["act", "at", "cat", "cot"]
+    assert levenshtein_.neighbors_of("xyz") == []
+    assert levenshtein_.nearest("cut", 1, limit=1) == [("cat", 1)]
+    with pytest.raises(ValueError):
+        substitution.nearest("cat", 3)
+
+
+def test_index_is_stored_and_refreshed_with_the_graph(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    build_graph(["cat", "dog"]).save(path)
+    update_graph(path, ["cot"])
+
+    graph = CompactGraph.load(path)
+    assert FUZZY_KEYS in graph.sections
+    index, rebuilt = FuzzyIndex.for_graph(graph), FuzzyIndex.build(graph)
+    assert list(index.keys) == list(rebuilt.keys)
+    assert list(index.offsets) == list(rebuilt.offsets) and list(index.nodes) == list(rebuilt.nodes)
+    assert GraphAnalyzer(graph).nearest("cut", 1) == [("cat", 1), ("cot", 1)]
+
+
+def test_incremental_merge_matches_a_rebuild(tmp_path):
+    rng = random.Random(8)
+    words = sorted({"".join(rng.choice("abcde") for _ in range(rng.randint(1, 6))) for _ in range(2000)})
+    rng.shuffle(words)
+    path = str(tmp_path / "graph.bin")
+    build_graph(words[:1500], LEVENSHTEIN).save(path)
+    updated, _ = update_graph(path, words[1500:])
+
+    merged, rebuilt = FuzzyIndex.for_graph(updated), FuzzyIndex.build(updated)
+    assert list(merged.keys) == list(rebuilt.keys)
+    assert list(merged.offsets) == list(rebuilt.offsets) and list(merged.nodes) == list(rebuilt.nodes)
+
+
+def test_words_longer_than_any_edit_reach_are_not_expanded(monkeypatch):
+    index = FuzzyIndex.build(build_graph(["cat", "cart", "carts"]))
+    assert index.max_length == 5
+    assert [index.graph.word(u) for u, _ in index.nearest("cartsxx", 2)] == ["carts"]
+
+    def edits(*args):
+        raise AssertionError("a word out of reach was expanded")
+
+    monkeypatch.setattr("graph.fuzzy_index._edits", edits)
+    assert index.nearest("c" * 200, 2) == [] and index.nearest("cartsxyz", 2) == []
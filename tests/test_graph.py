@@ -0,0 +1,53 @@
+import os
+import random
+
+from config import DATA_MART_PATH
+from graph.graph import Graph
+from graph.graph_manager import GraphManager
+from graph.pattern_index import PatternIndex
+
+
+def brute_force_edges(words):
+    g = Graph()
+    edges = set()
+    words = sorted(words)
+    for i, w1 in enumerate(words):
+        for w2 in words[i + 1:]:
+            if g._is_one_letter_apart(w1, w2):
+                edges.add((w1, w2))
+    return edges
+
+
+def edge_set(graph: Graph):
+    return {tuple(sorted((a.word, b.word))) for a, b in graph.graph.edges}
+
+
+def test_pattern_index_buckets():
+    index = PatternIndex()
+    index.add_words(["cat", "cot", "cut", "dog"])
+    assert index.buckets["c*t"] == {"cat", "cot", "cut"}
+    assert index.neighbors("cat") == {"cot", "cut"}
+    assert index.neighbors("dog") == set()
+
+
+def test_bucketed_build_matches_brute_force_on_datamart():
+    words = set()
+    for length in (3, 4):
+        with open(os.path.join(DATA_MART_PATH, f"words_{length}.txt"), encoding="utf-8") as f:
+            words.update(line.strip() for line in f if line.strip())
+
+    graph = Graph()
+    total_edges = graph.add_words(words)
+    expected = brute_force_edges(words)
+    assert edge_set(graph) == expected
+    assert total_edges == len(expected)
+    assert graph.graph.number_of_nodes() == len(words)
+
+
+def test_graph_manager_matches_brute_force_on_random_words():
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(300)]
+
+    manager = GraphManager()
+    manager.build_graph(words)
+    assert edge_set(manager.get_graph()) == brute_force_edges(set(words))
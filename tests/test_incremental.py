@@ -0,0 +1,55 @@
+import os
+import random
+
+from graph.compact_graph import CompactGraph
+from graph.graph_builder import build_graph, update_graph
+from graph.incremental import insert_words
+from word_manager import WordManager
+from word_sources.local_dictionary_word_source import LocalDictionaryWordSource
+
+from config import DATA_MART_PATH
+
+
+def datamart_words():
+    words = set()
+    for name in os.listdir(DATA_MART_PATH):
+        with open(os.path.join(DATA_MART_PATH, name), encoding="utf-8") as f:
+            words.update(line.strip() for line in f if line.strip())
+    return sorted(words)
+
+
+def test_incremental_update_matches_full_rebuild():
+    words = datamart_words()
+    rng = random.Random(11)
+    rng.shuffle(words)
+    base, delta = words[:12000], words[12000:]
+
+    updated, added = insert_words(CompactGraph.from_words(base), delta + base[:50])
+    full = CompactGraph.from_words(words)
+
+    assert added == len(delta)
+    assert updated.content_hash() == full.content_hash()
+    assert list(updated.adj) == list(full.adj)
+
+
+def test_word_manager_delta_updates_stored_graph(tmp_path):
+    graph_path = str(tmp_path / "graph.bin")
+    build_graph(["cat", "cot", "dog"]).save(graph_path)
+
+    datamart = tmp_path / "datamart"
+    datamart.mkdir()
+    (datamart / "words_3.txt").write_text("cat\ncot\ndog\n", encoding="utf-8")
+    book = tmp_path / "book.txt"
+    book.write_text("The cat saw a dot and a cog near the dog.", encoding="utf-8")
+
+    manager = WordManager(LocalDictionaryWordSource(str(book)))
+    counts = manager.process_words(str(tmp_path / "datalake"), str(datamart))
+    assert manager.new_words == {3: {"the", "saw", "dot", "and", "cog"}, 4: {"near"}}
+    assert counts[3] == 5 and counts[4] == 1
+
+    updated, added = update_graph(graph_path, manager.new_word_list())
+    assert added == 6
+    reloaded = CompactGraph.load(graph_path)
+    expected = build_graph(["cat", "cot", "dog", "the", "saw", "dot", "and", "cog", "near"])
+    assert reloaded.version == expected.content_hash()
+    assert reloaded.metadata["diameter"]["diameter"] == expected.metadata["diameter"]["diameter"]
@@ -0,0 +1,131 @@
+import os
+import time
+import threading
+
+import pytest
+
+from api.jobs import JobQueue, JobQueueFull
+from graph.longest_path import SearchBudget
+
+
+def spin(context, params, budget, job):
+    """Runs until its budget is exhausted, like a search too big to finish."""
+    while budget.spend():
+        job.progress["steps"] = budget.expansions
+        time.sleep(0.001)
+    return {"steps": budget.expansions, "complete": False}
+
+
+def quick(context, params, budget, job):
+    return {"echo": params, "context": context}
+
+
+def wait_for(queue, job_id, version="v1", timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id, version)
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(**kwargs):
+        kwargs.setdefault("heartbeat", 0.05)
+        queue = JobQueue(str(tmp_path / "jobs"), {"spin": spin, "quick": quick}, **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.shutdown()
+
+
+def test_identical_requests_share_one_job(make_queue):
+    queue = make_queue()
+    job, created = queue.submit("spin", {"n": 1}, 0.3, "v1")
+    again, created_again = queue.submit("spin", {"n": 1}, 0.3, "v1")
+    other, created_other = queue.submit("spin", {"n": 2}, 0.3, "v1")
+    assert created and not created_again and created_other
+    assert again["id"] == job["id"] != other["id"]
+
+    # The deadline stops the job; what it found so far is its result.
+    done = wait_for(queue, job["id"])
+    assert done["status"] == "done"
+    assert done["result"]["steps"] > 0 and done["progress"]["steps"] > 0
+    assert queue.submit("spin", {"n": 1}, 0.3, "v1")[1] is False
+
+
+def test_cancel_stops_a_running_job(make_queue):
+    queue = make_queue()
+    job, _ = queue.submit("spin", {}, 60, "v1")
+    while queue.get(job["id"], "v1")["status"] != "running":
+        time.sleep(0.01)
+    queue.cancel(job["id"], "v1")
+    cancelled = wait_for(queue, job["id"])
+    assert cancelled["status"] == "cancelled"
+    assert cancelled["finished_at"] - cancelled["started_at"] < 5
+    # A cancelled job is not reused by the next identical request.
+    assert queue.submit("spin", {}, 60, "v1")[1] is True
+
+
+def test_results_are_shared_through_disk_until_the_version_changes(make_queue):
+    first = make_queue()
+    job, _ = first.submit("quick", {"a": 1}, 10, "v1", context="ctx")
+    assert wait_for(first, job["id"])["result"] == {"echo": {"a": 1}, "context": "ctx"}
+
+    # Another worker process sees the finished job and does not rerun it.
+    second = make_queue()
+    assert second.get(job["id"], "v1")["status"] == "done"
+    assert second.submit("quick", {"a": 1}, 10, "v1")[1] is False
+    assert second.get(job["id"], "v2") is None
+
+    second.retain_version("v2")
+    assert first.get(job["id"], "v1") is None
+
+
+def test_cancel_marker_reaches_the_worker_running_the_job(make_queue):
+    runner = make_queue()
+    other = make_queue()
+    job, _ = runner.submit("spin", {}, 60, "v1")
+    while other.get(job["id"], "v1")["status"] != "running":
+        time.sleep(0.01)
+    other.cancel(job["id"], "v1")
+    assert wait_for(other, job["id"])["status"] == "cancelled"
+    assert not os.path.exists(runner._path(job["id"], "v1", ".cancel"))
+
+
+def test_pending_jobs_are_bounded(make_queue):
+    queue = make_queue(max_workers=1, max_pending=1)
+    running, _ = queue.submit("spin", {"n": 1}, 60, "v1")
+    while queue.get(running["id"], "v1")["status"] != "running":
+        time.sleep(0.01)
+    queued, _ = queue.submit("spin", {"n": 2}, 60, "v1")
+    with pytest.raises(JobQueueFull):
+        queue.submit("spin", {"n": 3}, 60, "v1")
+    with pytest.raises(ValueError):
+        queue.submit("unknown", {}, 60, "v1")
+
+    queue.cancel(queued["id"], "v1")
+    assert queue.get(queued["id"], "v1")["status"] == "cancelled"
+    queue.cancel(running["id"], "v1")
+    wait_for(queue, running["id"])
+
+
+def test_budget_parent_and_cancel():
+    parent = SearchBudget(max_expansions=10)
+    child = SearchBudget(parent=parent)
+    assert all(child.spend() for _ in range(10))
+    assert not child.spend() and child.exhausted and parent.exhausted
+
+    budget = SearchBudget()
+    child = SearchBudget(parent=budget)
+    threading.Thread(target=budget.cancel).start()
+    deadline = time.time() + 5
+    while child.spend() and time.time() < deadline:
+        pass
+    assert child.exhausted and budget.cancelled
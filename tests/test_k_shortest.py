@@ -0,0 +1,41 @@
+import random
+from itertools import islice
+
+import networkx as nx
+
+from graph.k_shortest import k_shortest_paths
+from graph.longest_path import SearchBudget
+from conftest import random_graph
+
+
+def test_lengths_match_networkx_shortest_simple_paths():
+    graph = random_graph(4, n=300, alphabet="abc", max_len=4)
+    reference = graph.to_networkx()
+    rng = random.Random(6)
+    checked = 0
+    while checked < 15:
+        s, t = rng.randrange(graph.node_count), rng.randrange(graph.node_count)
+        a, b = graph.word(s), graph.word(t)
+        if s == t or not nx.has_path(reference, a, b):
+            continue
+        checked += 1
+        paths = list(islice(k_shortest_paths(graph, s, t), 25))
+        expected = list(islice(nx.shortest_simple_paths(reference, a, b), 25))
+        assert [len(p) for p in paths] == [len(p) for p in expected]
+        assert len({tuple(p) for p in paths}) == len(paths)
+        for p in paths:
+            assert p[0] == s and p[-1] == t and len(set(p)) == len(p)
+            assert all(v in graph.neighbors(u) for u, v in zip(p, p[1:]))
+
+
+def test_max_length_and_budget_stop_the_search():
+    graph = random_graph(5, n=300, alphabet="abc", max_len=4)
+    largest = max(nx.connected_components(graph.to_networkx()), key=len)
+    s, t = sorted(graph.index(w) for w in largest)[:2]
+    capped = list(k_shortest_paths(graph, s, t, max_length=4))
+    assert all(len(p) - 1 <= 4 for p in capped)
+
+    budget = SearchBudget(max_expansions=50)
+    partial = list(k_shortest_paths(graph, s, t, budget=budget))
+    assert budget.exhausted
+    assert [len(p) for p in partial] == sorted(len(p) for p in partial)
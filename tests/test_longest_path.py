@@ -0,0 +1,48 @@
+import random
+
+import networkx as nx
+
+from graph.compact_graph import CompactGraph
+from graph.longest_path import SearchBudget, longest_path
+
+
+def brute_force_longest(graph):
+    reference = graph.to_networkx()
+    best = 0
+    nodes = list(reference.nodes)
+    for i, s in enumerate(nodes):
+        for t in nodes[i + 1:]:
+            for p in nx.all_simple_paths(reference, s, t):
+                best = max(best, len(p) - 1)
+    return best
+
+
+def test_branch_and_bound_matches_brute_force():
+    for seed in range(8):
+        rng = random.Random(seed)
+        words = {"".join(rng.choice("abc") for _ in range(3)) for _ in range(rng.randint(6, 14))}
+        graph = CompactGraph.from_words(words)
+        result = longest_path(graph, processes=1)
+        assert result["proven_optimal"]
+        assert result["distance"] == brute_force_longest(graph)
+        path = result["path"]
+        if result["distance"]:
+            assert len(path) == len(set(path)) == result["distance"] + 1
+
+
+def test_budget_returns_best_so_far_unproven():
+    words = {a + b + c for a in "abcd" for b in "abcd" for c in "abcd"}
+    graph = CompactGraph.from_words(words)
+    result = longest_path(graph, max_expansions=50, processes=1)
+    assert not result["proven_optimal"]
+    assert result["distance"] == len(result["path"]) - 1 > 0
+
+    capped = longest_path(graph, max_length=5, processes=1)
+    assert capped["proven_optimal"] and capped["distance"] == 5
+
+
+def test_search_budget_expansion_cap():
+    budget = SearchBudget(max_expansions=3)
+    assert budget.spend() and budget.spend() and budget.spend()
+    assert not budget.spend()
+    assert budget.exhausted
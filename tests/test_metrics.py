@@ -0,0 +1,50 @@
+import json
+
+from api.metrics import Metrics
+
+
+def test_counters_and_histograms_render_as_prometheus_text():
+    metrics = Metrics(buckets=(0.01, 0.1))
+    metrics.describe("requests_total", "counter", "Requests served.")
+    metrics.inc("requests_total", route="/a", status=200)
+    metrics.inc("requests_total", route="/a", status=200)
+    metrics.inc("requests_total", route='/b"', status=404)
+    for seconds in (0.005, 0.01, 0.05, 2.0):
+        metrics.observe("latency_seconds", seconds, route="/a")
+
+    text = metrics.render([("graph_nodes", "Words in the graph.", 42)])
+    lines = text.splitlines()
+    assert "# HELP requests_total Requests served." in lines
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/a",status="200"} 2' in lines
+    assert 'requests_total{route="/b\\"",status="404"} 1' in lines
+    # Buckets are cumulative and a value equal to a bound falls into it.
+    assert 'latency_seconds_bucket{route="/a",le="0.01"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    assert "# TYPE graph_nodes gauge" in lines and "graph_nodes 42" in lines
+
+
+def test_render_adds_up_other_workers_snapshots(tmp_path):
+    metrics = Metrics(str(tmp_path), flush_interval=3600, buckets=(0.1,))
+    metrics.inc("requests_total", route="/a")
+    metrics.observe("latency_seconds", 0.05, route="/a")
+
+    other = Metrics(buckets=(0.1,))
+    other.inc("requests_total", 3, route="/a")
+    other.inc("requests_total", route="/b")
+    other.observe("latency_seconds", 1.0, route="/a")
+    (tmp_path / "1.json").write_text(json.dumps(other.snapshot()))
+    (tmp_path / "2.json").write_text("{truncated")
+
+    lines = metrics.render().splitlines()
+    assert 'requests_total{route="/a"} 4' in lines
+    assert 'requests_total{route="/b"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_count{route="/a"} 2' in lines
+
+    # Its own snapshot file is replaced by the live values.
+    metrics.flush()
+    metrics.inc("requests_total", route="/a")
+    assert 'requests_total{route="/a"} 5' in metrics.render().splitlines()
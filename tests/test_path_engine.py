@@ -0,0 +1,55 @@
+import random
+
+import networkx as nx
+
+from graph.compact_graph import CompactGraph
+from graph.path_engine import PathEngine
+from conftest import random_graph
+
+
+def test_bidirectional_bfs_matches_networkx_lengths():
+    graph = random_graph(3)
+    reference = graph.to_networkx()
+    engine = PathEngine(graph)
+    rng = random.Random(5)
+    for _ in range(300):
+        s = rng.randrange(graph.node_count)
+        t = rng.randrange(graph.node_count)
+        path = engine.shortest_path_ids(s, t)
+        try:
+            expected = nx.shortest_path_length(reference, graph.word(s), graph.word(t))
+        except nx.NetworkXNoPath:
+            assert path is None
+            continue
+        assert len(path) - 1 == expected
+        assert path[0] == s and path[-1] == t
+        for u, v in zip(path, path[1:]):
+            assert v in graph.neighbors(u)
+
+
+def test_unknown_and_disconnected_words():
+    graph = CompactGraph.from_words(["cat", "cot", "dog", "zebra"])
+    engine = PathEngine(graph)
+    assert engine.shortest_path("cat", "cot") == ["cat", "cot"]
+    assert engine.shortest_path("cat", "cat") == ["cat"]
+    assert engine.shortest_path("cat", "zebra") is None
+    assert engine.shortest_path("cat", "missing") is None
+
+
+def test_batch_paths_match_single_queries():
+    graph = random_graph(8)
+    engine = PathEngine(graph)
+    rng = random.Random(9)
+    sources = [rng.randrange(graph.node_count) for _ in range(10)]
+    pairs = [(s, rng.randrange(graph.node_count)) for s in sources for _ in range(20)]
+    pairs += [(sources[0], sources[0]), (sources[1], rng.randrange(graph.node_count))]
+    paths, stats = engine.shortest_paths(pairs)
+    assert stats["bfs_trees"] > 0
+    for (s, t), path in zip(pairs, paths):
+        single = engine.shortest_path_ids(s, t)
+        if single is None:
+            assert path is None
+            continue
+        assert len(path) == len(single)
+        assert path[0] == s and path[-1] == t
+        assert all(v in graph.neighbors(u) for u, v in zip(path, path[1:]))
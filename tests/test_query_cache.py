@@ -0,0 +1,47 @@
+from api.query_cache import QueryCache
+
+
+def test_lru_eviction_and_counters():
+    cache = QueryCache(max_entries=2)
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        return key.upper()
+
+    for key in ["a", "b", "a", "c", "b"]:
+        assert cache.get_or_compute("test", (key,), "v1", lambda: compute(key)) == key.upper()
+    # "b" was the least recently used when "c" arrived.
+    assert calls == ["a", "b", "c", "b"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (1, 4, 2, 2)
+
+
+def test_versions_and_ttl_separate_entries(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("api.query_cache.time.monotonic", lambda: clock[0])
+    cache = QueryCache(ttl=10)
+    assert cache.get_or_compute("test", (), "v1", lambda: 1) == 1
+    assert cache.get_or_compute("test", (), "v2", lambda: 2) == 2
+    assert cache.get_or_compute("test", (), "v1", lambda: 3) == 1
+    clock[0] += 11
+    assert cache.get_or_compute("test", (), "v1", lambda: 4) == 4
+    assert cache.stats()["expirations"] == 1
+
+
+def test_symmetric_pairs_share_an_entry():
+    cache = QueryCache()
+    calls = []
+
+    def path(a, b):
+        calls.append((a, b))
+        return None if a == "x" else [a, "mid", b]
+
+    assert cache.get_or_compute_pair("p", "dog", "cat", (), "v", path, lambda p: p[::-1]) == ["dog", "mid", "cat"]
+    assert cache.get_or_compute_pair("p", "cat", "dog", (), "v", path, lambda p: p[::-1]) == ["cat", "mid", "dog"]
+    assert calls == [("cat", "dog")]
+
+    reverse = lambda p: None if p is None else p[::-1]
+    assert cache.get_or_compute_pair("p", "x", "y", (), "v", path, reverse) is None
+    assert cache.get_or_compute_pair("p", "y", "x", (), "v", path, reverse) is None
+    assert calls == [("cat", "dog"), ("x", "y")]
@@ -0,0 +1,39 @@
+from graph.graph_analyzer import GraphAnalyzer
+from graph.graph_builder import build_graph
+from graph.render import layout, neighborhood
+
+WORDS = ["cat", "cot", "cog", "dog", "dig", "bat", "bit", "zzz"]
+
+
+def words_of(graph, nodes):
+    return {graph.word(u) for u in nodes}
+
+
+def test_neighborhood_grows_by_hops_and_stops_at_the_cap():
+    graph = build_graph(WORDS)
+    cat = graph.index("cat")
+    assert neighborhood(graph, [cat], 0, 10) == ([cat], False)
+    nodes, truncated = neighborhood(graph, [cat], 2, 10)
+    assert words_of(graph, nodes) == {"cat", "cot", "bat", "cog", "bit"} and not truncated
+    nodes, truncated = neighborhood(graph, [cat], 2, 3)
+    assert len(nodes) == 3 and truncated
+    assert words_of(graph, nodes[:1]) == {"cat"} and words_of(graph, nodes[1:]) <= {"cot", "bat"}
+
+
+def test_layout_is_deterministic():
+    graph = build_graph(WORDS)
+    nodes, _ = neighborhood(graph, [graph.index("cat")], 3, 100)
+    assert layout(graph, nodes) == layout(graph, nodes)
+    assert set(layout(graph, nodes)) == set(nodes)
+
+
+def test_render_ego_network_and_path():
+    analyzer = GraphAnalyzer(build_graph(WORDS))
+    ego = analyzer.ego_layout("cat", radius=0, target="dog")
+    assert [analyzer.graph.word(u) for u in ego["path"]] == ["cat", "cot", "cog", "dog"]
+    assert len(ego["positions"]) == 4
+
+    assert analyzer.render(ego, "svg").lstrip().startswith(b"<?xml")
+    assert analyzer.render(ego, "png").startswith(b"\x89PNG")
+    assert analyzer.ego_layout("cat", target="zzz") is None
+    assert analyzer.ego_layout("unknown") is None
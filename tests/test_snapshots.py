@@ -0,0 +1,57 @@
+import time
+
+from api.snapshots import SnapshotManager
+from graph.graph_builder import build_graph
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_reload_swaps_in_a_new_version(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    build_graph(["cat", "cot", "dog"]).save(path)
+    swapped = []
+    manager = SnapshotManager(path, on_swap=lambda s: swapped.append(s.version))
+    assert manager.load()
+    old = manager.current
+
+    # The same file is not loaded again...
+    assert manager.load() and manager.current is old and len(swapped) == 1
+    build_graph(["cat", "cot", "cog", "dog"]).save(path)
+    assert manager.reload()
+    assert wait_for(lambda: manager.current is not old)
+    assert swapped == [old.version, manager.current.version]
+
+    # ...and a request still holding the old snapshot finishes on it.
+    assert old.analyzer.shortest_path("cat", "dog") is None
+    assert manager.current.analyzer.shortest_path("cat", "dog") == ["cat", "cot", "cog", "dog"]
+
+
+def test_failed_load_keeps_the_current_snapshot(tmp_path):
+    path = tmp_path / "graph.bin"
+    manager = SnapshotManager(str(path))
+    assert not manager.load() and manager.current is None
+    assert "not found" in manager.last_error
+
+    build_graph(["cat", "cot"]).save(str(path))
+    assert manager.load()
+    current = manager.current
+    path.write_bytes(b"not a graph")
+    assert not manager.load(force=True)
+    assert manager.current is current and manager.last_error
+
+
+def test_watch_reloads_a_replaced_file(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    build_graph(["cat", "cot"]).save(path)
+    manager = SnapshotManager(path)
+    manager.load()
+    manager.watch(0.05)
+
+    graph = build_graph(["cat", "cot", "cut"])
+    graph.save(path)
+    assert wait_for(lambda: manager.current.version == graph.version)
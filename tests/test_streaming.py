@@ -0,0 +1,33 @@
+import json
+
+from api.streaming import BATCH_ITEMS, stream_response
+
+
+def items(n):
+    return ({"id": i, "words": [f"w{i}", "é"]} for i in range(n))
+
+
+def test_json_stream_is_one_document():
+    for n in (0, 1, BATCH_ITEMS, 3 * BATCH_ITEMS + 5):
+        response = stream_response("/test", "clusters", items(n), {"total": n, "offset": 0})
+        assert response.mimetype == "application/json"
+        assert json.loads(response.get_data()) == {"total": n, "offset": 0, "clusters": list(items(n))}
+    assert json.loads(stream_response("/test", "nodes", iter(["a"])).get_data()) == {"nodes": ["a"]}
+
+
+def test_ndjson_stream_has_one_item_per_line():
+    response = stream_response("/test", "clusters", items(600), {"total": 600, "max_size": None}, "ndjson")
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["X-Total"] == "600"
+    assert "X-Max-Size" not in response.headers
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == list(items(600))
+
+
+def test_failure_mid_stream_truncates_body():
+    def failing():
+        yield "a"
+        raise RuntimeError("boom")
+
+    body = stream_response("/test", "nodes", failing()).get_data(as_text=True)
+    assert not body.endswith("]}")
@@ -0,0 +1,33 @@
+import re
+import random
+
+from word_sources.tokenizer import MAX_TOKEN_LENGTH, iter_words, group_by_length
+from word_sources.local_dictionary_word_source import LocalDictionaryWordSource
+
+
+def reference_words(text):
+    return [w.lower() for w in re.findall(r"\b[a-zA-Z]+\b", text)]
+
+
+def test_chunk_boundaries_do_not_change_tokens():
+    rng = random.Random(1)
+    alphabet = "abcXYZ 1_é,.\n'-"
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 300)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 10))))
+        chunks = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        assert list(iter_words(chunks)) == reference_words(text)
+
+
+def test_overlong_runs_are_dropped():
+    chunks = ["cat " + "a" * 600, "a" * 600, "a" * 10 + " dog"]
+    assert list(iter_words(chunks)) == ["cat", "dog"]
+    assert len("a" * 1210) > MAX_TOKEN_LENGTH
+
+
+def test_local_dictionary_source_streams_file(tmp_path):
+    path = tmp_path / "dict.txt"
+    path.write_text("Cat cot\nDOG don't ox café\n" * 1000, encoding="utf-8")
+    words = LocalDictionaryWordSource(str(path)).get_words()
+    assert words == group_by_length(reference_words(path.read_text(encoding="utf-8")))
+    assert words == {3: {"cat", "cot", "dog", "don"}}
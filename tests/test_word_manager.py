@@ -0,0 +1,66 @@
+import os
+import random
+
+from word_manager import WordManager, merge_words, read_datamart_words
+from word_sources.word_source import WordSource
+
+
+class StaticWordSource(WordSource):
+    def __init__(self, words_by_length):
+        self.words_by_length = words_by_length
+
+    def save_raw_data(self, data_lake_path):
+        pass
+
+    def get_words(self):
+        return self.words_by_length
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_merge_keeps_file_sorted_and_reports_new_words(tmp_path):
+    path = str(tmp_path / "words_3.txt")
+    assert merge_words(path, {"cot", "cat"}) == ["cat", "cot"]
+    assert merge_words(path, {"ant", "cot", "dog", "cut"}) == ["ant", "cut", "dog"]
+    assert read_lines(path) == ["ant", "cat", "cot", "cut", "dog"]
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_merge_without_new_words_leaves_file_untouched(tmp_path):
+    path = tmp_path / "words_3.txt"
+    path.write_text("cat\ncot\n", encoding="utf-8")
+    os.utime(path, (0, 0))
+    assert merge_words(str(path), {"cat"}) == []
+    assert os.path.getmtime(path) == 0
+
+
+def test_merge_matches_set_union(tmp_path):
+    rng = random.Random(3)
+    path = tmp_path / "words_4.txt"
+    existing = set()
+    for _ in range(50):
+        batch = {"".join(rng.choice("abcé") for _ in range(4)) for _ in range(rng.randint(0, 20))}
+        assert merge_words(str(path), batch) == sorted(batch - existing)
+        existing |= batch
+        assert read_lines(path) == sorted(existing)
+
+
+def test_merge_appends_after_missing_trailing_newline(tmp_path):
+    path = tmp_path / "words_3.txt"
+    path.write_text("ant\ncat", encoding="utf-8")
+    assert merge_words(str(path), {"cow", "dog", "cat"}) == ["cow", "dog"]
+    assert read_lines(path) == ["ant", "cat", "cow", "dog"]
+
+
+def test_process_words_counts_only_new_words(tmp_path):
+    lake, mart = str(tmp_path / "lake"), str(tmp_path / "mart")
+    WordManager(StaticWordSource({3: {"cat", "cot"}})).process_words(lake, mart)
+    manager = WordManager(StaticWordSource({3: {"cat", "cut"}, 4: {"bird"}}))
+    assert manager.process_words(lake, mart) == {3: 1, 4: 1}
+    assert manager.new_words == {3: {"cut"}, 4: {"bird"}}
+    assert read_lines(os.path.join(mart, "words_3.txt")) == ["cat", "cot", "cut"]
+    (tmp_path / "mart" / "notes.txt").write_text("ignored\n")
+    assert read_datamart_words(mart) == {"cat", "cot", "cut", "bird"}